@@ -14,11 +14,16 @@
 # (2) Click on "Download", then on "Data Files" from the dropdown
 #     menu.
 # (3) Scroll down to "Chemical-disease associations".
-# (4) Click on and download "CTD_chemicals.tsv.gz".
-# (5) Extract the file "CTD_chemicals.tsv" to the "CTD" folder within LAERTES.
-# (6) Run this script as "python CTD2rdf.py".
-# (7) This script currently takes longer than 10 minutes to run, but
-#     will produce the file "chemical-disease-ctd.nt" upon completion.
+# (4) Click on and download "CTD_chemicals_diseases.tsv.gz" to the
+#     "CTD" folder within LAERTES. There is no need to extract it.
+# (5) Run this script as "python CTD2rdf.py" (or "python CTD2rdf.py
+#     <data file>" for a file with another name). The data file is
+#     decompressed as it is read if it is gzip or bzip2 compressed.
+# (6) This script will produce the file "chemical-disease-ctd.nt". Only
+#     the records whose chemical and disease can be mapped to OMOP are
+#     expanded and converted (a warning is printed the first time a
+#     chemical or disease cannot be mapped), which takes well under a
+#     minute for each 100,000 records.
 
 
 # "CTD_chemicals.tsv" contains the following fields:
@@ -36,23 +41,32 @@
 # NOTE: These fields apply to the December 2015 CTD data release.
 
 # Debugging info:
-#  This script skips the first 28 lines as "header", this may
-#  be different in other releases besides the December 2015 release.
+#  The header of the file is the lines at the top that start with
+#  "#". If one of them lists the fields (separated by tabs), the
+#  script stops when they are not the fields above, since the
+#  conversion depends on their order.
 
 import sys
-sys.path = sys.path + ['.']
+sys.path = sys.path + ['.', '../common', '../terminology-mappings']
 reload(sys)
 sys.setdefaultencoding('utf8')
 
 
-import re, codecs, uuid, datetime
+import re, codecs, uuid, datetime, argparse, io, gzip, bz2, itertools
 import json
 import pickle
 from rdflib import Graph, Literal, Namespace, URIRef, RDF, RDFS
 
-DATA_FILE = "CTD_chemicals_diseases.tsv"
+from ntriplesWriter import NTriplesWriter, openOutputFile
+from terminologyMappings import meshToRxNorm, meshToOmop
+
+DATA_FILE = "CTD_chemicals_diseases.tsv.gz"
+CTD_FIELDS = ["ChemicalName", "ChemicalID", "CasRN", "DiseaseName", "DiseaseID", "DirectEvidence", "InferenceGeneSymbol", "InferenceScore", "OmimIDs", "PubMedIDs"]
 (CHEMICAL_NAME,CHEMICAL_ID,CAS_RN,DISEASE_NAME,DISEASE_ID,DIRECT_EVIDENCE,INFERENCE_GENE_SYMBOL,INFERENCE_SCORE,OMIM_IDS,PUBMED_IDS) = range(0,10)
 
+# bytes read from a compressed data file at a time
+INPUT_BUFFER_SIZE = 1024 * 1024
+
 
 # TERMINOLOGY MAPPING FILES
 RXNORM_TO_MESH = "../terminology-mappings/RxNorm-to-MeSH/mesh-to-rxnorm-standard-vocab-v5.csv"
@@ -61,31 +75,12 @@ MESH_TO_OMOP = "../terminology-mappings/StandardVocabToMeSH/mesh-to-standard-voc
 # OUTPUT DATA FILE
 OUTPUT_FILE = "chemical-disease-ctd.nt"
 
-DRUGS_D = {}
-f = open(RXNORM_TO_MESH,"r")
-buf = f.read()
-f.close()
-l = buf.split("\n")
-for elt in l[1:]:
-    if elt.strip() == "":
-        break
-    (mesh,pt,rxcui,concept_name,ohdsiID,conceptClassId) = [x.strip() for x in elt.split("|")]
-    if DRUGS_D.get(mesh): # add a synonymn
-        DRUGS_D[mesh][1].append(pt)
-    else: # create a new record
-        DRUGS_D[mesh] = (rxcui, [pt], ohdsiID)
-
-MESH_D_OMOP = {}
-f = open(MESH_TO_OMOP,"r")
-buf = f.read()
-f.close()
-l = buf.split("\n")
-for elt in l[1:]:
-    if elt.strip() == "":
-        break
-
-    (omop,concept_name,mesh) = [x.strip() for x in elt.split("|")]
-    MESH_D_OMOP[mesh] = omop
+parser = argparse.ArgumentParser(description="Convert the CTD chemical-disease associations to Open Data Annotation")
+parser.add_argument("dataFile", nargs="?", default=DATA_FILE, help="the CTD chemical-disease associations file, compressed (gzip or bzip2) or not (default: %s)" % DATA_FILE)
+args = parser.parse_args()
+
+DRUGS_D = meshToRxNorm(RXNORM_TO_MESH).byMesh
+MESH_D_OMOP = meshToOmop(MESH_TO_OMOP).toOmop
 
 
 ## set up RDF graph
@@ -200,103 +195,134 @@ graph.add((poc[currentAnnotSet], RDF.type, oa["DataAnnotation"])) # TODO: find o
 graph.add((poc[currentAnnotSet], oa["annotatedAt"], Literal(datetime.date.today())))
 graph.add((poc[currentAnnotSet], oa["annotatedBy"], URIRef(u"http://www.pitt.edu/~rdb20/triads-lab.xml#TRIADS")))
 
-outf = codecs.open(OUTPUT_FILE,"w","utf8")
+outf = openOutputFile(OUTPUT_FILE,"w")
 s = graph.serialize(format="n3",encoding="utf8", errors="replace")
 outf.write(s)
+ntw = NTriplesWriter(outf)
+
+# Open the data file fname for reading. A gzip or bzip2 compressed
+# file (recognized by its first bytes, whatever its name) is
+# decompressed as it is read, so the uncompressed file is never
+# written to disk.
+def openDataFile(fname):
+    f = open(fname, 'rb')
+    magic = f.read(3)
+    f.close()
+    if magic.startswith("\x1f\x8b"):
+        # GzipFile.readline is written in Python; the BufferedReader
+        # splits the lines in C
+        return io.BufferedReader(gzip.open(fname, 'rb'), INPUT_BUFFER_SIZE)
+    elif magic == "BZh":
+        return bz2.BZ2File(fname, 'r', INPUT_BUFFER_SIZE)
+    return open(fname, 'r')
+
+# Skip the header of the CTD file inf (the lines at the top that start
+# with "#") and return the first line after it. If a header line lists
+# the fields, they have to be CTD_FIELDS.
+def skipCtdHeader(inf):
+    for l in inf:
+        if not l.startswith("#"):
+            return l
+        fieldL = l[1:].strip().split("\t")
+        if len(fieldL) > 1 and fieldL != CTD_FIELDS:
+            print "ERROR: the CTD data has the fields %s but this script expects %s. Please update CTD2rdf.py for this release." % (fieldL, CTD_FIELDS)
+            sys.exit(1)
+    return ""
 
-# DEBUG
-cntr = 0 
-
-inf = open(DATA_FILE, 'r')
-buf = inf.read()
-inf.close()
-lines = buf.split("\n")
-it = [unicode(x.strip(),'utf-8', 'replace').split("\t") for x in lines[28:]] # skip header
-
+# Yield the CTD records of fname that can be converted: those whose
+# chemical maps to RxNorm and OMOP (DRUGS_D) and whose disease maps to
+# OMOP (MESH_D_OMOP), as
+#
+#   (record, rxcuiDrug, imedsDrug, imedsHoi)
+#
 # There are numerous records with either multiple PMIDs or OMIM record
 # ids. To address this simply, we create a different OA annotation for
 # each target (thus constraining each target to only one PMID or OMIM
-# ID). So, the list is expanded to allow this without making the code
-# that writes OA annotations more complicated than it needs to be.
-expandedIt = []
-#for elt in it[0:200]: # Debugging
-for elt in it:
-    #print elt
-    if elt == [u'']:
-        break
-    
-    if len(elt) == 10:
-        pass
-    elif len(elt) == 9: # this normalizes the field length of the list to save hassle later on
-        elt.append("")
-    else:
-        print "ERROR: encountered an error while processing the CTD data - abnormal record length %s: %s" % (len(elt),elt)
-        sys.exit(1)
-        
-    omimids = elt[OMIM_IDS].strip().split("|")
-    pmids = elt[PUBMED_IDS].strip().split("|")
+# ID). So, each record is expanded into one record per OMIM id (with
+# no PubMed id) followed by one record per PubMed id (with no OMIM id)
+# without making the code that writes OA annotations more complicated
+# than it needs to be.
+#
+# The file is read one line at a time, and the mappings are checked
+# on the raw line before it is decoded or expanded, so most of the
+# (millions of) lines of the file cost a split and two dictionary
+# lookups. A warning is printed the first time a chemical or disease
+# cannot be mapped.
+def mappableCtdRecords(fname):
+    unmappedDrugs = set()
+    unmappedHois = set()
+    (lineCntr, mappedCntr, expandedCntr) = (0, 0, 0)
+
+    inf = openDataFile(fname)
+    firstLine = skipCtdHeader(inf)
+    for l in itertools.chain([firstLine], inf):
+        l = l.strip()
+        if not l:
+            break
+        lineCntr += 1
+
+        rawL = l.split("\t")
+        if len(rawL) == 10:
+            pass
+        elif len(rawL) == 9: # this normalizes the field length of the list to save hassle later on
+            rawL.append("")
+        else:
+            print "ERROR: encountered an error while processing the CTD data - abnormal record length %s: %s" % (len(rawL),unicode(l,'utf-8', 'replace').split("\t"))
+            sys.exit(1)
 
-        
-    if (len(omimids) == 1 and len(pmids) == 0) or (len(omimids) == 0 and len(pmids) == 1):
-        expandedIt.append(elt)
-
-    elif len(omimids) >= 1 or len(pmids) >= 1:
-        for i in range(0,len(omimids)):
-            if not omimids[i]:
-                continue
-            
-            recL = elt[0:-2]
-            recL.append(omimids[i])
-            recL.append("")
-            expandedIt.append(recL)
-
-        for i in range(0,len(pmids)):
-            if not pmids[i]:
-                continue
-            
-            recL = elt[0:-2]
-            recL.append("")
-            recL.append(pmids[i])
-            expandedIt.append(recL)
-    else:
-        print "ERROR: encountered an error while processing the CTD data - abnormal record - neither omim nor pubmed id!"
-        sys.exit(1)
-
-## Debugging
-#for elt in expandedIt:
-#    print "%s" % ",".join(elt)
-#sys.exit(0)
-            
-#for elt in expandedIt[0:10000]:
-for elt in expandedIt:
-    print "%s" % elt
-    if elt == [u'']:
-        break 
+        meshDrug = rawL[CHEMICAL_ID] # MeSH
+        drugMapping = DRUGS_D.get(meshDrug)
+        if drugMapping is None:
+            if meshDrug not in unmappedDrugs:
+                unmappedDrugs.add(meshDrug)
+                print "WARNING: skipping meshDrug, no mapping to rxnorm or omop : %s" % meshDrug
+            continue
+
+        meshHoi = rawL[DISEASE_ID][5:]
+        imedsHoi = MESH_D_OMOP.get(meshHoi)
+        if imedsHoi is None:
+            if meshHoi not in unmappedHois:
+                unmappedHois.add(meshHoi)
+                print "WARNING: skipping MeSH HOI %s : unable to map HOI to OMOP" % meshHoi
+            continue
+        mappedCntr += 1
+
+        elt = unicode(l,'utf-8', 'replace').split("\t")
+        if len(elt) == 9:
+            elt.append(u"")
+        for omimid in elt[OMIM_IDS].strip().split("|"):
+            if omimid:
+                expandedCntr += 1
+                yield (elt[0:-2] + [omimid, u""], drugMapping[0], drugMapping[2], imedsHoi)
+        for pmid in elt[PUBMED_IDS].strip().split("|"):
+            if pmid:
+                expandedCntr += 1
+                yield (elt[0:-2] + [u"", pmid], drugMapping[0], drugMapping[2], imedsHoi)
+    inf.close()
+
+    print "INFO: %s of %s CTD records could be mapped (%s chemicals and %s diseases could not) and were expanded to %s annotations" % (mappedCntr, lineCntr, len(unmappedDrugs), len(unmappedHois), expandedCntr)
+
+## Terms used in every annotation. Looking a term up in a Namespace
+## creates and validates a new URIRef each time, which was most of the
+## time spent writing an annotation, so these are looked up once.
+annotatedAt = Literal(datetime.date.today())
+annotatedBy = URIRef(u"http://www.pitt.edu/~rdb20/triads-lab.xml#TRIADS")
+(oaDataAnnotation, oaAnnotatedAt, oaAnnotatedBy, oaMotivatedBy, oaTagging, oaHasTarget, oaSpecificResource, oaHasSource, oaHasBody) = [oa[x] for x in ("DataAnnotation", "annotatedAt", "annotatedBy", "motivatedBy", "tagging", "hasTarget", "SpecificResource", "hasSource", "hasBody")]
+(ohdsiADRAnnotation, ohdsiAdrAnnotationBody, ohdsiMeshDrug, ohdsiImedsDrug, ohdsiImedsHoi, ohdsiMeshHoi, ohdsiDirectEvidence, ohdsiInferenceGeneSymbol, ohdsiInferenceScore) = [ohdsi[x] for x in ("ADRAnnotation", "adrAnnotationBody", "MeshDrug", "ImedsDrug", "ImedsHoi", "MeshHoi", "DirectEvidence", "InferenceGeneSymbol", "InferenceScore")]
+dctermsDescription = dcterms["description"]
+
+# DEBUG
+cntr = 0 
 
+for (elt, rxcuiDrug, imedsDrug, imedsHoi) in mappableCtdRecords(args.dataFile):
     # if cntr == 20:
     #    break
     cntr += 1
-    print cntr
-    
-    meshDrug = elt[CHEMICAL_ID] # MeSH
-    drugLabs = elt[CHEMICAL_NAME]
+    if cntr % 100000 == 0:
+        print "INFO: %s annotations written" % cntr
 
-    imedsMeshDrug = None
-    if DRUGS_D.has_key(meshDrug):
-        rxcuiDrug = DRUGS_D[meshDrug][0]
-        imedsDrug = DRUGS_D[meshDrug][2]
-        print "INFO: meshDrug %s mapped to rxnorm %s and omop %s" % (meshDrug, rxcuiDrug, imedsDrug)
-    else:
-        print "WARNING: skipping meshDrug, no mapping to rxnorm or omop : %s" % meshDrug
-        continue
-  
-    imedsHoi = None
-    if MESH_D_OMOP.has_key(elt[DISEASE_ID][5:]):
-        imedsHoi = MESH_D_OMOP[elt[DISEASE_ID][5:]]
-        print "INFO: meshHoi %s mapped to %s" % (elt[DISEASE_ID][5:], imedsHoi)
-    else:
-        print "WARNING: skipping meshDrug %s + MeSH HOI %s : unable to map HOI to OMOP" % (meshDrug, elt[DISEASE_ID][5:])
-        continue
+    meshDrug = elt[CHEMICAL_ID] # MeSH
+    meshHoi = elt[DISEASE_ID][5:]
 
     ###################################################################
     ### Each annotations holds one target that points to the source
@@ -309,40 +335,39 @@ for elt in expandedIt:
     if annotatedCache.has_key(cntr):
         currentAnnotation = annotatedCache[cntr]
         currentAnnotItem = "ohdsi-ctd-annotation-item-%s" % currentAnnotation
+        item = poc[currentAnnotItem]
     else:
         currentAnnotation = annotationItemCntr
         annotatedCache[cntr] = currentAnnotation
         annotationItemCntr += 1
         
         currentAnnotItem = "ohdsi-ctd-annotation-item-%s" % currentAnnotation
+        item = poc[currentAnnotItem]
 
         tplL = []
-        #tplL.append((poc[currentAnnotSet], aoOld["item"], poc[currentAnnotItem])) # TODO: find out what is being used for items of collections in OA
-        tplL.append((poc[currentAnnotItem], RDF.type, oa["DataAnnotation"]))
-        tplL.append((poc[currentAnnotItem], RDF.type, ohdsi["ADRAnnotation"])) ## TODO: think if this is the best way to descripe this
-        tplL.append((poc[currentAnnotItem], oa["annotatedAt"], Literal(datetime.date.today())))
-        tplL.append((poc[currentAnnotItem], oa["annotatedBy"], URIRef(u"http://www.pitt.edu/~rdb20/triads-lab.xml#TRIADS")))
-        tplL.append((poc[currentAnnotItem], oa["motivatedBy"], oa["tagging"]))
+        #tplL.append((poc[currentAnnotSet], aoOld["item"], item)) # TODO: find out what is being used for items of collections in OA
+        tplL.append((item, RDF.type, oaDataAnnotation))
+        tplL.append((item, RDF.type, ohdsiADRAnnotation)) ## TODO: think if this is the best way to descripe this
+        tplL.append((item, oaAnnotatedAt, annotatedAt))
+        tplL.append((item, oaAnnotatedBy, annotatedBy))
+        tplL.append((item, oaMotivatedBy, oaTagging))
         # TODO: add in PROV wasGeneratedBY
 
         currentAnnotTargetUuid = URIRef(u"urn:uuid:%s" % uuid.uuid4())
-        tplL.append((poc[currentAnnotItem], oa["hasTarget"], currentAnnotTargetUuid))
-        tplL.append((currentAnnotTargetUuid, RDF.type, oa["SpecificResource"]))
+        tplL.append((item, oaHasTarget, currentAnnotTargetUuid))
+        tplL.append((currentAnnotTargetUuid, RDF.type, oaSpecificResource))
 
         if elt[OMIM_IDS]:
-            tplL.append((currentAnnotTargetUuid, oa["hasSource"], omim[elt[OMIM_IDS]]))
+            tplL.append((currentAnnotTargetUuid, oaHasSource, omim[elt[OMIM_IDS]]))
 
         elif elt[PUBMED_IDS]:
-            tplL.append((currentAnnotTargetUuid, oa["hasSource"], pubmed[elt[PUBMED_IDS]]))
+            tplL.append((currentAnnotTargetUuid, oaHasSource, pubmed[elt[PUBMED_IDS]]))
 
         else:
             print "ERROR: something is not right because there is neither a pubmed nor an OMIM id for this record: %s" % elt
             sys.exit(1)
 
-        s = ""
-        for t in tplL:
-            s += unicode.encode(" ".join((t[0].n3(), t[1].n3(), t[2].n3(), u".\n")), 'utf-8', 'replace')
-        outf.write(s)
+        ntw.writeTriples(tplL)
                 
     # TODO: CTD data has nothing to use for OA:Selector at this
     # time. Work with UMC to get links to the original SPC documents
@@ -352,32 +377,29 @@ for elt in expandedIt:
     # body contains the drug and condition as a semantic tags
     currentAnnotationBody = "ohdsi-ctd-annotation-body-%s" % annotationBodyCntr
     annotationBodyCntr += 1
+    body = poc[currentAnnotationBody]
     
     tplL = []
-    tplL.append((poc[currentAnnotItem], oa["hasBody"], poc[currentAnnotationBody]))
-    tplL.append((poc[currentAnnotationBody], RDFS.label, Literal(u"Drug-HOI tag for %s-%s (mesh: %s-%s)" % (imedsDrug, imedsHoi, meshDrug, elt[DISEASE_ID][5:]))))
-    tplL.append((poc[currentAnnotationBody], RDF.type, ohdsi["adrAnnotationBody"])) # TODO: this is not yet formalized in a public ontology but should be
+    tplL.append((item, oaHasBody, body))
+    tplL.append((body, RDFS.label, Literal(u"Drug-HOI tag for %s-%s (mesh: %s-%s)" % (imedsDrug, imedsHoi, meshDrug, meshHoi))))
+    tplL.append((body, RDF.type, ohdsiAdrAnnotationBody)) # TODO: this is not yet formalized in a public ontology but should be
 
-    tplL.append((poc[currentAnnotationBody], dcterms["description"], Literal(u"Drug-HOI tag for %s - %s" % (elt[CHEMICAL_NAME], elt[DISEASE_NAME]))))
-    tplL.append((poc[currentAnnotationBody], ohdsi['MeshDrug'], mesh[meshDrug]))
-    tplL.append((poc[currentAnnotationBody], ohdsi['ImedsDrug'], ohdsi[imedsDrug]))
+    tplL.append((body, dctermsDescription, Literal(u"Drug-HOI tag for %s - %s" % (elt[CHEMICAL_NAME], elt[DISEASE_NAME]))))
+    tplL.append((body, ohdsiMeshDrug, mesh[meshDrug]))
+    tplL.append((body, ohdsiImedsDrug, ohdsi[imedsDrug]))
 
-    tplL.append((poc[currentAnnotationBody], ohdsi['ImedsHoi'], ohdsi[imedsHoi])) # TODO: consider adding the values as a collection
-    tplL.append((poc[currentAnnotationBody], ohdsi['MeshHoi'], mesh[elt[DISEASE_ID][5:]]))
+    tplL.append((body, ohdsiImedsHoi, ohdsi[imedsHoi])) # TODO: consider adding the values as a collection
+    tplL.append((body, ohdsiMeshHoi, mesh[meshHoi]))
     
     # TODO: Define these predicates - preferrably from an ontology
-    tplL.append((poc[currentAnnotationBody], ohdsi['DirectEvidence'], Literal(elt[DIRECT_EVIDENCE])))
-    tplL.append((poc[currentAnnotationBody], ohdsi['InferenceGeneSymbol'], Literal(elt[INFERENCE_GENE_SYMBOL])))
-    tplL.append((poc[currentAnnotationBody], ohdsi['InferenceScore'], Literal(elt[INFERENCE_SCORE])))
+    tplL.append((body, ohdsiDirectEvidence, Literal(elt[DIRECT_EVIDENCE])))
+    tplL.append((body, ohdsiInferenceGeneSymbol, Literal(elt[INFERENCE_GENE_SYMBOL])))
+    tplL.append((body, ohdsiInferenceScore, Literal(elt[INFERENCE_SCORE])))
 
     # if len(elt) > COMMENT:
-    # tplL.append((poc[currentAnnotationBody], ohdsi['CuratorComment'], Literal(elt[COMMENT])))
-    s = ""
-    for t in tplL:
-        s += unicode.encode(" ".join((t[0].n3(), t[1].n3(), t[2].n3(), u".\n")), 'utf-8', 'replace')
-
-    outf.write(unicode(s,'utf-8', 'replace'))
+    # tplL.append((body, ohdsi['CuratorComment'], Literal(elt[COMMENT])))
+    ntw.writeTriples(tplL)
 
-outf.close
+outf.close()
 
 graph.close()
@@ -0,0 +1,369 @@
+#
+# Load the rows of drugbank_xml_to_sql.py straight into the drugbank
+# schema (drugbank_xml_to_sql.py --load) instead of writing the .rrf
+# files and loading them with drugbank_load_data.sql.
+#
+# The rows of each table are streamed with COPY FROM STDIN, on a
+# connection of its own, into a table in STAGING_SCHEMA that is
+# created like the table in SCHEMA. Once everything is loaded, the
+# duplicates are removed where drugbank_load_data.sql removes them, the
+# keys, foreign keys, and indexes of the tables in SCHEMA are added to
+# the staging tables, and they are moved into SCHEMA in place of the
+# current tables in one transaction. The current tables stay usable
+# until then and a failed load leaves them untouched
+# (and the rows in STAGING_SCHEMA to look at). If the conversion itself
+# fails, abort() ends the COPYs without committing them and drops
+# STAGING_SCHEMA.
+#
+# The tables have to have been created with drugbank_schema.sql before
+# the first load. drugbank_to_omop_mapping is not touched (it is still
+# loaded by drugbank_load_data.sql).
+#
+
+import sys
+import time
+import queue
+import threading
+
+import psycopg2
+
+SCHEMA = 'drugbank'
+STAGING_SCHEMA = 'drugbank_staging'
+
+# characters sent to a COPY at a time, and the number of these chunks
+# that can wait for each table
+COPY_CHUNK_SIZE = 1 << 16
+COPY_QUEUE_SIZE = 16
+
+# table and COPY options for each file, as in drugbank_load_data.sql
+LOADS = {
+  'DRUGBANK_DRUGS.rrf':                                      ('drugs', "(DELIMITER '|', FORMAT TEXT)"),
+  'DRUGBANK_DRUG_ALT_IDS.rrf':                               ('drug_alt_ids', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_GROUPS.rrf':                                ('drug_groups', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_GEN_REFS.rrf':                              ('drug_general_references', "(DELIMITER '|', FORMAT TEXT)"),
+  'DRUGBANK_DRUG_VOL_DIST.rrf':                              ('drug_volumes_of_distribution', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_CLEARANCES.rrf':                            ('drug_clearances', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_CLASSIFICATIONS.rrf':                       ('drug_classifications', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_CLASSIFICATION_ALT_PARENTS.rrf':            ('drug_classification_alt_parents', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_CLASSIFICATION_SUBSTIT.rrf':                ('drug_classification_substituents', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_SALTS.rrf':                                 ('drug_salts', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_SYN.rrf':                                   ('drug_synonyms', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_PROD.rrf':                                  ('drug_products', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_INT_BRANDS.rrf':                            ('drug_international_brands', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_MIX.rrf':                                   ('drug_mixtures', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_PACK.rrf':                                  ('drug_packagers', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_MANUFACTURERS.rrf':                         ('drug_manufacturers', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_PRICES.rrf':                                ('drug_prices', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_COSTS.rrf':                                 ('drug_costs', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_CATEGORIES.rrf':                            ('drug_categories', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_MESH.rrf':                                  ('drug_mesh_ids', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_AFFECTED_ORGANISMS.rrf':                    ('drug_affected_organisms', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_DOSAGES.rrf':                               ('drug_dosages', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_ATC_CODES.rrf':                             ('drug_atc_codes', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_ATC_CODE_LVL.rrf':                          ('drug_atc_code_levels', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_AHFS.rrf':                                  ('drug_ahfs_codes', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_PATENTS.rrf':                               ('drug_patents', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_FOOD_INT.rrf':                              ('drug_food_interactions', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_DRUG_INT.rrf':                              ('drug_drug_interactions', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_SEQ.rrf':                                   ('drug_sequences', "(DELIMITER '|', FORMAT TEXT)"),
+  'DRUGBANK_DRUG_PROPS.rrf':                                 ('drug_properties', "(DELIMITER '|', FORMAT TEXT)"),
+  'DRUGBANK_DRUG_EXT_IDS.rrf':                               ('drug_external_identifiers', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_EXT_LINKS.rrf':                             ('drug_external_links', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_PATHWAYS.rrf':                              ('drug_pathways', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_RXNS.rrf':                                  ('drug_reactions', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_RXN_EL.rrf':                                ('drug_reaction_elements', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_RXN_ENZYMES.rrf':                           ('drug_reaction_enzymes', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_SNP_EFF.rrf':                               ('drug_snp_effects', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_SNP_ADV_DRUG_RXNS.rrf':                     ('drug_snp_adverse_drug_reactions', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_ENZYMES.rrf':                               ('drug_enzymes', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_ENZYME_ACTIONS.rrf':                        ('drug_enzyme_actions', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_ENZYME_REFS.rrf':                           ('drug_enzyme_references', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_ENZYME_POLYPEPTIDES.rrf':                   ('drug_enzyme_polypeptides', "DELIMITER '|' NULL AS ''"),
+  'DRUGBANK_DRUG_ENZYME_POLYPEPTIDE_TRANSMEM_REGIONS.rrf':   ('drug_enzyme_polypeptide_transmembrane_regions', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_ENZYME_EXT_IDS.rrf':                        ('drug_enzyme_polypeptide_external_identifiers', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_ENZYME_SYN.rrf':                            ('drug_enzyme_polypeptide_synonyms', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_ENZYME_AA_SEQ.rrf':                         ('drug_enzyme_polypeptide_amino_acid_sequences', "(DELIMITER '|', FORMAT TEXT)"),
+  'DRUGBANK_DRUG_ENZYMES_GENE_SEQ.rrf':                      ('drug_enzyme_polypeptide_gene_sequences', "(DELIMITER '|', FORMAT TEXT)"),
+  'DRUGBANK_DRUG_ENZYME_PFAMS.rrf':                          ('drug_enzyme_polypeptide_pfams', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_ENZYME_GO_CLASSIFIERS.rrf':                 ('drug_enzyme_polypeptide_go_classifiers', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_TARGETS.rrf':                               ('drug_targets', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_TARGET_ACTIONS.rrf':                        ('drug_target_actions', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_TARGET_REFS.rrf':                           ('drug_target_references', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_TARGET_POLYPEPTIDES.rrf':                   ('drug_target_polypeptides', "DELIMITER '|' NULL AS ''"),
+  'DRUGBANK_DRUG_TARGET_POLYPEPTIDE_TRANSMEM_REGIONS.rrf':   ('drug_target_polypeptide_transmembrane_regions', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_TARGET_EXT_IDS.rrf':                        ('drug_target_polypeptide_external_identifiers', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_TARGET_SYN.rrf':                            ('drug_target_polypeptide_synonyms', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_TARGET_AA_SEQ.rrf':                         ('drug_target_polypeptide_amino_acid_sequences', "(DELIMITER '|', FORMAT TEXT)"),
+  'DRUGBANK_DRUG_TARGETS_GENE_SEQ.rrf':                      ('drug_target_polypeptide_gene_sequences', "(DELIMITER '|', FORMAT TEXT)"),
+  'DRUGBANK_DRUG_TARGET_PFAMS.rrf':                          ('drug_target_polypeptide_pfams', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_TARGET_GO_CLASSIFIERS.rrf':                 ('drug_target_polypeptide_go_classifiers', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_CARRIERS.rrf':                              ('drug_carriers', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_CARRIER_ACTIONS.rrf':                       ('drug_carrier_actions', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_CARRIER_REFS.rrf':                          ('drug_carrier_references', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_CARRIER_POLYPEPTIDES.rrf':                  ('drug_carrier_polypeptides', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_CARRIER_POLYPEPTIDE_TRANSMEM_REGIONS.rrf':  ('drug_carrier_polypeptide_transmembrane_regions', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_CARRIER_EXT_IDS.rrf':                       ('drug_carrier_polypeptide_external_identifiers', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_CARRIER_SYN.rrf':                           ('drug_carrier_polypeptide_synonyms', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_CARRIER_AA_SEQ.rrf':                        ('drug_carrier_polypeptide_amino_acid_sequences', "(DELIMITER '|', FORMAT TEXT)"),
+  'DRUGBANK_DRUG_CARRIERS_GENE_SEQ.rrf':                     ('drug_carrier_polypeptide_gene_sequences', "(DELIMITER '|', FORMAT TEXT)"),
+  'DRUGBANK_DRUG_CARRIER_PFAMS.rrf':                         ('drug_carrier_polypeptide_pfams', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_CARRIER_GO_CLASSIFIERS.rrf':                ('drug_carrier_polypeptide_go_classifiers', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_TRANSPORTERS.rrf':                          ('drug_transporters', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_TRANSPORTER_ACTIONS.rrf':                   ('drug_transporter_actions', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_TRANSPORTER_REFS.rrf':                      ('drug_transporter_references', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_TRANSPORTER_POLYPEPTIDES.rrf':              ('drug_transporter_polypeptides', "DELIMITER '|' NULL AS ''"),
+  'DRUGBANK_DRUG_TRANSPORTER_POLYPEPTIDE_TRANSMEM_REGIONS.rrf': ('drug_transporter_polypeptide_transmembrane_regions', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_TRANSPORTER_EXT_IDS.rrf':                   ('drug_transporter_polypeptide_external_identifiers', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_TRANSPORTER_SYN.rrf':                       ('drug_transporter_polypeptide_synonyms', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_TRANSPORTER_AA_SEQ.rrf':                    ('drug_transporter_polypeptide_amino_acid_sequences', "(DELIMITER '|', FORMAT TEXT)"),
+  'DRUGBANK_DRUG_TRANSPORTERS_GENE_SEQ.rrf':                 ('drug_transporter_polypeptide_gene_sequences', "(DELIMITER '|', FORMAT TEXT)"),
+  'DRUGBANK_DRUG_TRANSPORTER_PFAMS.rrf':                     ('drug_transporter_polypeptide_pfams', "DELIMITER '|' CSV"),
+  'DRUGBANK_DRUG_TRANSPORTER_GO_CLASSIFIERS.rrf':            ('drug_transporter_polypeptide_go_classifiers', "DELIMITER '|' CSV"),
+}
+
+# the tables that drugbank_load_data.sql loads through tmp_table to
+# remove duplicates. Their rows are copied into <table>_rows first.
+DEDUPLICATE = {
+  'drug_general_references': "SELECT DISTINCT ON (general_reference, primary_drugbank_id) * FROM %s ORDER BY (primary_drugbank_id)",
+  'drug_clearances': "SELECT DISTINCT ON (clearance, primary_drugbank_id) * FROM %s WHERE clearance IS NOT NULL ORDER BY (primary_drugbank_id)",
+  'drug_enzyme_references': "SELECT DISTINCT ON (reference, id, primary_drugbank_id) * FROM %s ORDER BY (id)",
+  'drug_target_references': "SELECT DISTINCT ON (reference, id, primary_drugbank_id) * FROM %s ORDER BY (id)",
+  'drug_transporter_references': "SELECT DISTINCT ON (reference, id, primary_drugbank_id) * FROM %s ORDER BY (id)",
+}
+
+def staging(table):
+  return '%s.%s' % (STAGING_SCHEMA, table)
+
+# the table the rows of table are copied into
+def copy_target(table):
+  if(table in DEDUPLICATE):
+    return staging(table + '_rows')
+  return staging(table)
+
+# DB_CONNECTION_INFO has the database, user, password, host, and port
+# on one line, separated by tabs
+def read_connection_info(file_name):
+  with open(file_name, 'r') as f:
+    (db, user, pword, host, port) = f.readline().strip().split('\t')
+  return dict(database=db, user=user, password=pword, host=host, port=port)
+
+def execute(connection, statements, error_message):
+  cursor = connection.cursor()
+  try:
+    for statement in statements:
+      cursor.execute(statement)
+    connection.commit()
+  except Exception as e:
+    connection.rollback()
+    print("ERROR: %s. The tables in %s were not changed. Error string: %s" % (error_message, SCHEMA, e))
+    sys.exit(1)
+
+#
+# The rows of one table. The converter writes them like a file; they
+# are sent in chunks to a thread that runs the COPY and reads them
+# back like a file (cursor.copy_expert calls read()).
+#
+class TableCopy(object):
+  def __init__(self, connection_info, table, options):
+    self.table = table
+    self.options = options
+    self.connection = psycopg2.connect(**connection_info)
+    self.queue = queue.Queue(COPY_QUEUE_SIZE)
+    self.parts = []
+    self.size = 0
+    self.done = False
+    self.aborted = False
+    self.error = None
+    # a daemon so that the process can still exit if a COPY never ends
+    self.thread = threading.Thread(target=self.run, daemon=True)
+    self.thread.start()
+
+  def write(self, text):
+    self.parts.append(text)
+    self.size += len(text)
+    if(self.size >= COPY_CHUNK_SIZE):
+      self.flush()
+
+  def flush(self):
+    if(self.parts):
+      self.queue.put(''.join(self.parts))
+      self.parts = []
+      self.size = 0
+
+  def close(self):
+    self.flush()
+    self.queue.put(None)
+    self.thread.join()
+    self.connection.close()
+
+  # end the COPY without committing the rows sent so far
+  def abort(self):
+    self.aborted = True
+    self.parts = []
+    self.queue.put(None)
+    self.thread.join()
+    self.connection.close()
+
+  def read(self, size=-1):
+    if(self.done):
+      return ''
+    chunk = self.queue.get()
+    if(chunk is None):
+      self.done = True
+      return ''
+    return chunk
+
+  def run(self):
+    cursor = self.connection.cursor()
+    try:
+      cursor.copy_expert('COPY %s FROM STDIN WITH %s' % (copy_target(self.table), self.options), self)
+      if(self.aborted):
+        self.connection.rollback()
+      else:
+        self.connection.commit()
+    except Exception as e:
+      self.connection.rollback()
+      self.error = e
+      # keep taking the rows so that the converter does not wait
+      while(not self.done):
+        self.read()
+
+#
+# Create the staging tables and start a COPY into each of them. Returns
+# the TableCopy to write the rows of each file to, in the same order.
+#
+def start(connection_file, file_names):
+  for file_name in file_names:
+    if(file_name not in LOADS):
+      print("ERROR: no table to load %s into. Add it to LOADS in drugbank_loader.py." % file_name)
+      sys.exit(1)
+  connection_info = read_connection_info(connection_file)
+  connection = psycopg2.connect(**connection_info)
+  cursor = connection.cursor()
+  cursor.execute("SELECT current_setting('max_connections')::int - current_setting('superuser_reserved_connections')::int - (SELECT count(*) FROM pg_stat_activity)")
+  free_connections = cursor.fetchall()[0][0]
+  if(free_connections < len(file_names)):
+    print("ERROR: --load needs a connection for each of the %d tables but the server only has %d left. Raise max_connections or load the .rrf files with drugbank_load_data.sql." % (len(file_names), free_connections))
+    sys.exit(1)
+
+  print("INFO: creating the staging tables in %s" % STAGING_SCHEMA)
+  statements = ["DROP SCHEMA IF EXISTS %s CASCADE" % STAGING_SCHEMA,
+                "CREATE SCHEMA %s" % STAGING_SCHEMA]
+  for file_name in file_names:
+    table = LOADS[file_name][0]
+    statements.append("CREATE TABLE %s (LIKE %s.%s INCLUDING DEFAULTS INCLUDING CONSTRAINTS)" % (staging(table), SCHEMA, table))
+    if(table in DEDUPLICATE):
+      statements.append("CREATE TABLE %s (LIKE %s.%s)" % (copy_target(table), SCHEMA, table))
+  execute(connection, statements, "unable to create the staging tables (has drugbank_schema.sql been run?)")
+  connection.close()
+
+  return [TableCopy(connection_info, LOADS[file_name][0], LOADS[file_name][1]) for file_name in file_names]
+
+# key, foreign key, and index definitions of the tables in SCHEMA, with
+# the names of the tables changed to those in STAGING_SCHEMA. Keys come
+# before the foreign keys that need them.
+def index_and_constraint_statements(connection, tables):
+  cursor = connection.cursor()
+  cursor.execute("SET search_path TO %s" % SCHEMA)
+  cursor.execute("""
+SELECT c.relname, con.conname, pg_get_constraintdef(con.oid)
+FROM pg_constraint con JOIN pg_class c ON c.oid = con.conrelid
+  JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = %s AND c.relname = ANY(%s) AND con.contype IN ('p', 'u', 'f', 'x')
+ORDER BY con.contype = 'f', c.relname, con.conname
+""", (SCHEMA, tables))
+  statements = []
+  for (table, name, definition) in cursor.fetchall():
+    definition = definition.replace('REFERENCES %s.' % SCHEMA, 'REFERENCES ')
+    statements.append('ALTER TABLE %s ADD CONSTRAINT "%s" %s' % (staging(table), name, definition))
+  cursor.execute("""
+SELECT c.relname, pg_get_indexdef(i.indexrelid)
+FROM pg_index i JOIN pg_class c ON c.oid = i.indrelid
+  JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = %s AND c.relname = ANY(%s)
+  AND NOT EXISTS (SELECT 1 FROM pg_constraint con WHERE con.conindid = i.indexrelid)
+""", (SCHEMA, tables))
+  for (table, definition) in cursor.fetchall():
+    statements.append(definition.replace(' ON %s.%s ' % (SCHEMA, table), ' ON %s ' % table))
+  connection.rollback()
+  return statements
+
+# statements that give the staging tables the privileges of the tables
+# in SCHEMA (drugbank_schema.sql grants them)
+def privilege_statements(connection, tables):
+  cursor = connection.cursor()
+  cursor.execute("""
+SELECT table_name, grantee, privilege_type
+FROM information_schema.role_table_grants
+WHERE table_schema = %s AND table_name = ANY(%s) AND grantee <> current_user
+""", (SCHEMA, tables))
+  statements = []
+  for (table, grantee, privilege) in cursor.fetchall():
+    if(grantee != 'PUBLIC'):
+      grantee = '"%s"' % grantee
+    statements.append("GRANT %s ON %s TO %s" % (privilege, staging(table), grantee))
+  connection.rollback()
+  return statements
+
+#
+# Called when the conversion fails: end every COPY without committing
+# it and drop the staging tables. The tables in SCHEMA are not touched.
+#
+def abort(connection_file, table_copies):
+  for table_copy in table_copies:
+    table_copy.abort()
+  try:
+    connection = psycopg2.connect(**read_connection_info(connection_file))
+    connection.cursor().execute("DROP SCHEMA IF EXISTS %s CASCADE" % STAGING_SCHEMA)
+    connection.commit()
+    connection.close()
+  except Exception as e:
+    print("WARNING: unable to drop %s after the failed conversion. Error string: %s" % (STAGING_SCHEMA, e))
+  print("ERROR: the conversion failed. Nothing was loaded and the tables in %s were not changed." % SCHEMA)
+
+#
+# Wait for the COPYs to finish, then build the keys and swap the
+# staging tables in for the tables in SCHEMA
+#
+def finish(connection_file, table_copies):
+  start_time = time.time()
+  for table_copy in table_copies:
+    table_copy.close()
+  failed = [table_copy for table_copy in table_copies if table_copy.error is not None]
+  for table_copy in failed:
+    print("ERROR: unable to copy the rows of %s. Error string: %s" % (table_copy.table, table_copy.error))
+  if(failed):
+    print("ERROR: the tables in %s were not changed." % SCHEMA)
+    sys.exit(1)
+  print("INFO: rows copied into %s (%.1f seconds after the last drug)" % (STAGING_SCHEMA, time.time() - start_time))
+
+  tables = [table_copy.table for table_copy in table_copies]
+  connection = psycopg2.connect(**read_connection_info(connection_file))
+
+  step_time = time.time()
+  statements = []
+  for table in tables:
+    if(table in DEDUPLICATE):
+      statements.append("INSERT INTO %s %s" % (staging(table), DEDUPLICATE[table] % copy_target(table)))
+      statements.append("DROP TABLE %s" % copy_target(table))
+  execute(connection, statements, "unable to remove the duplicates from the staging tables")
+  print("INFO: duplicates removed (%.1f seconds)" % (time.time() - step_time))
+
+  step_time = time.time()
+  statements = ["SET search_path TO %s" % STAGING_SCHEMA] + index_and_constraint_statements(connection, tables)
+  statements += ["ANALYZE %s" % staging(table) for table in tables]
+  execute(connection, statements, "unable to add the keys and indexes to the staging tables (see the rows in %s)" % STAGING_SCHEMA)
+  print("INFO: keys and indexes added (%.1f seconds)" % (time.time() - step_time))
+
+  step_time = time.time()
+  statements = privilege_statements(connection, tables)
+  # one DROP for all of the tables so that their foreign keys to each
+  # other do not need CASCADE (which would also drop the views and
+  # foreign keys of other objects that depend on them)
+  statements.append("DROP TABLE IF EXISTS %s" % ", ".join(["%s.%s" % (SCHEMA, table) for table in tables]))
+  for table in tables:
+    statements.append("ALTER TABLE %s SET SCHEMA %s" % (staging(table), SCHEMA))
+  statements.append("DROP SCHEMA %s" % STAGING_SCHEMA)
+  execute(connection, statements, "unable to swap in the staging tables (drop or change any views or foreign keys of other tables that depend on the tables in %s, see the error, and run the load again)" % SCHEMA)
+  connection.close()
+  print("INFO: %d tables loaded into %s (%.1f seconds after the last drug)" % (len(tables), SCHEMA, time.time() - start_time))
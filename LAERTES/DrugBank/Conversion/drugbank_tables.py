@@ -0,0 +1,265 @@
+#
+# The tables that drugbank_xml_to_sql.py writes from drugbank.xml.
+# Each Table is one pipe-delimited .rrf file loaded by
+# drugbank_load_data.sql into the table of the same name in
+# drugbank_schema.sql. A new version of the DrugBank schema should only
+# need changes here.
+#
+# A Table has:
+#
+#  path    - where its rows are, relative to a <drug> element. Steps are
+#            separated by '/', 'a|b' matches either element (in document
+#            order), 'x{expr}' keeps one x per non-empty value of expr
+#            (the last one, at the position of the first, the way the old
+#            converter kept these rows in dictionaries), and
+#            'x[not(expr)]' skips x when expr has a value.
+#
+#  columns - one value per column, evaluated for each row element. A
+#            column is an expression, or (expression, conversion) if the
+#            value is not converted with TEXT. Expressions are:
+#              'a/b'          text of the child element(s)
+#              '@a', 'a/@b'   attribute
+#              '.'            text of the row element
+#              'name()'       local tag name of the row element
+#              '#'            number of the row element from its counter
+#                             (see COUNTERS)
+#              DRUG_ID        primary DrugBank id of the drug
+#            and can start with one or more '../' to read an element
+#            above the row element on the path.
+#
+#  split   - the text of the row element ('.') is a list separated by
+#            this string. One row is written for each non-blank item.
+#
+#  required - columns that must not be empty for the row to be written.
+#
+
+import re
+
+NS = '{http://www.drugbank.ca}'
+
+DRUG_ID = '$drugbank-id'
+
+#
+#	CONVERSIONS
+#
+# Every value is escaped by one of these escapers. Each is a single
+# precompiled pattern that does in one pass what the chains of
+# str.replace() in the old converter did, and gives the value back as it
+# is when there is nothing to escape (almost always).
+#
+def escaper(replacements):
+  pattern = re.compile('[%s]' % re.escape(''.join(replacements)))
+  replace = lambda match: replacements[match.group()]
+  def escape(value):
+    if(pattern.search(value) is None):
+      return value
+    return pattern.sub(replace, value)
+  return escape
+
+escape = escaper({'\n': '\\n', '\r': '\\r', '|': '\\|'})
+# references and synonyms have their quotes doubled
+escape_quotes = escaper({'\n': '\\n', '\r': '\\r', '|': '\\|', "'": "''", '"': "''''"})
+# general references are loaded with FORMAT TEXT, so backslashes are
+# doubled too
+escape_text_format = escaper({'\n': '\\\\n', '\\': '\\\\', '\r': '\\r', '|': '\\|'})
+# regions ('12-34') lose line breaks and pipes instead
+remove_breaks = escaper({'\n': '', '\r': '', '|': ''})
+
+# text with trailing white space removed
+def TEXT(value):
+  if(value is None):
+    return ''
+  return escape(value.rstrip())
+
+# text as it is in the XML (sequences, functions, identifiers)
+def KEEP(value):
+  if(value is None):
+    return ''
+  return escape(value)
+
+def QUOTED(value):
+  if(value is None):
+    return ''
+  return escape_quotes(value.rstrip())
+
+def SYNONYM(value):
+  if(value is None):
+    return ''
+  return "'" + escape_quotes(value.rstrip()) + "'"
+
+def GENERAL_REFERENCES(value):
+  if(value is None):
+    return ''
+  return escape_text_format(value.rstrip())
+
+def UPPER(value):
+  return TEXT(value).upper()
+
+def MESH_IDS(value):
+  return TEXT(value).replace('[', '').replace(']', '')
+
+def REGION(value):
+  if(value is None):
+    return ''
+  return remove_breaks(value)
+
+# lower and upper bound of a region
+def region_bound(index):
+  def convert(value):
+    bounds = REGION(value).split('-')
+    if(index < len(bounds)):
+      return bounds[index]
+    return ''
+  return convert
+
+# 'TRUE' for rows whose element (see 'name()') is the given one
+def flag(tag):
+  def convert(value):
+    if(value == tag):
+      return 'TRUE'
+    return 'FALSE'
+  return convert
+
+class Table(object):
+  def __init__(self, file_name, path, columns, split = None, required = ()):
+    self.file_name = file_name
+    self.path = path
+    self.columns = columns
+    self.split = split
+    self.required = required
+
+#
+#	COUNTERS
+#
+# The elements that are numbered across the whole file, in document
+# order, so that other tables can refer to them ('#'). Amino acid and
+# gene sequences of a polypeptide share its number.
+#
+COUNTERS = [
+  ('sequence', 'sequences/sequence'),
+  ('property', 'experimental-properties|calculated-properties/property'),
+  ('reaction', 'reactions/reaction'),
+  ('snp_effect', 'snp-effects/effect'),
+  ('snp_adverse_effect', 'snp-adverse-drug-reactions/reaction'),
+  ('target', 'targets/target'),
+  ('target_sequence', 'targets/target/polypeptide'),
+  ('transporter_sequence', 'transporters/transporter/polypeptide'),
+]
+
+#
+#	TARGETS / ENZYMES / CARRIERS / TRANSPORTERS
+#
+# The four kinds of interactants have the same tables. Only targets are
+# numbered (their rows carry the number before the id), only target and
+# transporter polypeptide sequences are numbered, and only transporter
+# references keep their quotes.
+#
+def interactant_tables(kind, plural_name, numbered, sequences_numbered, references):
+  name = kind.upper()
+  path = '%ss/%s' % (kind, kind)
+  polypeptide = path + '/polypeptide'
+
+  # the columns that identify the interactant from 'up' levels below it
+  def owner(up):
+    if(numbered):
+      return ['../' * up + '#', ('../' * up + 'id', KEEP)]
+    return [('../' * up + 'id', KEEP)]
+
+  # the columns that identify the polypeptide from 'up' levels below it
+  def polypeptide_owner(up):
+    return ['../' * up + '@id', '../' * up + '@source'] + owner(up + 1) + [DRUG_ID]
+
+  def sequence(tag):
+    number = ['#'] if sequences_numbered else []
+    return number + [(tag, KEEP), tag + '/@format', '@id', '@source'] + owner(1) + [DRUG_ID]
+
+  return [
+    Table('DRUGBANK_DRUG_%s.rrf' % plural_name, path,
+          [DRUG_ID] + (['#'] if numbered else []) + ['@position'] +
+          [(column, KEEP) for column in ['id', 'name', 'organism', 'known-action', 'inhibition-strength', 'induction-strength']]),
+    Table('DRUGBANK_DRUG_%s_ACTIONS.rrf' % name, path + '/actions/action',
+          [DRUG_ID] + owner(2) + [('.', KEEP)], required = ['.']),
+    Table('DRUGBANK_DRUG_%s_REFS.rrf' % name, path + '/references',
+          [DRUG_ID] + owner(1) + [('.', references)], split = '#'),
+    Table('DRUGBANK_DRUG_%s_POLYPEPTIDES.rrf' % name, polypeptide,
+          ['@id', '@source', ('name', KEEP), ('general-function', KEEP), ('specific-function', KEEP)] + owner(1) + [DRUG_ID] +
+          [(column, KEEP) for column in ['gene-name', 'locus', 'cellular-location']] +
+          [('signal-regions', region_bound(0)), ('signal-regions', region_bound(1))] +
+          [(column, KEEP) for column in ['theoretical-pi', 'molecular-weight', 'chromosome-location', 'organism']] +
+          ['organism/@ncbi-taxonomy-id']),
+    Table('DRUGBANK_DRUG_%s_POLYPEPTIDE_TRANSMEM_REGIONS.rrf' % name, polypeptide + '/transmembrane-regions',
+          polypeptide_owner(1) + [('.', REGION)], split = '-'),
+    Table('DRUGBANK_DRUG_%s_EXT_IDS.rrf' % name, polypeptide + '/external-identifiers/external-identifier',
+          [('resource', KEEP), ('identifier', KEEP)] + polypeptide_owner(2)),
+    Table('DRUGBANK_DRUG_%s_SYN.rrf' % name, polypeptide + '/synonyms/synonym',
+          [('.', KEEP)] + polypeptide_owner(2), required = ['.']),
+    Table('DRUGBANK_DRUG_%s_AA_SEQ.rrf' % name, polypeptide, sequence('amino-acid-sequence')),
+    Table('DRUGBANK_DRUG_%s_GENE_SEQ.rrf' % plural_name, polypeptide, sequence('gene-sequence')),
+    Table('DRUGBANK_DRUG_%s_PFAMS.rrf' % name, polypeptide + '/pfams/pfam',
+          [('identifier', KEEP), ('name', KEEP)] + polypeptide_owner(2)),
+    Table('DRUGBANK_DRUG_%s_GO_CLASSIFIERS.rrf' % name, polypeptide + '/go-classifiers/go-classifier',
+          [('category', KEEP), ('description', KEEP)] + polypeptide_owner(2)),
+  ]
+
+#
+#	TABLES
+#
+TABLES = [
+  Table('DRUGBANK_DRUGS.rrf', '.',
+        [DRUG_ID, 'name', 'description', 'cas-number', 'synthesis-reference', 'indication', 'pharmacodynamics',
+         'mechanism-of-action', 'toxicity', 'metabolism', 'absorption', 'half-life', 'protein-binding',
+         'route-of-elimination', '@type', '@created', '@updated']),
+  Table('DRUGBANK_DRUG_ALT_IDS.rrf', 'drugbank-id[not(@primary)]', ['.', DRUG_ID]),
+  Table('DRUGBANK_DRUG_GROUPS.rrf', 'groups/group', ['.', DRUG_ID]),
+  Table('DRUGBANK_DRUG_GEN_REFS.rrf', 'general-references', [('.', GENERAL_REFERENCES), DRUG_ID], split = '#'),
+  Table('DRUGBANK_DRUG_VOL_DIST.rrf', 'volume-of-distribution', ['.', DRUG_ID], split = '*'),
+  Table('DRUGBANK_DRUG_CLEARANCES.rrf', 'clearance', ['.', DRUG_ID], split = '*'),
+  Table('DRUGBANK_DRUG_CLASSIFICATIONS.rrf', 'classification',
+        [DRUG_ID, 'description', 'direct-parent', 'kingdom', 'superclass', 'drug-class', 'subclass']),
+  Table('DRUGBANK_DRUG_CLASSIFICATION_ALT_PARENTS.rrf', 'classification/alternative-parent', [DRUG_ID, '.'], required = ['.']),
+  Table('DRUGBANK_DRUG_CLASSIFICATION_SUBSTIT.rrf', 'classification/substituent', [DRUG_ID, '.'], required = ['.']),
+  Table('DRUGBANK_DRUG_SALTS.rrf', 'salts/salt{drugbank-id}', ['drugbank-id', DRUG_ID, 'name', 'cas-number', 'inchikey']),
+  Table('DRUGBANK_DRUG_SYN.rrf', 'synonyms/synonym{.}', [('.', SYNONYM), '@language', '@coder', DRUG_ID]),
+  Table('DRUGBANK_DRUG_PROD.rrf', 'products/product{name}',
+        ['name', 'ndc-id', 'ndc-product-code', 'dpd-id', 'started-marketing-on', 'ended-marketing-on', 'dosage-form',
+         'strength', 'route', 'fda-application-number', ('generic', UPPER), ('over-the-counter', UPPER),
+         ('approved', UPPER), 'country', 'source', DRUG_ID]),
+  Table('DRUGBANK_DRUG_INT_BRANDS.rrf', 'international-brands/international-brand{name}', ['name', 'company', DRUG_ID], required = ['company']),
+  Table('DRUGBANK_DRUG_MIX.rrf', 'mixtures/mixture{name}', ['name', 'ingredients', DRUG_ID], required = ['ingredients']),
+  Table('DRUGBANK_DRUG_PACK.rrf', 'packagers/packager{name}', ['name', 'url', DRUG_ID]),
+  Table('DRUGBANK_DRUG_MANUFACTURERS.rrf', 'manufacturers/manufacturer{.}', ['.', ('@generic', UPPER), DRUG_ID]),
+  Table('DRUGBANK_DRUG_PRICES.rrf', 'prices/price{description}', ['description', 'unit', DRUG_ID]),
+  Table('DRUGBANK_DRUG_COSTS.rrf', 'prices/price{description}/cost{@currency}',
+        ['@currency', '.', '../description', '../unit', DRUG_ID], required = ['.']),
+  Table('DRUGBANK_DRUG_CATEGORIES.rrf', 'categories/category{category}', ['category', DRUG_ID]),
+  Table('DRUGBANK_DRUG_MESH.rrf', 'categories/category{category}/mesh-id', [('.', MESH_IDS), '../category', DRUG_ID], split = ', '),
+  Table('DRUGBANK_DRUG_AFFECTED_ORGANISMS.rrf', 'affected-organisms/affected-organism', ['.', DRUG_ID]),
+  Table('DRUGBANK_DRUG_DOSAGES.rrf', 'dosages/dosage{form}', ['form', 'route', 'strength', DRUG_ID]),
+  Table('DRUGBANK_DRUG_ATC_CODES.rrf', 'atc-codes/atc-code', [('@code', KEEP), DRUG_ID]),
+  Table('DRUGBANK_DRUG_ATC_CODE_LVL.rrf', 'atc-codes/atc-code/level', [('@code', KEEP), '.', ('../@code', KEEP), DRUG_ID]),
+  Table('DRUGBANK_DRUG_AHFS.rrf', 'ahfs-codes/ahfs-code', [('.', KEEP), DRUG_ID], required = ['.']),
+  Table('DRUGBANK_DRUG_PATENTS.rrf', 'patents/patent',
+        [('number', KEEP), ('country', KEEP), ('approved', KEEP), ('expires', KEEP), DRUG_ID]),
+  Table('DRUGBANK_DRUG_FOOD_INT.rrf', 'food-interactions/food-interaction', ['.', DRUG_ID]),
+  Table('DRUGBANK_DRUG_DRUG_INT.rrf', 'drug-interactions/drug-interaction', [DRUG_ID, 'drugbank-id', 'name', 'description']),
+  Table('DRUGBANK_DRUG_SEQ.rrf', 'sequences/sequence', ['#', ('.', KEEP), ('@format', KEEP), DRUG_ID]),
+  Table('DRUGBANK_DRUG_PROPS.rrf', 'experimental-properties|calculated-properties/property',
+        ['#', 'kind', 'value', DRUG_ID, 'source',
+         ('../name()', flag('experimental-properties')), ('../name()', flag('calculated-properties'))]),
+  Table('DRUGBANK_DRUG_EXT_IDS.rrf', 'external-identifiers/external-identifier', [('resource', KEEP), ('identifier', KEEP), DRUG_ID]),
+  Table('DRUGBANK_DRUG_EXT_LINKS.rrf', 'external-links/external-link', [('resource', KEEP), ('url', KEEP), DRUG_ID]),
+  # pathways are not converted yet
+  Table('DRUGBANK_DRUG_PATHWAYS.rrf', None, []),
+  Table('DRUGBANK_DRUG_RXNS.rrf', 'reactions/reaction', ['#', ('sequence', KEEP), DRUG_ID]),
+  Table('DRUGBANK_DRUG_RXN_EL.rrf', 'reactions/reaction/left-element|right-element',
+        [DRUG_ID, ('drugbank-id', KEEP), ('name', KEEP), ('name()', flag('left-element')), ('name()', flag('right-element')), '../#']),
+  Table('DRUGBANK_DRUG_RXN_ENZYMES.rrf', 'reactions/reaction/enzymes/enzyme',
+        [DRUG_ID, ('drugbank-id', KEEP), '../../#', ('name', KEEP), ('uniprot-id', KEEP)]),
+  Table('DRUGBANK_DRUG_SNP_EFF.rrf', 'snp-effects/effect',
+        ['#', DRUG_ID] + [(column, KEEP) for column in ['protein-name', 'gene-symbol', 'uniprot-id', 'rs-id', 'allele', 'defining-change', 'description', 'pubmed-id']]),
+  Table('DRUGBANK_DRUG_SNP_ADV_DRUG_RXNS.rrf', 'snp-adverse-drug-reactions/reaction',
+        ['#', DRUG_ID] + [(column, KEEP) for column in ['protein-name', 'gene-symbol', 'uniprot-id', 'rs-id', 'allele', 'adverse-reaction', 'description', 'pubmed-id']]),
+] + interactant_tables('enzyme', 'ENZYMES', False, False, QUOTED) \
+  + interactant_tables('transporter', 'TRANSPORTERS', False, True, TEXT) \
+  + interactant_tables('carrier', 'CARRIERS', False, False, QUOTED) \
+  + interactant_tables('target', 'TARGETS', True, True, QUOTED)
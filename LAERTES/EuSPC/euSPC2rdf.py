@@ -9,7 +9,7 @@
 #
 
 import sys
-sys.path = sys.path + ['.']
+sys.path = sys.path + ['.', '../common', '../terminology-mappings']
 reload(sys)
 sys.setdefaultencoding('utf8')
 
@@ -19,6 +19,9 @@ import json
 import pickle
 from rdflib import Graph, Literal, Namespace, URIRef, RDF, RDFS
 
+from ntriplesWriter import NTriplesWriter, openOutputFile
+from terminologyMappings import rxnormToOmop, meddraToOmop
+
 DATA_FILE = "data/Finalrepository_DLP31Dec2013_withCUIs_ManualEdit_V1.tsv"
 (PRODUCT,SUBSTANCE,DATE_OF_THE_SPC,RxNorm,MeSH,ADR_AS_IT_APPEARS_IN_THE_SPC,SOC,HLGT,HLT,LLT,MEDDRA_PT,PT_CODE,SOC_CODE,AGE_GROUP,GENDER,CAUSALITY,FREQUENCY,CLASS_WARNING,CLINICAL_TRIALS,POST_MARKETING,COMMENT) = range(0,21)
 
@@ -30,29 +33,8 @@ MEDDRA_TO_OMOP = "../terminology-mappings/StandardVocabToMeddra/standard_vocab_t
 # OUTPUT DATA FILE
 OUTPUT_FILE = "drug-hoi-eu-spc.nt"
 
-DRUGS_D_OMOP = {}
-f = open(RXNORM_TO_OMOP,"r")
-buf = f.read()
-f.close()
-l = buf.split("\n")
-for elt in l:
-    if elt.strip() == "":
-        break
-
-    (omop,rxcui) = [x.strip() for x in elt.split("|")]
-    DRUGS_D_OMOP[rxcui] = omop
-
-MEDDRA_D_OMOP = {}
-f = open(MEDDRA_TO_OMOP,"r")
-buf = f.read()
-f.close()
-l = buf.split("\n")
-for elt in l[1:]:
-    if elt.strip() == "":
-        break
-
-    (omop,meddra) = [x.strip() for x in elt.split("|")]
-    MEDDRA_D_OMOP[meddra] = omop
+DRUGS_D_OMOP = rxnormToOmop(RXNORM_TO_OMOP).toOmop
+MEDDRA_D_OMOP = meddraToOmop(MEDDRA_TO_OMOP).toOmop
 
 
 ## set up RDF graph
@@ -166,9 +148,10 @@ graph.add((poc[currentAnnotSet], RDF.type, oa["DataAnnotation"])) # TODO: find o
 graph.add((poc[currentAnnotSet], oa["annotatedAt"], Literal(datetime.date.today())))
 graph.add((poc[currentAnnotSet], oa["annotatedBy"], URIRef(u"http://www.pitt.edu/~rdb20/triads-lab.xml#TRIADS")))
 
-outf = codecs.open(OUTPUT_FILE,"w","utf8")
+outf = openOutputFile(OUTPUT_FILE,"w")
 s = graph.serialize(format="n3",encoding="utf8", errors="replace")
 outf.write(s)
+ntw = NTriplesWriter(outf)
 
 # DEBUG
 cntr = 0 
@@ -240,10 +223,7 @@ for elt in it:
         tplL.append((currentAnnotTargetUuid, RDF.type, oa["SpecificResource"]))
         tplL.append((currentAnnotTargetUuid, oa["hasSource"], URIRef(u"http://www.imi-protect.eu/adverseDrugReactions.shtml")))
 
-        s = ""
-        for t in tplL:
-            s += unicode.encode(" ".join((t[0].n3(), t[1].n3(), t[2].n3(), u".\n")), 'utf-8', 'replace')
-        outf.write(s)
+        ntw.writeTriples(tplL)
                 
     # TODO: EU ADR data has nothing to use for OA:Selector at this
     # time. Work with UMC to get links to the original SPC documents
@@ -277,11 +257,8 @@ for elt in it:
 
     if len(elt) > COMMENT:
         tplL.append((poc[currentAnnotationBody], ohdsi['CuratorComment'], Literal(elt[COMMENT])))
-    s = ""
-    for t in tplL:
-        s += unicode.encode(" ".join((t[0].n3(), t[1].n3(), t[2].n3(), u".\n")), 'utf-8', 'replace')
-    outf.write(unicode(s,'utf-8', 'replace'))
+    ntw.writeTriples(tplL)
 
-outf.close
+outf.close()
 
 graph.close()
@@ -0,0 +1,146 @@
+# buildSemmeddbIndex.py
+#
+# Build an on-disk SQLite index of the SemMedDB data needed by
+# pmSearch2rdf.py to expand MeSH pharmacologic action groupings to
+# the specific drugs mentioned in a title or abstract:
+#
+#   pmid_cui : the CUIs present in the s_cui or o_cui columns of
+#              semmeddb.PREDICATION_AGGREGATE for each PMID in the
+#              search results
+#   mesh_cui : the UMLS MetaThesaurus CUIs for every MeSH descriptor
+#              (umls.MRCONSO with SAB = 'MSH')
+#   pmid     : every PMID in the search results (including those with
+#              no CUIs in SemMedDB)
+#   index_info : the size and modification time of the search results
+#              file and the number of SemMedDB rows the index was
+#              built from. pmSearch2rdf.py refuses to use an index
+#              built from a different search results file.
+#
+# PREDICATION_AGGREGATE and MRCONSO are each streamed once using an
+# unbuffered (server-side) cursor. When the index file is present,
+# pmSearch2rdf.py reads it (memory-mapped) instead of querying
+# SemMedDB for every PMID.
+#
+# USAGE: python buildSemmeddbIndex.py
+#
+# Rerun whenever SEARCH_RESULTS or the SemMedDB/UMLS release changes.
+#
+
+import sys, os, sqlite3, datetime
+sys.path = sys.path + ['.']
+
+import mysql.connector as msql # for mysql connection to Semmeddb
+
+## The result of the query in queryDrugHOIAssociations.psql. NOTE: keep in sync with pmSearch2rdf.py
+SEARCH_RESULTS = "drug-hoi-associations-from-mesh-September-2016.tsv"
+#SEARCH_RESULTS = "test-drug-hoi-dataset.tsv"
+
+SEMMEDDB_CONNECTION_INFO="db-connection-SEMMEDDB.conf"
+
+# OUTPUT INDEX FILE. NOTE: keep in sync with pmSearch2rdf.py
+SEMMEDDB_INDEX = "semmeddb-pmid-cui-index.sqlite"
+
+FETCH_SIZE = 10000 # rows pulled from the server per round trip
+
+# An iterator that uses fetchmany to keep memory usage down
+def ResultIter(cursor, arraysize=FETCH_SIZE):
+    while True:
+        results = cursor.fetchmany(arraysize)
+        if not results:
+            break
+        for result in results:
+            yield result
+
+## Collect the distinct PMIDs in the search results
+PMID = 0
+pmidS = set()
+searchResultsStat = os.stat(SEARCH_RESULTS)
+f = open(SEARCH_RESULTS,'r')
+for line in f:
+    if line.strip() == "":
+        continue
+    pmidS.add(line.split("\t")[PMID].strip())
+f.close()
+print "INFO: %s distinct PMIDs in %s" % (len(pmidS), SEARCH_RESULTS)
+
+f = open(SEMMEDDB_CONNECTION_INFO,'r')
+(db,user,pword,host,port) = f.readline().strip().split("\t")
+f.close()
+try:
+    smdb_conn=msql.connect(database=db, user=user, password=pword, host=host, port=port)
+except Exception as e:
+    print "ERROR: Unable to connect to database %s (user:%s) on host %s (port: %s). Check that the data in db-connection-SEMMEDDB.conf is correct and that there is not barrier related to the network connection. Error: %s" % (db,user,host,port,e)
+    sys.exit(1)
+smdb_cur = smdb_conn.cursor(buffered=False)
+
+## Write to a temporary file and rename at the end so that a failed
+## build never leaves a partial index for pmSearch2rdf.py to pick up
+tmpIndex = SEMMEDDB_INDEX + ".tmp"
+if os.path.exists(tmpIndex):
+    os.remove(tmpIndex)
+idx = sqlite3.connect(tmpIndex)
+idx.execute("PRAGMA journal_mode = OFF")
+idx.execute("PRAGMA synchronous = OFF")
+idx.execute("CREATE TABLE pmid_cui (pmid TEXT NOT NULL, cui TEXT NOT NULL)")
+idx.execute("CREATE TABLE mesh_cui (sdui TEXT NOT NULL, cui TEXT NOT NULL)")
+idx.execute("CREATE TABLE pmid (pmid TEXT PRIMARY KEY)")
+idx.execute("CREATE TABLE index_info (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+idx.executemany("INSERT INTO pmid VALUES (?)", [(pmid,) for pmid in sorted(pmidS)])
+
+## 1. Stream PREDICATION_AGGREGATE once and keep the CUIs for PMIDs of interest
+print "INFO: streaming semmeddb.PREDICATION_AGGREGATE"
+## (either CUI can be NULL, so the one that is present is kept)
+smdb_cur.execute("""SELECT PMID, s_cui, o_cui FROM semmeddb.PREDICATION_AGGREGATE WHERE s_cui IS NOT NULL OR o_cui IS NOT NULL""")
+pmidCuiS = set()
+ctr = 0
+for (pmid, s_cui, o_cui) in ResultIter(smdb_cur):
+    ctr += 1
+    if ctr % 1000000 == 0:
+        print "INFO: scanned %s predications, %s PMID-CUI pairs kept" % (ctr, len(pmidCuiS))
+    pmid = str(pmid)
+    if pmid not in pmidS:
+        continue
+    if s_cui != None:
+        pmidCuiS.add((pmid, s_cui))
+    if o_cui != None:
+        pmidCuiS.add((pmid, o_cui))
+predicationCtr = ctr
+
+idx.executemany("INSERT INTO pmid_cui VALUES (?,?)", sorted(pmidCuiS))
+print "INFO: wrote %s PMID-CUI pairs covering %s PMIDs" % (len(pmidCuiS), len(set([x[0] for x in pmidCuiS])))
+pmidCuiS = None
+
+## 2. Stream the MeSH descriptor to CUI mappings from MRCONSO
+print "INFO: streaming umls.MRCONSO (SAB = 'MSH')"
+smdb_cur.execute("""SELECT DISTINCT SDUI, CUI FROM umls.MRCONSO WHERE SAB = 'MSH' AND SDUI IS NOT NULL AND CUI IS NOT NULL""")
+ctr = 0
+batch = []
+for (sdui, cui) in ResultIter(smdb_cur):
+    batch.append((sdui, cui))
+    if len(batch) == FETCH_SIZE:
+        idx.executemany("INSERT INTO mesh_cui VALUES (?,?)", batch)
+        ctr += len(batch)
+        batch = []
+idx.executemany("INSERT INTO mesh_cui VALUES (?,?)", batch)
+ctr += len(batch)
+print "INFO: wrote %s MeSH descriptor-CUI pairs" % ctr
+
+## Record what the index was built from (checked by pmSearch2rdf.py)
+idx.executemany("INSERT INTO index_info VALUES (?,?)", [
+    ("search_results", SEARCH_RESULTS),
+    ("search_results_size", str(searchResultsStat.st_size)),
+    ("search_results_mtime", str(int(searchResultsStat.st_mtime))),
+    ("search_results_pmids", str(len(pmidS))),
+    ("predication_rows", str(predicationCtr)),
+    ("mesh_cui_rows", str(ctr)),
+    ("built", datetime.datetime.now().isoformat())])
+
+idx.execute("CREATE INDEX pmid_cui_pmid_idx ON pmid_cui (pmid)")
+idx.execute("CREATE INDEX mesh_cui_sdui_idx ON mesh_cui (sdui)")
+idx.commit()
+idx.close()
+smdb_conn.close()
+
+os.rename(tmpIndex, SEMMEDDB_INDEX)
+print "INFO: SemMedDB index written to %s" % SEMMEDDB_INDEX
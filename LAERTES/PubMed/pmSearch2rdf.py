@@ -7,15 +7,20 @@
 #
 
 import sys
-sys.path = sys.path + ['.']
+sys.path = sys.path + ['.', '../common', '../terminology-mappings']
 reload(sys)
 sys.setdefaultencoding('utf8')
 
-import re, codecs, uuid, datetime
-import json
+import re, codecs, uuid, datetime, os
+import json, argparse, itertools
+import multiprocessing, zlib, shutil
+import cPickle as pickle # for checkpoints
+import sqlite3 # for the optional on-disk SemMedDB index (see buildSemmeddbIndex.py)
 from rdflib import Graph, Literal, Namespace, URIRef, RDF, RDFS
-from lxml import etree
-from lxml.etree import XMLParser, parse
+
+from ntriplesWriter import NTriplesWriter, openOutputFile
+from terminologyMappings import meshToRxNorm, meshToOmop
+from terminologyMappings.pharmacologicActions import pharmacologicActions
 
 import mysql.connector as msql # for mysql connection to Semmeddb
 import psycopg2 # for postgres connection to Medline
@@ -24,30 +29,138 @@ import psycopg2 # for postgres connection to Medline
 SEARCH_RESULTS = "drug-hoi-associations-from-mesh-September-2016.tsv"
 #SEARCH_RESULTS = "test-drug-hoi-dataset.tsv"
 
+## Optionally process only a window of the search results (e.g., for
+## debugging or to restart a partial run)
+parser = argparse.ArgumentParser(description="Convert the result of a pubmed drug-HOI evidence search to Open Data Annotation")
+parser.add_argument("--offset", type=int, default=0, help="number of search result rows to skip before processing (default: 0)")
+parser.add_argument("--limit", type=int, default=None, help="maximum number of search result rows to process (default: all)")
+parser.add_argument("--workers", type=int, default=1, help="number of worker processes. Rows are sharded across workers by PMID (default: 1)")
+parser.add_argument("--resume", action="store_true", help="resume from the last checkpoint of an interrupted run (use the same --offset, --limit, and --workers) and append to its output")
+args = parser.parse_args()
+
 ## Set up the db connection to the MEDLINE DB. This is used to collect
 ## a bit more data and metadata on the MEDLINE entries
 DB_CONNECTION_INFO="db-connection.conf"
-f = open(DB_CONNECTION_INFO,'r')
-(db,user,pword,host,port) = f.readline().strip().split("\t")
-f.close()
-try:
-    conn=psycopg2.connect(database=db, user=user, password=pword, host=host, port=port)
-except Exception as e:
-    print "ERROR: Unable to connect to database %s (user:%s) on host %s (port: %s). Check that the data in db-connection.conf is correct and that there is not barrier related to the network connection. Error: %s" % (db,user,host,port,e)
-cur = conn.cursor()
 
 ## Set up the db connection to the SEMMEDDB DB. This is used to filter
 ## evidence items to be more specific than the drug class concepts
-## that MeSH often uses for tags.
+## that MeSH often uses for tags. If the index file written by
+## buildSemmeddbIndex.py is present, it is used instead and no
+## connection to SEMMEDDB is made. The index has to have been built
+## from SEARCH_RESULTS as it is now (see checkSemmeddbIndex).
 SEMMEDDB_CONNECTION_INFO="db-connection-SEMMEDDB.conf"
-f = open(SEMMEDDB_CONNECTION_INFO,'r')
-(db,user,pword,host,port) = f.readline().strip().split("\t")
-f.close()
-try:
-    smdb_conn=msql.connect(database=db, user=user, password=pword, host=host, port=port)
-except Exception as e:
-    print "ERROR: Unable to connect to database %s (user:%s) on host %s (port: %s). Check that the data in db-connection-SEMMEDDB.conf is correct and that there is not barrier related to the network connection. Error: %s" % (db,user,host,port,e)
-smdb_cur = smdb_conn.cursor()
+SEMMEDDB_INDEX = "semmeddb-pmid-cui-index.sqlite"
+SEMMEDDB_INDEX_MMAP_SIZE = 4 * 1024 * 1024 * 1024 # bytes of the index file to memory-map
+
+conn = None
+cur = None
+smdb_conn = None
+smdb_cur = None
+smdb_idx = None
+
+# Exit with an error if the SemMedDB index was not built from
+# SEARCH_RESULTS as it is now (a stale index would silently return no
+# CUIs for the PMIDs it does not have)
+def checkSemmeddbIndex(idx):
+    try:
+        infoD = dict(idx.execute("SELECT name, value FROM index_info").fetchall())
+    except sqlite3.Error:
+        infoD = {}
+    searchResultsStat = os.stat(SEARCH_RESULTS)
+    currentD = {"search_results": SEARCH_RESULTS,
+                "search_results_size": str(searchResultsStat.st_size),
+                "search_results_mtime": str(int(searchResultsStat.st_mtime))}
+    staleL = ["%s (index: %s, now: %s)" % (name, infoD.get(name), currentD[name]) for name in sorted(currentD.keys()) if infoD.get(name) != currentD[name]]
+    if len(staleL) > 0:
+        print "ERROR: the SemMedDB index in %s was not built from the current %s: %s. Rerun buildSemmeddbIndex.py or remove %s to query SemMedDB directly." % (SEMMEDDB_INDEX, SEARCH_RESULTS, ", ".join(staleL), SEMMEDDB_INDEX)
+        sys.exit(1)
+    print "INFO: the SemMedDB index was built on %s from %s predications" % (infoD.get("built"), infoD.get("predication_rows"))
+
+# Open the connections used by the conversion. Called once per process
+# (i.e., by each worker when running with --workers) because database
+# connections cannot be shared across a fork.
+def connectDatabases():
+    global conn, cur, smdb_conn, smdb_cur, smdb_idx
+
+    f = open(DB_CONNECTION_INFO,'r')
+    (db,user,pword,host,port) = f.readline().strip().split("\t")
+    f.close()
+    try:
+        conn=psycopg2.connect(database=db, user=user, password=pword, host=host, port=port)
+    except Exception as e:
+        print "ERROR: Unable to connect to database %s (user:%s) on host %s (port: %s). Check that the data in db-connection.conf is correct and that there is not barrier related to the network connection. Error: %s" % (db,user,host,port,e)
+    cur = conn.cursor()
+
+    if os.path.exists(SEMMEDDB_INDEX):
+        print "INFO: using the SemMedDB index in %s" % SEMMEDDB_INDEX
+        smdb_idx = sqlite3.connect(SEMMEDDB_INDEX)
+        smdb_idx.execute("PRAGMA query_only = ON")
+        smdb_idx.execute("PRAGMA mmap_size = %d" % SEMMEDDB_INDEX_MMAP_SIZE)
+        checkSemmeddbIndex(smdb_idx)
+    else:
+        f = open(SEMMEDDB_CONNECTION_INFO,'r')
+        (db,user,pword,host,port) = f.readline().strip().split("\t")
+        f.close()
+        try:
+            smdb_conn=msql.connect(database=db, user=user, password=pword, host=host, port=port)
+        except Exception as e:
+            print "ERROR: Unable to connect to database %s (user:%s) on host %s (port: %s). Check that the data in db-connection-SEMMEDDB.conf is correct and that there is not barrier related to the network connection. Error: %s" % (db,user,host,port,e)
+        smdb_cur = smdb_conn.cursor()
+
+def closeDatabases():
+    conn.close()
+    if smdb_conn != None:
+        smdb_conn.close()
+    if smdb_idx != None:
+        smdb_idx.close()
+
+# Return (CUI, SDUI) tuples for the MeSH descriptors in mshIdSet
+def getCuisForMeshIds(mshIdSet):
+    if smdb_idx != None:
+        # chunked to stay under SQLite's limit on the number of host parameters
+        mshIdL = sorted(mshIdSet)
+        cuiRsltL = []
+        for i in range(0, len(mshIdL), 500):
+            chunk = mshIdL[i:i + 500]
+            q = "SELECT DISTINCT cui, sdui FROM mesh_cui WHERE sdui IN (%s)" % ",".join(["?"] * len(chunk))
+            cuiRsltL.extend([(x[0],x[1]) for x in smdb_idx.execute(q, chunk)])
+        return cuiRsltL
+
+    q = """
+SELECT DISTINCT CUI,SDUI FROM umls.MRCONSO WHERE SDUI IN ('%s') AND SAB = 'MSH'
+            """ % "','".join(list(mshIdSet))
+    print q
+
+    smdb_cur.execute(q)
+    cuiRsltL = []
+    for rslt in smdb_cur:
+        cuiRsltL.append((rslt[0],rslt[1]))
+    return cuiRsltL
+
+# Return the CUIs mentioned in the s_cui or o_cui columns of
+# semmeddb.PREDICATION_AGGREGATE for pmid as a list of 1-tuples
+def getCuisForPmid(pmid):
+    if smdb_idx != None:
+        cuiL = smdb_idx.execute("SELECT cui FROM pmid_cui WHERE pmid = ?", (pmid,)).fetchall()
+        if len(cuiL) == 0 and smdb_idx.execute("SELECT 1 FROM pmid WHERE pmid = ?", (pmid,)).fetchone() == None:
+            print "ERROR: PMID %s is not in the SemMedDB index in %s. Rerun buildSemmeddbIndex.py or remove %s to query SemMedDB directly." % (pmid, SEMMEDDB_INDEX, SEMMEDDB_INDEX)
+            sys.exit(1)
+        return cuiL
+
+    q = """
+ SELECT * 
+ FROM 
+ (
+ SELECT s_cui AS out_cui FROM semmeddb.PREDICATION_AGGREGATE WHERE PMID = '%s'
+ UNION
+ SELECT o_cui AS out_cui FROM semmeddb.PREDICATION_AGGREGATE WHERE PMID = '%s'
+ ) c_union
+""" % (pmid, pmid)
+
+    print q 
+
+    smdb_cur.execute(q)
+    return smdb_cur.fetchall() # all results (even null ones) need to be retrieved to prevent  "Unread result found" when the curser is used in a later iteraction 
 
 
 # TERMINOLOGY MAPPING FILES 
@@ -65,58 +178,15 @@ MESH_PHARMACOLOGIC_ACTION_MAPPINGS = "../terminology-mappings/MeSHPharmocologicA
 OUTPUT_FILE = "drug-hoi-pubmed-mesh.nt"
 
 ############################################################
-#  Load the  MeSH Pharmacologic Action mappings from an XML file
+#  Load the MeSH Pharmacologic Action mappings (indexed from an XML file)
 ############################################################
-pharmActionMaptD = {}
-p = XMLParser(huge_tree=True)
-tree = parse(MESH_PHARMACOLOGIC_ACTION_MAPPINGS, parser=p)
-l = tree.xpath('PharmacologicalAction')
-for elt in l:
-    descriptorUI = elt.xpath('DescriptorReferredTo/DescriptorUI')[0].text
-    descriptorName = elt.xpath('DescriptorReferredTo/DescriptorName/String')[0].text
-    pharmacologicalActionSubstanceL = elt.xpath('PharmacologicalActionSubstanceList/Substance')
-    substancesL = []
-    for substanceElt in pharmacologicalActionSubstanceL:
-        recordUI = substanceElt.xpath('RecordUI')[0].text
-        recordName = substanceElt.xpath('RecordName/String')[0].text
-        substancesL.append({'recordUI':recordUI,'recordName':recordName})
-
-    pharmActionMaptD[descriptorUI] = {'descriptorName':descriptorName, 'substancesL':substancesL}
+pharmActionMaptD = pharmacologicActions(MESH_PHARMACOLOGIC_ACTION_MAPPINGS).byDescriptor
 
 ############################################################
 #  Load the Drug ad HOI mappings that include OHDSI Standard Vocab codes
 ############################################################
-DRUGS_D = {}
-f = open(RXNORM_TO_MESH,"r")
-buf = f.read()
-f.close()
-l = buf.split("\n")
-for elt in l[1:]:
-    if elt.strip() == "":
-        break
-
-    try:
-        (mesh,pt,rxcui,concept_name,ohdsiID,conceptClassId) = [x.strip() for x in elt.split("|")]
-    except ValueError:        
-        print "ERROR: terminology mapping record appears incomplete. Skipping: %s" % elt
-        continue
-    
-    if DRUGS_D.get(mesh): # add a synonymn
-        DRUGS_D[mesh][1].append(pt)
-    else: # create a new record
-        DRUGS_D[mesh] = (rxcui, [pt], ohdsiID)
-
-MESH_D_SV = {}
-f = open(MESH_TO_STANDARD_VOCAB, "r")
-buf = f.read()
-f.close()
-l = buf.split("\n")
-for elt in l[1:]: # skip header
-    if elt.strip() == "":
-        break
-
-    (imeds,label,mesh) = [x.strip() for x in elt.split("|")]
-    MESH_D_SV[mesh] = imeds
+DRUGS_D = meshToRxNorm(RXNORM_TO_MESH).byMesh
+MESH_D_SV = meshToOmop(MESH_TO_STANDARD_VOCAB).toOmop
 
 ############################################################
 ## set up an RDF Open Annotation Data  graph
@@ -204,313 +274,364 @@ graph.add((poc['MeddraHoi'], dcterms["description"], Literal("HOI code in the Me
 
 # ################################################################################
 
-# Load the results of applying the Avillach et al method for
-# identifying drug-ADR associations in MEDLINE using MeSH headings
-# TODO: consider using an iterator for this
+# The results of applying the Avillach et al method for identifying
+# drug-ADR associations in MEDLINE using MeSH headings are processed
+# as a pipeline of generators so that memory stays flat regardless of
+# the size of SEARCH_RESULTS:
+#   readSearchResults -> prefetchChunks -> filterHumans -> (main loop) emit triples
 (PMID, ADR_DRUG_LABEL, ADR_DRUG_UI, ADR_HOI_LABEL, ADR_HOI_UI, PUB_TYPE, PUB_TYPE_UI) = range(0,7)
-f = open(SEARCH_RESULTS,'r')
-buf = f.read()
-f.close()
-recL = [x.strip().split("\t") for x in buf.strip().split("\n")]
+
+# Yield the rows of the search results file, one at a time, from the
+# window defined by offset and limit. If a position dict is passed,
+# position['nextRow'] is kept at the index of the next row to be read.
+def readSearchResults(fname, offset=0, limit=None, position=None):
+    f = open(fname,'r')
+    rowIter = (x.strip().split("\t") for x in f if x.strip() != "")
+    stop = None
+    if limit != None:
+        stop = offset + limit
+    rowNumber = offset
+    for row in itertools.islice(rowIter, offset, stop):
+        rowNumber += 1
+        if position != None:
+            position['nextRow'] = rowNumber
+        yield row
+    f.close()
+
+############################################################
+#  Prefetch the MEDLINE metadata (humans tag, title, and abstract) for
+#  the distinct PMIDs in each chunk of the search results using a few
+#  set-based queries rather than three queries per row
+############################################################
+MEDLINE_PREFETCH_BATCH_SIZE = 10000 # number of PMIDs sent in each '= ANY(%s)' query
+SEARCH_RESULTS_CHUNK_SIZE = 50000 # number of search result rows read ahead for each prefetch
+
+humansCache = set() # PMIDs tagged with the 'Humans' MeSH heading
+abstractCache = {} # cache for abstract text
+titleCache = {} # cache for title text
+
+# Concatenate the rows (value, label) returned for a single PMID from
+# medcit_art_abstract_abstracttext (ordered by
+# medcit_art_abstract_abstracttext_order) into one abstract string
+def assembleAbstract(rows):
+    if len(rows) == 0:
+        return ""
+    if rows[0][1] == None:
+        return rows[0][0]
+    # a structured abstract. Concatenate all parts of it
+    structAbstr = ""
+    for (value,secLab) in rows:
+        if secLab.upper() == 'UNLABELLED':
+            structAbstr += "%s " % (value)
+        else:
+            structAbstr += "%s: %s " % (secLab,value)
+    return structAbstr
+
+def prefetchMedlineMetadata(pmidL):
+    pmidL = sorted(set([x for x in pmidL if x not in titleCache]))
+    print "INFO: prefetching MEDLINE metadata for %s distinct PMIDs in batches of %s" % (len(pmidL), MEDLINE_PREFETCH_BATCH_SIZE)
+    for i in range(0, len(pmidL), MEDLINE_PREFETCH_BATCH_SIZE):
+        batch = [int(x) for x in pmidL[i:i + MEDLINE_PREFETCH_BATCH_SIZE]]
+        abstrRowsD = {}
+        try:
+            cur.execute("""select distinct pmid from medcit_meshheadinglist_meshheading where pmid = ANY(%s) and descriptorname = 'Humans'""", (batch,))
+            for row in cur.fetchall():
+                humansCache.add(str(row[0]))
+
+            cur.execute("""select pmid, art_arttitle from medcit where pmid = ANY(%s) and pmid_version = 1""", (batch,))
+            for row in cur.fetchall():
+                titleCache[str(row[0])] = row[1]
+
+            cur.execute("""SELECT pmid,value,label FROM medcit_art_abstract_abstracttext WHERE pmid = ANY(%s) ORDER BY pmid, medcit_art_abstract_abstracttext_order""", (batch,))
+            for row in cur.fetchall():
+                abstrRowsD.setdefault(str(row[0]), []).append((row[1],row[2]))
+        except Exception as e:
+            print "ERROR: Attempt to prefetch the humans tag, title, and abstract for a batch of PMIDs failed. Error string: %s" % e
+            sys.exit(1)
+
+        for pmid in batch:
+            pmid = str(pmid)
+            if not titleCache.has_key(pmid):
+                print "INFO: No title found for PMID %s." % pmid
+                titleCache[pmid] = ""
+            abstractCache[pmid] = assembleAbstract(abstrRowsD.get(pmid, []))
+            if abstractCache[pmid] == "":
+                print "INFO: No abstract found for PMID %s." % pmid
+
+        print "INFO: prefetched MEDLINE metadata for %s of %s PMIDs (%s tagged as involving humans so far)" % (min(i + MEDLINE_PREFETCH_BATCH_SIZE, len(pmidL)), len(pmidL), len(humansCache))
+
+# Read the rows in chunks, prefetch the metadata for each chunk, and
+# then pass its rows on. The caches only hold the current chunk. If
+# given, onChunkDone() is called once every row of a chunk has been
+# converted (used to write checkpoints).
+def prefetchChunks(rowIter, onChunkDone=None):
+    while True:
+        chunk = list(itertools.islice(rowIter, SEARCH_RESULTS_CHUNK_SIZE))
+        if len(chunk) == 0:
+            break
+        humansCache.clear()
+        titleCache.clear()
+        abstractCache.clear()
+        prefetchMedlineMetadata([x[PMID] for x in chunk])
+        for row in chunk:
+            yield row
+        if onChunkDone != None:
+            onChunkDone()
+
+## For now, only process papers tagged as for humans
+## TODO: expand the evidence types to include non-human studies 
+def filterHumans(rowIter):
+    for row in rowIter:
+        if row[PMID] not in humansCache:
+            print "WARNING: PMID %s not tagged as involving humans. Skipping this record." % row[PMID]
+            continue
+        yield row
 
 # Start building the open annotation data graph
 annotationSetCntr = 1
 annotationItemCntr = 1
 annotationBodyCntr = 1
-annotationEvidenceCntr = 1
+currentAnnotTargetUuid = None
 
 annotatedCache = {} # indexes annotation ids by pmid
-abstractCache = {} # cache for abstract text
-titleCache = {} # cache for title text
 pubTypeCache = {} # used because some PMIDs have multiple publication type assignments TODO: determine pub types should be assigned to a Collection under the target's graph 
 drugHoiPMIDCache = {} # used to avoid duplicating PMID - drug  - HOI combos for PMIDs that have multiple publication type assignments TODO: determine if a more robust source query is needed
 mshPharmIdToUMLSCache = {} # Used to store mappings from MeSH pharmacological grouping IDs to a list of UMLS MetaThesaurus CUIs for the drug concepts that belong in that group
 mshSubstOfInterestLCache = {} # used to avoid repeated calls to Semmeddb to identify specific drugs mentioned in a title or abstract
 pmidToCuiCache = {} # stores all CUIs mentioned in the s_cui or o_cui columns of semmeddb.PREDICATION_AGGREGATE for a given PMID
 
-currentAnnotation = annotationItemCntr
-
 currentAnnotSet = 'ohdsi-pubmed-mesh-annotation-set-%s' % annotationSetCntr 
 annotationSetCntr += 1
 graph.add((poc[currentAnnotSet], RDF.type, oa["DataAnnotation"])) # TODO: find out what is being used for collections in OA
 graph.add((poc[currentAnnotSet], oa["annotatedAt"], Literal(datetime.date.today())))
 graph.add((poc[currentAnnotSet], oa["annotatedBy"], URIRef(u"http://www.pitt.edu/~rdb20/triads-lab.xml#TRIADS")))
 
-f = codecs.open(OUTPUT_FILE,"w","utf8")
-s = graph.serialize(format="n3",encoding="utf8", errors="replace")
-f.write(s)
-
-#for elt in recL[0:1000]: # Debugging
-for elt in recL: # Full run
-    ## For now, only process papers tagged as for humans
-    ## TODO: expand the evidence types to include non-human studies 
-    try:
-        print "INFO: Testing if study %s is tagged as involving humans" % elt[PMID]
-        cur.execute("""select descriptorname from medcit_meshheadinglist_meshheading where pmid = %s and descriptorname = 'Humans'""" % elt[PMID])
-    except Exception as e:
-        print "ERROR: test if study tagged as involving humans failed. Error string: %s" % e
-        sys.exit(1)
-
-    rows = cur.fetchall()
-    if len(rows) == 0:
-        print "WARNING: PMID %s not tagged as involving humans. Skipping this record." % elt[PMID]
-        continue 
-
-    # get title if not already cached
-    if not titleCache.has_key(elt[PMID]):
-        try:
-            print "INFO: Attempting to retrieve the title for PMID %s from the MEDLINE DB" % elt[PMID]
-            cur.execute("""select art_arttitle from medcit where pmid = %s and pmid_version = 1""" % elt[PMID])
-        except Exception as e:
-            print "ERROR: Attempt to get the title for PMID failed. Error string: %s" % e
-            sys.exit(1)
-
-        rows = cur.fetchall()
-        if len(rows) == 0:
-            titleCache[elt[PMID]] = ""
-            print "INFO: No title found for PMID %s." % elt[PMID]
-        else:
-            print "INFO: Title found for PMID %s : %s " % (elt[PMID], rows[0][0])
-            titleCache[elt[PMID]] = rows[0][0]
-            
-    # get abstract if not already cached
-    if not abstractCache.has_key(elt[PMID]):
-        try:
-            print "INFO: Attempting to retrieve the abstract for PMID %s from the MEDLINE DB" % elt[PMID]
-            cur.execute("""SELECT value,label,medcit_art_abstract_abstracttext_order  FROM medcit_art_abstract_abstracttext WHERE pmid = %s ORDER BY medcit_art_abstract_abstracttext_order""" % elt[PMID])
-        except Exception as e:
-            print "ERROR: Attempt to get the abstract for PMID failed. Error string: %s" % e
-            sys.exit(1)
-
-        rows = cur.fetchall()
-        if len(rows) == 0:
-            abstractCache[elt[PMID]] = ""
-            print "INFO: No abstract found for PMID %s." % elt[PMID]
-        elif rows[0][1] != None:
-            print "INFO: Abstract found for PMID %s and it appears to be a structured abstract. Concatenating all parts of the structured abstract." % elt[PMID]
-            structAbstr = ""
-            for ii in range(0,len(rows)):
-                secLab = rows[ii][1]
-                if secLab.upper() == 'UNLABELLED':
-                    structAbstr += "%s " % (rows[ii][0])
-                else:
-                    structAbstr += "%s: %s " % (secLab,rows[ii][0])
-            abstractCache[elt[PMID]] = structAbstr
-            print "%s" % abstractCache[elt[PMID]]            
+# Convert the (filtered) search result rows in rowIter to Open Data
+# Annotation triples written to f. Annotation items and bodies are
+# numbered from the current annotationItemCntr and annotationBodyCntr
+# in steps of annotationNumberStep so that workers starting at
+# distinct numbers (1..N) and using the same step (N) never collide
+# and the numbering is stable from run to run.
+def convertSearchResults(rowIter, f, annotationNumberStep=1):
+    global annotationItemCntr, annotationBodyCntr, currentAnnotTargetUuid
+
+    ntw = NTriplesWriter(f)
+    for elt in rowIter:
+        ###################################################################
+        ### Each annotations holds one target that points to the source
+        ### record in pubmed, and one or more bodies each of which
+        ### indicates the MeSH terms that triggered the result and holds
+        ### some metadata
+        ###################################################################
+        currentAnnotItem = None
+        createNewTarget = False
+        tplL = []
+        if annotatedCache.has_key(elt[PMID]):
+            currentAnnotation = annotatedCache[elt[PMID]]
+            pubTypeL = pubTypeCache[elt[PMID]]
+
+            curType = elt[PUB_TYPE]
+            if curType in ['Meta-Analysis','Comparative Study','Multicenter Study','Journal Article']:
+                curType = "other (publication type)"
+        
+            if curType not in pubTypeL:
+                print "INFO: MEDLINE record %s has more than one pub type assigned" % elt[PMID]
+                pubTypeCache[elt[PMID]].append(elt[PUB_TYPE])
+                if curType == "Clinical Trial": 
+                    tplL.append((currentAnnotTargetUuid, ohdsi["MeshStudyType"], Literal("clinical trial (publication type)")))
+                elif curType == "Case Reports": 
+                    tplL.append((currentAnnotTargetUuid, ohdsi["MeshStudyType"], Literal("case reports (publication type)")))
+                else: 
+                    tplL.append((currentAnnotTargetUuid, ohdsi["MeshStudyType"], Literal("other (publication type)")))
         else:
-            abstractCache[elt[PMID]] = rows[0][0]
-            print "%s" % abstractCache[elt[PMID]]
-
-    ###################################################################
-    ### Each annotations holds one target that points to the source
-    ### record in pubmed, and one or more bodies each of which
-    ### indicates the MeSH terms that triggered the result and holds
-    ### some metadata
-    ###################################################################
-    currentAnnotItem = None
-    createNewTarget = False
-    tplL = []
-    if annotatedCache.has_key(elt[PMID]):
-        currentAnnotation = annotatedCache[elt[PMID]]
-        pubTypeL = pubTypeCache[elt[PMID]]
-
-        curType = elt[PUB_TYPE]
-        if curType in ['Meta-Analysis','Comparative Study','Multicenter Study','Journal Article']:
-            curType = "other (publication type)"
+            currentAnnotation = annotationItemCntr
+            annotatedCache[elt[PMID]] = currentAnnotation
+            annotationItemCntr += annotationNumberStep
+            createNewTarget = True
+    
+        currentAnnotItem = "ohdsi-pubmed-mesh-annotation-item-%s" % currentAnnotation
+
+        if createNewTarget:
+            tplL.append((poc[currentAnnotSet], aoOld["item"], poc[currentAnnotItem])) # TODO: find out what is being used for items of collections in OA
+            tplL.append((poc[currentAnnotItem], RDF.type, oa["DataAnnotation"])) 
+            tplL.append((poc[currentAnnotItem], RDF.type, ohdsi["PubMedDrugHOIAnnotation"])) # TODO: should be a subclass of oa:DataAnnotation
+            tplL.append((poc[currentAnnotItem], oa["annotatedAt"], Literal(datetime.date.today())))
+            tplL.append((poc[currentAnnotItem], oa["annotatedBy"], URIRef(u"http://www.pitt.edu/~rdb20/triads-lab.xml#TRIADS")))
+            tplL.append((poc[currentAnnotItem], oa["motivatedBy"], oa["tagging"]))
         
-        if curType not in pubTypeL:
-            print "INFO: MEDLINE record %s has more than one pub type assigned" % elt[PMID]
-            pubTypeCache[elt[PMID]].append(elt[PUB_TYPE])
+            currentAnnotTargetUuid = URIRef(u"urn:uuid:%s" % uuid.uuid4())
+            tplL.append((poc[currentAnnotItem], oa["hasTarget"], currentAnnotTargetUuid))
+            tplL.append((currentAnnotTargetUuid, RDF.type, oa["SpecificResource"]))
+            tplL.append((currentAnnotTargetUuid, oa["hasSource"], pubmed[elt[PMID]]))
+
+            # TODO: use the MeSH UIs to generate purls for the pub types
+            # TODO: add more publication types
+            # NOTE: a change here requires a change up above!
+            curType = elt[PUB_TYPE]
+            if curType in ['Meta-Analysis','Comparative Study','Multicenter Study','Journal Article']:
+                curType = "other (publication type)"
+            
+            pubTypeCache[elt[PMID]] = [curType]
             if curType == "Clinical Trial": 
                 tplL.append((currentAnnotTargetUuid, ohdsi["MeshStudyType"], Literal("clinical trial (publication type)")))
             elif curType == "Case Reports": 
                 tplL.append((currentAnnotTargetUuid, ohdsi["MeshStudyType"], Literal("case reports (publication type)")))
-            else: 
+            else:
                 tplL.append((currentAnnotTargetUuid, ohdsi["MeshStudyType"], Literal("other (publication type)")))
-    else:
-        currentAnnotation = annotationItemCntr
-        annotatedCache[elt[PMID]] = currentAnnotation
-        annotationItemCntr += 1
-        createNewTarget = True
-    
-    currentAnnotItem = "ohdsi-pubmed-mesh-annotation-item-%s" % currentAnnotation
-
-    if createNewTarget:
-        tplL.append((poc[currentAnnotSet], aoOld["item"], poc[currentAnnotItem])) # TODO: find out what is being used for items of collections in OA
-        tplL.append((poc[currentAnnotItem], RDF.type, oa["DataAnnotation"])) 
-        tplL.append((poc[currentAnnotItem], RDF.type, ohdsi["PubMedDrugHOIAnnotation"])) # TODO: should be a subclass of oa:DataAnnotation
-        tplL.append((poc[currentAnnotItem], oa["annotatedAt"], Literal(datetime.date.today())))
-        tplL.append((poc[currentAnnotItem], oa["annotatedBy"], URIRef(u"http://www.pitt.edu/~rdb20/triads-lab.xml#TRIADS")))
-        tplL.append((poc[currentAnnotItem], oa["motivatedBy"], oa["tagging"]))
-        
-        currentAnnotTargetUuid = URIRef(u"urn:uuid:%s" % uuid.uuid4())
-        tplL.append((poc[currentAnnotItem], oa["hasTarget"], currentAnnotTargetUuid))
-        tplL.append((currentAnnotTargetUuid, RDF.type, oa["SpecificResource"]))
-        tplL.append((currentAnnotTargetUuid, oa["hasSource"], pubmed[elt[PMID]]))
-
-        # TODO: use the MeSH UIs to generate purls for the pub types
-        # TODO: add more publication types
-        # NOTE: a change here requires a change up above!
-        curType = elt[PUB_TYPE]
-        if curType in ['Meta-Analysis','Comparative Study','Multicenter Study','Journal Article']:
-            curType = "other (publication type)"
-            
-        pubTypeCache[elt[PMID]] = [curType]
-        if curType == "Clinical Trial": 
-            tplL.append((currentAnnotTargetUuid, ohdsi["MeshStudyType"], Literal("clinical trial (publication type)")))
-        elif curType == "Case Reports": 
-            tplL.append((currentAnnotTargetUuid, ohdsi["MeshStudyType"], Literal("case reports (publication type)")))
-        else:
-            tplL.append((currentAnnotTargetUuid, ohdsi["MeshStudyType"], Literal("other (publication type)")))
-
-
-        # add the text quote selector but just put the title and
-        # abstract in an oa:exact using the pipe delimiter to separate
-        # them
-        textConstraintUuid = URIRef("urn:uuid:%s" % uuid.uuid4())
-        tplL.append((currentAnnotTargetUuid, oa["hasSelector"], textConstraintUuid))         
-        tplL.append((textConstraintUuid, RDF.type, oa["TextQuoteSelector"]))
-        tiab = "|".join(["TITLE: " + titleCache[elt[PMID]], "ABSTRACT: " + abstractCache[elt[PMID]]])
-        abstractTxt = unicode(tiab, 'utf-8', 'replace')
-        tplL.append((textConstraintUuid, oa["exact"], Literal(abstractTxt)))
+
+
+            # add the text quote selector but just put the title and
+            # abstract in an oa:exact using the pipe delimiter to separate
+            # them
+            textConstraintUuid = URIRef("urn:uuid:%s" % uuid.uuid4())
+            tplL.append((currentAnnotTargetUuid, oa["hasSelector"], textConstraintUuid))         
+            tplL.append((textConstraintUuid, RDF.type, oa["TextQuoteSelector"]))
+            tiab = "|".join(["TITLE: " + titleCache[elt[PMID]], "ABSTRACT: " + abstractCache[elt[PMID]]])
+            abstractTxt = unicode(tiab, 'utf-8', 'replace')
+            tplL.append((textConstraintUuid, oa["exact"], Literal(abstractTxt)))
         
-    s = u""
-    for t in tplL:
-        s += unicode.encode(u" ".join((t[0].n3(), t[1].n3(), t[2].n3(), u".\n")), 'utf-8', 'replace')
-    f.write(s)
+        ntw.writeTriples(tplL)
     
 
-    # Specify the bodies of the annotation - for this type each
-    # body contains the MESH drug and condition as a semantic tag
-    print "INFO: working on the body for %s" % elt
+        # Specify the bodies of the annotation - for this type each
+        # body contains the MESH drug and condition as a semantic tag
+        print "INFO: working on the body for %s" % elt
     
-    # to begin with, avoid duplicating PMID - drug - HOI combos for
-    # PMIDs that have multiple publication type assignments or that
-    # are already picked up because the drug that belonged to a MESH
-    # pharm action group mentioned in MESH tags for a TIAB was
-    # specifically mentioned in the text of the TIAB. If a the drug
-    # that belonged to a MESH pharm action group WAS mentioned in MESH
-    # tags BUT NOT specifically mentioned in the TIAB text then, this
-    # is probably a specific MESH mention of the drug that reqiures a
-    # new body
-    concat = "%s-%s-%s" % (elt[PMID], elt[ADR_DRUG_UI], elt[ADR_HOI_UI])
-    if drugHoiPMIDCache.has_key(concat) and (drugHoiPMIDCache[concat] == "MeshTaggedAgent" or drugHoiPMIDCache[concat] == "FilteredAdeAgent") :
-        print "INFO: skipping generation of a new body graph because the PMID, drug, and HOI (%s) have already been processed. drugHoiPMIDCache[concat]: %s" % (concat, drugHoiPMIDCache[concat])
-        continue
-    else:
-        # This should have two effects: 1) both individual drugs and
-        # drug groupings will be tagged as MESH mentions, and 2)
-        # individual drugs that were previously part of a drug
-        # grouping will be noted as also being MESH tagged. The latter
-        # case creates a duplication, but one that can be addressed
-        # using SPARQL by distinguishing UnfilteredAdeAgent set
-        # members from direct ingredient resources.
-        drugHoiPMIDCache[concat] = "MeshTaggedAgent"
-
-    currentAnnotationBody = "ohdsi-pubmed-mesh-annotation-annotation-body-%s" % annotationBodyCntr
-    annotationBodyCntr += 1
-
-    tplL = []  # Clearing out the Target data tuple
-    tplL.append((poc[currentAnnotItem], oa["hasBody"], poc[currentAnnotationBody]))
-    tplL.append((poc[currentAnnotationBody], RDFS.label, Literal("Drug-HOI tag for PMID %s" % elt[PMID])))
-    tplL.append((poc[currentAnnotationBody], RDF.type, ohdsi["OHDSIMeshTags"])) # TODO: this is not yet formalized in a public ontology but should be
-    tplL.append((poc[currentAnnotationBody], RDF.type, oa["SemanticTag"])) 
-    tplL.append((poc[currentAnnotationBody], dcterms["description"], Literal("Drug-HOI body from MEDLINE PMID %s using MESH drug %s (%s) and HOI %s (%s)" % (elt[PMID], elt[ADR_DRUG_LABEL], elt[ADR_DRUG_UI], elt[ADR_HOI_LABEL], elt[ADR_HOI_UI]))))
-
-    ### INCLUDE THE MESH TAGS FROM THE RECORD AS PREFERRED TERMS AS
-    ### WELL AS DATA FROM THE DRUG AND HOI QUERY
-    tplL.append((poc[currentAnnotationBody], ohdsi['MeshDrug'], mesh[elt[ADR_DRUG_UI]])) 
-
-    if DRUGS_D.has_key(elt[ADR_DRUG_UI]): # an individual drug
-        tplL.append((poc[currentAnnotationBody], ohdsi['RxnormDrug'], rxnorm[DRUGS_D[elt[ADR_DRUG_UI]][0]]))
-        tplL.append((poc[currentAnnotationBody], ohdsi['ImedsDrug'], ohdsi[DRUGS_D[elt[ADR_DRUG_UI]][2]]))
-
-    elif elt[ADR_DRUG_UI] in pharmActionMaptD.keys(): # a drug group
-        (descriptorName, substancesL) =  (pharmActionMaptD[elt[ADR_DRUG_UI]]['descriptorName'], pharmActionMaptD[elt[ADR_DRUG_UI]]['substancesL'])
-        print "INFO: The MeSH drug %s might be a grouping (%s). Attempting to expand to the %d individual drugs mapped in the MeSH pharmacologic action mapping that are mentioned in the title and/or abstract" % (elt[ADR_DRUG_UI], descriptorName, len(substancesL))
-
-        # First see if any of the drugs in the group are mentioned specifically in the title or abstract. 
-        mshSubstOfInterestL = []
-        if mshSubstOfInterestLCache.has_key(elt[PMID] + elt[ADR_DRUG_UI]):
-            mshSubstOfInterestL = mshSubstOfInterestLCache[elt[PMID] + elt[ADR_DRUG_UI]]
-            print "INFO: pulled %s individual Semmeddb drug mentions for PMID %s from cache" % (len(mshSubstOfInterestL), elt[PMID])
+        # to begin with, avoid duplicating PMID - drug - HOI combos for
+        # PMIDs that have multiple publication type assignments or that
+        # are already picked up because the drug that belonged to a MESH
+        # pharm action group mentioned in MESH tags for a TIAB was
+        # specifically mentioned in the text of the TIAB. If a the drug
+        # that belonged to a MESH pharm action group WAS mentioned in MESH
+        # tags BUT NOT specifically mentioned in the TIAB text then, this
+        # is probably a specific MESH mention of the drug that reqiures a
+        # new body
+        concat = "%s-%s-%s" % (elt[PMID], elt[ADR_DRUG_UI], elt[ADR_HOI_UI])
+        if drugHoiPMIDCache.has_key(concat) and (drugHoiPMIDCache[concat] == "MeshTaggedAgent" or drugHoiPMIDCache[concat] == "FilteredAdeAgent") :
+            print "INFO: skipping generation of a new body graph because the PMID, drug, and HOI (%s) have already been processed. drugHoiPMIDCache[concat]: %s" % (concat, drugHoiPMIDCache[concat])
+            continue
         else:
-            ## query UMLS for the MeSH identifiers for the substances and chemicals
-            cuiRsltL = []
-            if mshPharmIdToUMLSCache.has_key(descriptorName):
-                cuiRsltL = mshPharmIdToUMLSCache[descriptorName]
-                print "INFO: No need to query UMLS, using UMLS MetaThesaurus results from cache"
+            # This should have two effects: 1) both individual drugs and
+            # drug groupings will be tagged as MESH mentions, and 2)
+            # individual drugs that were previously part of a drug
+            # grouping will be noted as also being MESH tagged. The latter
+            # case creates a duplication, but one that can be addressed
+            # using SPARQL by distinguishing UnfilteredAdeAgent set
+            # members from direct ingredient resources.
+            drugHoiPMIDCache[concat] = "MeshTaggedAgent"
+
+        currentAnnotationBody = "ohdsi-pubmed-mesh-annotation-annotation-body-%s" % annotationBodyCntr
+        annotationBodyCntr += annotationNumberStep
+
+        tplL = []  # Clearing out the Target data tuple
+        tplL.append((poc[currentAnnotItem], oa["hasBody"], poc[currentAnnotationBody]))
+        tplL.append((poc[currentAnnotationBody], RDFS.label, Literal("Drug-HOI tag for PMID %s" % elt[PMID])))
+        tplL.append((poc[currentAnnotationBody], RDF.type, ohdsi["OHDSIMeshTags"])) # TODO: this is not yet formalized in a public ontology but should be
+        tplL.append((poc[currentAnnotationBody], RDF.type, oa["SemanticTag"])) 
+        tplL.append((poc[currentAnnotationBody], dcterms["description"], Literal("Drug-HOI body from MEDLINE PMID %s using MESH drug %s (%s) and HOI %s (%s)" % (elt[PMID], elt[ADR_DRUG_LABEL], elt[ADR_DRUG_UI], elt[ADR_HOI_LABEL], elt[ADR_HOI_UI]))))
+
+        ### INCLUDE THE MESH TAGS FROM THE RECORD AS PREFERRED TERMS AS
+        ### WELL AS DATA FROM THE DRUG AND HOI QUERY
+        tplL.append((poc[currentAnnotationBody], ohdsi['MeshDrug'], mesh[elt[ADR_DRUG_UI]])) 
+
+        if DRUGS_D.has_key(elt[ADR_DRUG_UI]): # an individual drug
+            tplL.append((poc[currentAnnotationBody], ohdsi['RxnormDrug'], rxnorm[DRUGS_D[elt[ADR_DRUG_UI]][0]]))
+            tplL.append((poc[currentAnnotationBody], ohdsi['ImedsDrug'], ohdsi[DRUGS_D[elt[ADR_DRUG_UI]][2]]))
+
+        elif pharmActionMaptD.has_key(elt[ADR_DRUG_UI]): # a drug group
+            (descriptorName, substancesL) = pharmActionMaptD[elt[ADR_DRUG_UI]]
+            print "INFO: The MeSH drug %s might be a grouping (%s). Attempting to expand to the %d individual drugs mapped in the MeSH pharmacologic action mapping that are mentioned in the title and/or abstract" % (elt[ADR_DRUG_UI], descriptorName, len(substancesL))
+
+            # First see if any of the drugs in the group are mentioned specifically in the title or abstract. 
+            mshSubstOfInterestL = []
+            if mshSubstOfInterestLCache.has_key(elt[PMID] + elt[ADR_DRUG_UI]):
+                mshSubstOfInterestL = mshSubstOfInterestLCache[elt[PMID] + elt[ADR_DRUG_UI]]
+                print "INFO: pulled %s individual Semmeddb drug mentions for PMID %s from cache" % (len(mshSubstOfInterestL), elt[PMID])
             else:
-                # It is most efficient, given the indices on semmeddb, to
-                # query UMLS first for all relevant substance CUIs, then pass
-                # that in a query to semmedb
-                mshIdSet = set([x['recordUI'] for x in substancesL])
-                q = """
-SELECT DISTINCT CUI,SDUI FROM umls.MRCONSO WHERE SDUI IN ('%s') AND SAB = 'MSH'
-            """ % "','".join(list(mshIdSet))
-                print q
-        
-                smdb_cur.execute(q)
+                ## query UMLS for the MeSH identifiers for the substances and chemicals
                 cuiRsltL = []
-                for rslt in smdb_cur:
-                    cuiRsltL.append((rslt[0],rslt[1]))        
-                mshPharmIdToUMLSCache[descriptorName] = cuiRsltL
+                if mshPharmIdToUMLSCache.has_key(descriptorName):
+                    cuiRsltL = mshPharmIdToUMLSCache[descriptorName]
+                    print "INFO: No need to query UMLS, using UMLS MetaThesaurus results from cache"
+                else:
+                    # It is most efficient, given the indices on semmeddb, to
+                    # query UMLS first for all relevant substance CUIs, then pass
+                    # that in a query to semmedb
+                    mshIdSet = set([recordUI for (recordUI, recordName) in substancesL])
+                    cuiRsltL = getCuisForMeshIds(mshIdSet)
+                    mshPharmIdToUMLSCache[descriptorName] = cuiRsltL
+
+                if len(cuiRsltL) == 0:
+                    print "ERROR: very strange that none of the drug concepts in the MeSH pharmacological grouping is able to map to any UMLS MetaThesaurus CUI: %s -- %s" % (descriptorName,mshIdSet)
+                else:
+                    # query Semmeddb to get the CUIs tagged for this
+                    # TIAB. NOTE: the IN clause is limited by the MySQL
+                    # max_allowed_packet configuration variable so set it
+                    # to be large (e.g., several megabytes)
+                    #print "INFO: checking Semmeddb to see if the title or abstract of PMID %s mentions any of the %s individual drugs" % (elt[PMID], len(cuiRsltL))
+
+                    # 1. Get the CUIs associated with the PMID in semmeddb
+                    pmidCuis = pmidToCuiCache.get(elt[PMID])
+                    if pmidCuis == None:
+                        pmidCuis = getCuisForPmid(elt[PMID])
+
+                    if pmidCuis != None and pmidCuis != []:
+                        pmidToCuiCache[elt[PMID]] = [x[0] for x in pmidCuis]
+                        #print "INFO: cuiRsltL - %s " % cuiRsltL
+                        print "INFO: Found individual Semmeddb concept mentions (including non-drugs) for PMID %s (from query) -- pmidCuis: %s" % (elt[PMID], pmidToCuiCache[elt[PMID]])
+
+                        # 2. get the MESH identifiers for the returned CUIs that are in the MESH Pharm group cuiRsltL
+                        mshSubstOfInterestL = [x[1] for x in filter(lambda x: x[0] in pmidToCuiCache[elt[PMID]], cuiRsltL)]
+                        if len(mshSubstOfInterestL) > 0:
+                            print "INFO: Mesh drug identifiers being added to cache: %s " % mshSubstOfInterestL
+                            mshSubstOfInterestLCache[elt[PMID] + elt[ADR_DRUG_UI]] = mshSubstOfInterestL
+                
+            # add each *specific* substance found in the title or abstract to a 'adeAgents' collection in the body
+            if len(mshSubstOfInterestL) > 0:
+                # first check for duplication, it happens a bunch
+                keepers = []
+                for substanceMshUI in mshSubstOfInterestL:
+                    concat = "%s-%s-%s" % (elt[PMID], substanceMshUI, elt[ADR_HOI_UI])
+                    if drugHoiPMIDCache.has_key(concat):
+                        print "INFO: skipping addition of a PMID, drug, and HOI (%s) that have already been processed (probably duplication of pharmacologic entity mapping because of drug groupings)." % concat
+                        continue
+                    else:
+                        drugHoiPMIDCache[concat] = "FilteredAdeAgent"
+                        keepers.append(substanceMshUI)
+
+                if len(keepers) > 0:
+                    collectionHead = URIRef(u"urn:uuid:%s" % uuid.uuid4()) # TODO: give this URI a type
+                    tplL.append((poc[currentAnnotationBody], ohdsi['adeAgents'], collectionHead))
+
+                    for substanceMshUI in keepers:
+                        tplL.append((collectionHead, ohdsi['MeshDrug'], mesh[substanceMshUI]))
+                        if DRUGS_D.has_key(substanceMshUI):
+                            tplL.append((collectionHead, ohdsi['RxnormDrug'], rxnorm[DRUGS_D[substanceMshUI][0]]))
+                            tplL.append((collectionHead, ohdsi['ImedsDrug'], ohdsi[DRUGS_D[substanceMshUI][2]]))
+                        else:
+                            print "WARNING: no RxNorm or IMEDS equivalent to the MeSH drug %s belonging to the pharmacologic action mapping %s" % (substanceMshUI, elt[ADR_DRUG_UI])
+                else:
+                    print "INFO: none of the individual drugs in the drug group %s (%s) were identified in the abstract. The drug group MeSH CUI will be noted in the body of this OA annotation and all members of the group will be linked to a list under adeAgentsUnfiltered" % (elt[ADR_DRUG_UI], descriptorName)
 
-            if len(cuiRsltL) == 0:
-                print "ERROR: very strange that none of the drug concepts in the MeSH pharmacological grouping is able to map to any UMLS MetaThesaurus CUI: %s -- %s" % (descriptorName,mshIdSet)
+            # Now, add the rest of the entities in the pharmacologic group to an 'adeAgentsUnfiltered' collection which is useful for two reasons, 1) SemMedDB is a few months behind the current MEDLINE (so, more recent titles and abstracts will not benefit from the processing steps above), and 2)although noisy for inferring positive drug-HOI associaions, having all drugss in a class is helpful for inferring negative controls.
+            keepers = [] # NOTE: we deliberately do not add those triples that have been added to the 'adeAgents' collection to the 'adeAgentsUnfiltered' collection
+            if pmidToCuiCache.get(elt[PMID]) != None:
+                substOfInterestL = [x[1] for x in filter(lambda x: x[0] not in pmidToCuiCache[elt[PMID]], cuiRsltL)] # the drug concepts NOT mentioned in the abstract
             else:
-                # query Semmeddb to get the CUIs tagged for this
-                # TIAB. NOTE: the IN clause is limited by the MySQL
-                # max_allowed_packet configuration variable so set it
-                # to be large (e.g., several megabytes)
-                #print "INFO: checking Semmeddb to see if the title or abstract of PMID %s mentions any of the %s individual drugs" % (elt[PMID], len(cuiRsltL))
-
-                # 1. Get the CUIs associated with the PMID in semmeddb
-                pmidCuis = pmidToCuiCache.get(elt[PMID])
-                if pmidCuis == None:
-                    q = """
- SELECT * 
- FROM 
- (
- SELECT s_cui AS out_cui FROM semmeddb.PREDICATION_AGGREGATE WHERE PMID = '%s'
- UNION
- SELECT o_cui AS out_cui FROM semmeddb.PREDICATION_AGGREGATE WHERE PMID = '%s'
- ) c_union
-""" % (elt[PMID], elt[PMID])
-
-                    print q 
-
-                    smdb_cur.execute(q)
-                    pmidCuis = smdb_cur.fetchall() # all results (even null ones) need to be retrieved to prevent  "Unread result found" when the curser is used in a later iteraction 
-
-                if pmidCuis != None and pmidCuis != []:
-                    pmidToCuiCache[elt[PMID]] = [x[0] for x in pmidCuis]
-                    #print "INFO: cuiRsltL - %s " % cuiRsltL
-                    print "INFO: Found individual Semmeddb concept mentions (including non-drugs) for PMID %s (from query) -- pmidCuis: %s" % (elt[PMID], pmidToCuiCache[elt[PMID]])
-
-                    # 2. get the MESH identifiers for the returned CUIs that are in the MESH Pharm group cuiRsltL
-                    mshSubstOfInterestL = [x[1] for x in filter(lambda x: x[0] in pmidToCuiCache[elt[PMID]], cuiRsltL)]
-                    if len(mshSubstOfInterestL) > 0:
-                        print "INFO: Mesh drug identifiers being added to cache: %s " % mshSubstOfInterestL
-                        mshSubstOfInterestLCache[elt[PMID] + elt[ADR_DRUG_UI]] = mshSubstOfInterestL
-                
-        # add each *specific* substance found in the title or abstract to a 'adeAgents' collection in the body
-        if len(mshSubstOfInterestL) > 0:
-            # first check for duplication, it happens a bunch
-            keepers = []
-            for substanceMshUI in mshSubstOfInterestL:
+                substOfInterestL = [x[1] for x in cuiRsltL] # the MESH identifiers all drugs in the MESH pharm grouping
+            
+            for substanceMshUI in substOfInterestL:          
                 concat = "%s-%s-%s" % (elt[PMID], substanceMshUI, elt[ADR_HOI_UI])
                 if drugHoiPMIDCache.has_key(concat):
                     print "INFO: skipping addition of a PMID, drug, and HOI (%s) that have already been processed (probably duplication of pharmacologic entity mapping because of drug groupings)." % concat
                     continue
                 else:
-                    drugHoiPMIDCache[concat] = "FilteredAdeAgent"
+                    drugHoiPMIDCache[concat] = "UnfilteredAdeAgent"
                     keepers.append(substanceMshUI)
 
             if len(keepers) > 0:
                 collectionHead = URIRef(u"urn:uuid:%s" % uuid.uuid4()) # TODO: give this URI a type
-                tplL.append((poc[currentAnnotationBody], ohdsi['adeAgents'], collectionHead))
-
+                tplL.append((poc[currentAnnotationBody], ohdsi['adeAgentsUnfiltered'], collectionHead))
                 for substanceMshUI in keepers:
                     tplL.append((collectionHead, ohdsi['MeshDrug'], mesh[substanceMshUI]))
                     if DRUGS_D.has_key(substanceMshUI):
@@ -518,71 +639,194 @@ SELECT DISTINCT CUI,SDUI FROM umls.MRCONSO WHERE SDUI IN ('%s') AND SAB = 'MSH'
                         tplL.append((collectionHead, ohdsi['ImedsDrug'], ohdsi[DRUGS_D[substanceMshUI][2]]))
                     else:
                         print "WARNING: no RxNorm or IMEDS equivalent to the MeSH drug %s belonging to the pharmacologic action mapping %s" % (substanceMshUI, elt[ADR_DRUG_UI])
-            else:
-                print "INFO: none of the individual drugs in the drug group %s (%s) were identified in the abstract. The drug group MeSH CUI will be noted in the body of this OA annotation and all members of the group will be linked to a list under adeAgentsUnfiltered" % (elt[ADR_DRUG_UI], descriptorName)
+                        
+        else:
+            print "ERROR: no RxNorm equivalent to the MeSH drug %s (%s) and this does not appear in the pharmacologic action mapping (not a grouping?), skipping" % (elt[ADR_DRUG_UI], elt[ADR_DRUG_LABEL])
+            continue
 
-        # Now, add the rest of the entities in the pharmacologic group to an 'adeAgentsUnfiltered' collection which is useful for two reasons, 1) SemMedDB is a few months behind the current MEDLINE (so, more recent titles and abstracts will not benefit from the processing steps above), and 2)although noisy for inferring positive drug-HOI associaions, having all drugss in a class is helpful for inferring negative controls.
-        keepers = [] # NOTE: we deliberately do not add those triples that have been added to the 'adeAgents' collection to the 'adeAgentsUnfiltered' collection
-        if pmidToCuiCache.get(elt[PMID]) != None:
-            substOfInterestL = [x[1] for x in filter(lambda x: x[0] not in pmidToCuiCache[elt[PMID]], cuiRsltL)] # the drug concepts NOT mentioned in the abstract
+        if MESH_D_SV.has_key(elt[ADR_HOI_UI]):
+            tplL.append((poc[currentAnnotationBody], ohdsi['ImedsHoi'], ohdsi[MESH_D_SV[elt[ADR_HOI_UI]]]))
+            tplL.append((poc[currentAnnotationBody], ohdsi['MeshHoi'], mesh[elt[ADR_HOI_UI]]))
         else:
-            substOfInterestL = [x[1] for x in cuiRsltL] # the MESH identifiers all drugs in the MESH pharm grouping
-            
-        for substanceMshUI in substOfInterestL:          
-            concat = "%s-%s-%s" % (elt[PMID], substanceMshUI, elt[ADR_HOI_UI])
-            if drugHoiPMIDCache.has_key(concat):
-                print "INFO: skipping addition of a PMID, drug, and HOI (%s) that have already been processed (probably duplication of pharmacologic entity mapping because of drug groupings)." % concat
-                continue
-            else:
-                drugHoiPMIDCache[concat] = "UnfilteredAdeAgent"
-                keepers.append(substanceMshUI)
-
-        if len(keepers) > 0:
-            collectionHead = URIRef(u"urn:uuid:%s" % uuid.uuid4()) # TODO: give this URI a type
-            tplL.append((poc[currentAnnotationBody], ohdsi['adeAgentsUnfiltered'], collectionHead))
-            for substanceMshUI in keepers:
-                tplL.append((collectionHead, ohdsi['MeshDrug'], mesh[substanceMshUI]))
-                if DRUGS_D.has_key(substanceMshUI):
-                    tplL.append((collectionHead, ohdsi['RxnormDrug'], rxnorm[DRUGS_D[substanceMshUI][0]]))
-                    tplL.append((collectionHead, ohdsi['ImedsDrug'], ohdsi[DRUGS_D[substanceMshUI][2]]))
-                else:
-                    print "WARNING: no RxNorm or IMEDS equivalent to the MeSH drug %s belonging to the pharmacologic action mapping %s" % (substanceMshUI, elt[ADR_DRUG_UI])
-                        
-    else:
-        print "ERROR: no RxNorm equivalent to the MeSH drug %s (%s) and this does not appear in the pharmacologic action mapping (not a grouping?), skipping" % (elt[ADR_DRUG_UI], elt[ADR_DRUG_LABEL])
-        continue
+            print "ERROR: no OHDSI/IMEDS equivalent to the MeSH HOI %s, skipping" % (elt[ADR_DRUG_UI])
+            continue
+ 
+        # # add the ADE effect to a collection in the body
+        # if not adeEffectCollectionCache.has_key(elt[PMID]):
+        #     collectionHead = URIRef(u"urn:uuid:%s" % uuid.uuid4())
+        #     tplL.append((poc[currentAnnotationBody], ohdsi['adeEffects'], collectionHead))
+        #     tplL.append((collectionHead, ohdsi['adeEffect'], Literal(elt[ADR_HOI_UI])))
+        #     adeEffectCollectionCache[elt[PMID]] = [(elt[ADR_HOI_UI],collectionHead)]
+        # else:
+        #     effectTplL = adeEffectCollectionCache[elt[PMID]]
+        #     prevEffectsL = [x[0] for x in effectTplL]
+        #     if elt[ADR_HOI_UI] not in prevEffectsL:
+        #         collectionHead = effectTplL[0][1] # pull the UUID already create for this collection head to add a new effect
+        #         tplL.append((collectionHead, ohdsi['adeEffect'], Literal(elt[ADR_HOI_UI])))
+        #         adeEffectCollectionCache[elt[PMID]].append((elt[ADR_HOI_UI],collectionHead))
+
+        ntw.writeTriples(tplL)
+
+
+############################################################
+#  Checkpoints: the position in the search results, the annotation
+#  counters, and the de-duplication caches are saved periodically so
+#  that a run started with --resume continues from the last
+#  checkpoint and appends to the existing output
+############################################################
+CHECKPOINT_INTERVAL = 200000 # minimum number of search result rows between checkpoints
+
+def checkpointFile(outputFile):
+    return outputFile + ".checkpoint"
+
+# NOTE: call only after every row before nextRow has been converted
+def saveCheckpoint(f, outputFile, nextRow, workers):
+    f.flush()
+    os.fsync(f.fileno())
+    state = {'nextRow':nextRow,
+             'outputSize':f.tell(),
+             'workers':workers,
+             'annotationItemCntr':annotationItemCntr,
+             'annotationBodyCntr':annotationBodyCntr,
+             'currentAnnotTargetUuid':currentAnnotTargetUuid,
+             'annotatedCache':annotatedCache,
+             'drugHoiPMIDCache':drugHoiPMIDCache,
+             'pubTypeCache':pubTypeCache,
+             'mshPharmIdToUMLSCache':mshPharmIdToUMLSCache}
+    # write then rename so that a crash while saving keeps the previous checkpoint
+    cf = open(checkpointFile(outputFile) + ".tmp","wb")
+    pickle.dump(state, cf, pickle.HIGHEST_PROTOCOL)
+    cf.close()
+    os.rename(checkpointFile(outputFile) + ".tmp", checkpointFile(outputFile))
+    print "INFO: checkpoint saved for %s at search result row %s" % (outputFile, nextRow)
+
+# Restore the state saved for outputFile, truncate outputFile to what
+# had been written at the checkpoint, and return the row to continue
+# from. Returns None if there is no checkpoint.
+def restoreCheckpoint(outputFile, workers):
+    global annotationItemCntr, annotationBodyCntr, currentAnnotTargetUuid
+    if not os.path.exists(checkpointFile(outputFile)):
+        print "WARNING: no checkpoint found for %s. Starting from the beginning." % outputFile
+        return None
+
+    cf = open(checkpointFile(outputFile),"rb")
+    state = pickle.load(cf)
+    cf.close()
+    if state['workers'] != workers:
+        print "ERROR: the checkpoint for %s was written by a run with --workers %s. Resume with the same number of workers." % (outputFile, state['workers'])
+        sys.exit(1)
 
-    if MESH_D_SV.has_key(elt[ADR_HOI_UI]):
-        tplL.append((poc[currentAnnotationBody], ohdsi['ImedsHoi'], ohdsi[MESH_D_SV[elt[ADR_HOI_UI]]]))
-        tplL.append((poc[currentAnnotationBody], ohdsi['MeshHoi'], mesh[elt[ADR_HOI_UI]]))
+    of = open(outputFile,"r+b")
+    of.truncate(state['outputSize'])
+    of.close()
+
+    annotationItemCntr = state['annotationItemCntr']
+    annotationBodyCntr = state['annotationBodyCntr']
+    currentAnnotTargetUuid = state['currentAnnotTargetUuid']
+    annotatedCache.update(state['annotatedCache'])
+    drugHoiPMIDCache.update(state['drugHoiPMIDCache'])
+    pubTypeCache.update(state['pubTypeCache'])
+    mshPharmIdToUMLSCache.update(state['mshPharmIdToUMLSCache'])
+    print "INFO: resuming %s from search result row %s" % (outputFile, state['nextRow'])
+    return state['nextRow']
+
+# Convert the rows from startRow to the end of the --offset/--limit
+# window (only those of the given shard when workers > 1), writing a
+# checkpoint for outputFile every CHECKPOINT_INTERVAL rows
+def convertWithCheckpoints(f, outputFile, startRow, shard, workers):
+    position = {'nextRow':startRow}
+    lastCheckpoint = {'nextRow':startRow}
+    def onChunkDone():
+        if position['nextRow'] - lastCheckpoint['nextRow'] >= CHECKPOINT_INTERVAL:
+            saveCheckpoint(f, outputFile, position['nextRow'], workers)
+            lastCheckpoint['nextRow'] = position['nextRow']
+
+    limit = None
+    if args.limit != None:
+        limit = max(0, args.offset + args.limit - startRow)
+    rowIter = readSearchResults(SEARCH_RESULTS, startRow, limit, position)
+    if workers > 1:
+        rowIter = (x for x in rowIter if pmidShard(x[PMID], workers) == shard)
+    convertSearchResults(filterHumans(prefetchChunks(rowIter, onChunkDone)), f, workers)
+
+    if os.path.exists(checkpointFile(outputFile)):
+        os.remove(checkpointFile(outputFile))
+
+# Stable shard assignment for a PMID (the builtin hash is not
+# guaranteed to be stable across Python versions)
+def pmidShard(pmid, workers):
+    return zlib.crc32(pmid) % workers
+
+def shardOutputFile(shard):
+    return "%s.shard-%d" % (OUTPUT_FILE, shard)
+
+# Run by each worker process: convert only those rows whose PMID
+# belongs to the shard. Each worker has its own database connections
+# and caches.
+def convertShard(shard, workers):
+    global annotationItemCntr, annotationBodyCntr
+    connectDatabases()
+    startRow = None
+    if args.resume:
+        startRow = restoreCheckpoint(shardOutputFile(shard), workers)
+    if startRow == None:
+        startRow = args.offset
+        annotationItemCntr = annotationBodyCntr = shard + 1
+        sf = openOutputFile(shardOutputFile(shard),"w")
     else:
-        print "ERROR: no OHDSI/IMEDS equivalent to the MeSH HOI %s, skipping" % (elt[ADR_DRUG_UI])
-        continue
- 
-    # # add the ADE effect to a collection in the body
-    # if not adeEffectCollectionCache.has_key(elt[PMID]):
-    #     collectionHead = URIRef(u"urn:uuid:%s" % uuid.uuid4())
-    #     tplL.append((poc[currentAnnotationBody], ohdsi['adeEffects'], collectionHead))
-    #     tplL.append((collectionHead, ohdsi['adeEffect'], Literal(elt[ADR_HOI_UI])))
-    #     adeEffectCollectionCache[elt[PMID]] = [(elt[ADR_HOI_UI],collectionHead)]
-    # else:
-    #     effectTplL = adeEffectCollectionCache[elt[PMID]]
-    #     prevEffectsL = [x[0] for x in effectTplL]
-    #     if elt[ADR_HOI_UI] not in prevEffectsL:
-    #         collectionHead = effectTplL[0][1] # pull the UUID already create for this collection head to add a new effect
-    #         tplL.append((collectionHead, ohdsi['adeEffect'], Literal(elt[ADR_HOI_UI])))
-    #         adeEffectCollectionCache[elt[PMID]].append((elt[ADR_HOI_UI],collectionHead))
-
-    s = ""
-    for t in tplL:
-        s += unicode.encode(" ".join((t[0].n3(), t[1].n3(), t[2].n3(), u".\n")), 'utf-8', 'replace')
+        sf = openOutputFile(shardOutputFile(shard),"a")
+    convertWithCheckpoints(sf, shardOutputFile(shard), startRow, shard, workers)
+    sf.close()
+    closeDatabases()
+
+if args.workers > 1:
+    # the shards are concatenated after the header so it is always rewritten
+    f = openOutputFile(OUTPUT_FILE,"w")
+    s = graph.serialize(format="n3",encoding="utf8", errors="replace")
     f.write(s)
 
+    f.flush() # so that the forked workers do not inherit buffered output
+    workerL = []
+    for shard in range(0, args.workers):
+        w = multiprocessing.Process(target=convertShard, args=(shard, args.workers))
+        w.start()
+        workerL.append(w)
+
+    for w in workerL:
+        w.join()
+
+    failedL = [shard for shard in range(0, args.workers) if workerL[shard].exitcode != 0]
+    if len(failedL) > 0:
+        print "ERROR: worker(s) for shard(s) %s failed. The output in %s is incomplete." % (failedL, OUTPUT_FILE)
+        sys.exit(1)
+
+    # concatenate the per-shard output in shard order
+    f.close()
+    f = open(OUTPUT_FILE,"ab")
+    for shard in range(0, args.workers):
+        sf = open(shardOutputFile(shard),"rb")
+        shutil.copyfileobj(sf, f)
+        sf.close()
+        os.remove(shardOutputFile(shard))
+    f.close()
+else:
+    startRow = None
+    if args.resume:
+        startRow = restoreCheckpoint(OUTPUT_FILE, args.workers)
+    if startRow == None:
+        startRow = args.offset
+        f = openOutputFile(OUTPUT_FILE,"w")
+        s = graph.serialize(format="n3",encoding="utf8", errors="replace")
+        f.write(s)
+    else:
+        f = openOutputFile(OUTPUT_FILE,"a")
+
+    connectDatabases()
+    convertWithCheckpoints(f, OUTPUT_FILE, startRow, 0, args.workers)
+    f.close()
+    closeDatabases()
 
-f.close
 graph.close()
-conn.close()
-smdb_conn.close()
 
 
 
@@ -27,7 +27,8 @@
 #       second argument when this script is run in the command
 #       line.
 #    c) This file will be loaded into a dictionary which can
-#       be keyed by the MeSH identifier of the drug group.
+#       be keyed by the MeSH identifier of the drug group. The
+#       file is indexed once and the index is cached next to it.
 #      i) In this file the XML tag <RecordUI> is the "key" while
 #         the "value" is the tag <DescriptorUI>.
 #
@@ -70,7 +71,8 @@
 #
 
 import sys
-import xml.etree.ElementTree as ET
+sys.path = sys.path + ['../../terminology-mappings']
+from terminologyMappings.pharmacologicActions import pharmacologicActions
 import mysql.connector as sql
 import csv
 
@@ -83,35 +85,19 @@ TSV_DATA_FILE = sys.argv[1]
 
 MESH_DRUG_GROUPINGS_FILE = sys.argv[2]
 
+# LOAD THE MESH DRUG GROUPINGS INDEX (built from the XML file on the
+# first run and cached next to it, see
+# terminology-mappings/terminologyMappings/pharmacologicActions.py)
+paIndex = pharmacologicActions(MESH_DRUG_GROUPINGS_FILE)
+
+# substance -> drug group (the last group listed for the substance)
 mesh_identifier_of_drug_group_dictionary = {}
-mesh_drug_group_drug_name_dictionary = {}
+for recordUI, descriptorUIs in paIndex.bySubstance.items():
+  mesh_identifier_of_drug_group_dictionary[recordUI] = descriptorUIs[-1]
 
-# PARSE MESH DRUG GROUPINGS FILE
-with open(MESH_DRUG_GROUPINGS_FILE) as f:
-  tree = ET.parse(f)
-  root = tree.getroot()
-
-  for elem in root.getchildren():
-    descriptorUI = ''
-
-    for subElem in elem.findall('DescriptorReferredTo'):
-      for i in subElem.getchildren():
-        if(i.tag == 'DescriptorUI'):
-          descriptorUI = i.text
-        if(i.tag == 'DescriptorName'):
-          for k in i.getchildren():
-            if(k.tag == 'String'):
-              descriptorName = k.text
-              mesh_drug_group_drug_name_dictionary[descriptorUI] = descriptorName
-
-    for subElem in elem.findall('PharmacologicalActionSubstanceList'):
-        for i in subElem.getchildren():
-          if(i.tag == 'Substance'):
-            for j in i.getchildren():
-              if(j.tag == 'RecordUI'):
-                recordUI = j.text
-                mesh_identifier_of_drug_group_dictionary[recordUI] = descriptorUI
-                    
+mesh_drug_group_drug_name_dictionary = {}
+for descriptorUI, (descriptorName, substances) in paIndex.byDescriptor.items():
+  mesh_drug_group_drug_name_dictionary[descriptorUI] = descriptorName
 
 flipped_dictionary = {}
 for key, value in mesh_identifier_of_drug_group_dictionary.items():
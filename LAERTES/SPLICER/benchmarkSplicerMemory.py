@@ -0,0 +1,105 @@
+# benchmarkSplicerMemory.py
+#
+# Compare the peak memory (RSS) and time of reading a SPLICER file and
+# removing the duplicate drug-HOI combinations of each set id and
+# section
+#
+#   dict    - a 15-key dict per row and the concatenated set id,
+#             section and body label strings as keys (what
+#             splicer2rdf.py used to do)
+#   records - SplicerRecords and SeenDrugHois (splicerRecords.py)
+#   sorted  - sortSplicerRecords and AdjacentDrugHois (splicer2rdf.py
+#             --sorted, with the default chunk size)
+#
+# Each is run in a process of its own, after one that only reads the
+# lines of the file, so that the peak RSS of one does not hide the
+# other. The drug concept ids are used as they are (no RxNorm
+# mapping) so that no terminology mapping files are needed.
+#
+# USAGE: python benchmarkSplicerMemory.py [SPLICER file (default: SPLICER_DATA in splicer2rdf.py)]
+#
+
+import sys, time, resource, subprocess
+
+from splicerRecords import SPLICER_FIELDS, readSplicerRecords, sortSplicerRecords, SeenDrugHois, AdjacentDrugHois
+
+SPLICER_DATA = "/home/rdb20/Downloads/SPLICER-data/SPLICER-MERGED-UPDATE-3-14-2016.tsv"
+
+MODES = ["read", "dict", "records", "sorted"]
+
+def readLines(fname):
+    f = open(fname, 'r')
+    f.readline()
+    rows = 0
+    for l in f:
+        rows += 1
+    f.close()
+    return (rows, 0)
+
+def dedupWithDicts(fname):
+    annotatedCache = {}
+    bodyLabelCache = {}
+    rows = 0
+    f = open(fname, 'r')
+    f.readline()
+    for l in f:
+        rows += 1
+        elts = l.strip("\n").replace('"',"").split("\t")
+        rowD = dict(zip(SPLICER_FIELDS, elts))
+        if not annotatedCache.has_key(rowD["SET_ID"]):
+            annotatedCache[rowD["SET_ID"]] = len(annotatedCache) + 1
+        bodyLabel = "Drug-HOI tag for %s-%s (%s - %s)" % (rowD["DRUG_CONCEPT_ID"], rowD["CONDITION_CONCEPT_ID"], rowD["TRADE_NAME"], rowD["CONDITION_PT"])
+        blcKey = rowD['SET_ID'] + rowD["SPL_SECTION"] + bodyLabel
+        if not bodyLabelCache.has_key(blcKey):
+            bodyLabelCache[blcKey] = None
+    f.close()
+    return (rows, len(bodyLabelCache))
+
+def dedupWithRecords(fname):
+    annotatedCache = {}
+    seenDrugHois = SeenDrugHois()
+    rows = 0
+    for elt in readSplicerRecords(fname):
+        rows += 1
+        currentAnnotation = annotatedCache.get(elt.SET_ID)
+        if currentAnnotation is None:
+            currentAnnotation = annotatedCache[elt.SET_ID] = len(annotatedCache) + 1
+        seenDrugHois.add(currentAnnotation, elt, elt.DRUG_CONCEPT_ID)
+    return (rows, len(seenDrugHois))
+
+def sortKey(elt):
+    return (elt.SET_ID, elt.SPL_SECTION, elt.DRUG_CONCEPT_ID, elt.CONDITION_CONCEPT_ID)
+
+def dedupSorted(fname):
+    annotatedCache = {}
+    adjacentDrugHois = AdjacentDrugHois()
+    rows = 0
+    for elt in sortSplicerRecords(fname, sortKey):
+        rows += 1
+        currentAnnotation = annotatedCache.get(elt.SET_ID)
+        if currentAnnotation is None:
+            annotatedCache.clear()
+            currentAnnotation = annotatedCache[elt.SET_ID] = rows
+        adjacentDrugHois.add(currentAnnotation, elt, elt.DRUG_CONCEPT_ID)
+    return (rows, len(adjacentDrugHois))
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--mode":
+        (mode, fname) = (sys.argv[2], sys.argv[3])
+        start = time.time()
+        (rows, combinations) = {"read": readLines, "dict": dedupWithDicts, "records": dedupWithRecords, "sorted": dedupSorted}[mode](fname)
+        elapsed = time.time() - start
+        # ru_maxrss is in kilobytes on Linux
+        print "%-8s %10d rows %10d drug-HOI combinations %8.1f MB peak RSS %8.1f seconds" % (mode, rows, combinations, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, elapsed)
+        sys.stdout.flush()
+        sys.exit(0)
+
+    fname = SPLICER_DATA
+    if len(sys.argv) > 1:
+        fname = sys.argv[1]
+    print "INFO: reading %s" % fname
+    sys.stdout.flush()
+    for mode in MODES:
+        if subprocess.call([sys.executable, sys.argv[0], "--mode", mode, fname]) != 0:
+            print "ERROR: the %s run failed" % mode
+            sys.exit(1)
@@ -9,13 +9,17 @@
 #
 
 import sys
-sys.path = sys.path + ['.']
+sys.path = sys.path + ['.', '../common', '../terminology-mappings']
 
-import re, codecs, uuid, datetime
+import re, codecs, uuid, datetime, argparse
 import json
 import pickle
 from rdflib import Graph, BNode, Literal, Namespace, URIRef, RDF, RDFS, XSD
 
+from ntriplesWriter import NTriplesWriter, openOutputFile
+from terminologyMappings import rxnormToOmop, splSetIdToRxNorm
+from splicerRecords import readSplicerRecords, sortSplicerRecords, SeenDrugHois, AdjacentDrugHois, SORT_CHUNK_ROWS
+
 SPLICER_DATA = "/home/rdb20/Downloads/SPLICER-data/SPLICER-MERGED-UPDATE-3-14-2016.tsv"
 
 # TERMINOLOGY MAPPING FILES
@@ -25,63 +29,18 @@ SPL_SET_ID_TO_RXNORM = "../terminology-mappings/SPLSetIdToRxNorm/rxnorm_mappings
 # OUTPUT DATA FILE
 OUTPUT_FILE = "drug-hoi-splicer.nt"
 
-DRUGS_D_OMOP_TO_RXCUI = {}
-DRUGS_D_RXNORM_TO_OMOP = {}
-f = open(RXNORM_TO_OMOP,"r")
-buf = f.read()
-f.close()
-l = buf.split("\n")
-for elt in l:
-    if elt.strip() == "":
-        break
+parser = argparse.ArgumentParser(description="Convert the result of a SPLICER drug-HOI evidence search to Open Data Annotation")
+parser.add_argument("--sorted", action="store_true", help="sort the SPLICER records by set id, section, drug, and condition (in chunks written to temporary files) so that duplicates can be removed without keeping every drug-HOI combination in memory")
+parser.add_argument("--sort-chunk-rows", type=int, default=SORT_CHUNK_ROWS, help="number of rows sorted in memory at a time with --sorted (default: %s)" % SORT_CHUNK_ROWS)
+args = parser.parse_args()
 
-    (omop,rxcui) = [x.strip() for x in elt.split("|")]
-    DRUGS_D_OMOP_TO_RXCUI[omop] = rxcui
-    DRUGS_D_RXNORM_TO_OMOP[rxcui] = omop
+drugMappings = rxnormToOmop(RXNORM_TO_OMOP)
+DRUGS_D_OMOP_TO_RXCUI = drugMappings.fromOmop
+DRUGS_D_RXNORM_TO_OMOP = drugMappings.toOmop
 
 # used to manage SPLICER records where there is yet no OMOP concept id
 # for the drug
-SPLS_D_SETID_TO_RXNORM = {}
-f = open(SPL_SET_ID_TO_RXNORM,"r")
-buf = f.read()
-f.close()
-l = buf.split("\n")
-for elt in l:
-    if elt.strip() == "":
-        break
-
-    (setid,spl_version,rxcui,rxstring,rxtty) = [x.strip() for x in elt.split("|")]
-    SPLS_D_SETID_TO_RXNORM[setid] = rxcui
-        
-
-def splicer_f_generator():
-    # open the SPLICER data file and parse it incrementally
-    #
-    # @returns: a dictionary containing all of the data in a single
-    #           SPLICER record.
-    f = open(SPLICER_DATA, 'r')
-    if not f:
-        f.close()
-        raise StopIteration
-
-    # skips header 
-    l = f.readline()
-    while 1:
-        l = f.readline()
-
-        # stops at EOF
-        if l == "":
-            f.close()
-            raise StopIteration
-
-        elts = l.strip("\n").replace('"',"").split("\t")
-        rowD = {}
-        (rowD["DRUG_CONCEPT_ID"], rowD["SPL_ID"], rowD["SET_ID"], rowD["TRADE_NAME"], rowD["SPL_DATE"], rowD["SPL_SECTION"], rowD["CONDITION_CONCEPT_ID"], rowD["CONDITION_PT"], rowD["CONDITION_LLT"], rowD["CONDITION_SOURCE_VALUE"], rowD["parseMethod"], rowD["sentenceNum"], rowD["labdirection"], rowD["drugfreq"], rowD["exclude"]) = elts
-        
-        # return the dictionary entry
-        yield rowD
-
-
+SPLS_D_SETID_TO_RXNORM = splSetIdToRxNorm(SPL_SET_ID_TO_RXNORM).toRxcui
 
 ## set up RDF graph
 # identify namespaces for other ontologies to be used                                                                                    
@@ -181,8 +140,12 @@ annotationEvidenceCntr = 1
 annotatedCache = {} # indexes annotation ids by pmid
 currentAnnotation = annotationItemCntr
 
-bodyLabelCache = {} # indexes drug HOIs by setid to avoid duplicate
-                    # counts in the final dataset
+# drug HOIs by setid and section to avoid duplicate counts in the final
+# dataset
+if args.sorted:
+    seenDrugHois = AdjacentDrugHois()
+else:
+    seenDrugHois = SeenDrugHois()
 
 currentAnnotSet = 'ohdsi-splicer-annotation-set-%s' % annotationSetCntr 
 annotationSetCntr += 1
@@ -190,13 +153,27 @@ graph.add((poc[currentAnnotSet], RDF.type, oa["DataAnnotation"])) # TODO: find o
 graph.add((poc[currentAnnotSet], oa["annotatedAt"], Literal(datetime.date.today())))
 graph.add((poc[currentAnnotSet], oa["annotatedBy"], URIRef(u"http://www.pitt.edu/~rdb20/triads-lab.xml#TRIADS")))
 
-f = codecs.open(OUTPUT_FILE,"w","utf8")
+f = openOutputFile(OUTPUT_FILE,"w")
 s = graph.serialize(format="n3",encoding="utf8", errors="replace")
 f.write(s)
+ntw = NTriplesWriter(f)
+
+# The key that --sorted sorts the records by. The drug is the one the
+# record is annotated with below so that duplicates are adjacent even
+# when only some of the records of a set id have a drug concept id.
+def sortKey(elt):
+    if elt.DRUG_CONCEPT_ID == "NULL":
+        drug = DRUGS_D_RXNORM_TO_OMOP.get(SPLS_D_SETID_TO_RXNORM.get(elt.SET_ID), "NULL")
+    else:
+        drug = elt.DRUG_CONCEPT_ID
+    return (elt.SET_ID, elt.SPL_SECTION, drug, elt.CONDITION_CONCEPT_ID)
 
 # DEBUG
 cntr = 0 
-it = splicer_f_generator()
+if args.sorted:
+    it = sortSplicerRecords(SPLICER_DATA, sortKey, args.sort_chunk_rows)
+else:
+    it = readSplicerRecords(SPLICER_DATA)
 for elt in it:
     #if cntr == 50000:
     #    break
@@ -206,25 +183,25 @@ for elt in it:
     # try to handle cases where no concept id exists for the drug
     # concept
     imedsDrug = rxcuiDrug = drugLabs = None
-    if elt["DRUG_CONCEPT_ID"] == "NULL":
-        if not SPLS_D_SETID_TO_RXNORM.has_key(elt["SET_ID"]):
-            print "WARNING: unable to process SPLICER record %d because no valid OMOP concept id could be found for the drug using set id %s" % (cntr, elt["SET_ID"])
+    if elt.DRUG_CONCEPT_ID == "NULL":
+        if not SPLS_D_SETID_TO_RXNORM.has_key(elt.SET_ID):
+            print "WARNING: unable to process SPLICER record %d because no valid OMOP concept id could be found for the drug using set id %s" % (cntr, elt.SET_ID)
             continue
         else:
-            rxcuiDrug = SPLS_D_SETID_TO_RXNORM[elt["SET_ID"]]
+            rxcuiDrug = SPLS_D_SETID_TO_RXNORM[elt.SET_ID]
             if not DRUGS_D_RXNORM_TO_OMOP.has_key(rxcuiDrug):
-                print "WARNING: unable to process SPLICER record %d because no valid OMOP concept id could be found for the drug using set id %s with RxNorm mapping %s" % (cntr, elt["SET_ID"], rxcuiDrug)
+                print "WARNING: unable to process SPLICER record %d because no valid OMOP concept id could be found for the drug using set id %s with RxNorm mapping %s" % (cntr, elt.SET_ID, rxcuiDrug)
                 continue
             imedsDrug = DRUGS_D_RXNORM_TO_OMOP[rxcuiDrug]
     else:
-        imedsDrug = elt["DRUG_CONCEPT_ID"]
+        imedsDrug = elt.DRUG_CONCEPT_ID
         if not DRUGS_D_OMOP_TO_RXCUI.has_key(imedsDrug):
             print "WARNING: unable to process SPLICER record %d because no valid RXCUI could be found for the drug using OMOP id %s" % (cntr, imedsDrug)
             continue
         
         rxcuiDrug = DRUGS_D_OMOP_TO_RXCUI[imedsDrug]
     
-    print "INFO: processing record with setid: %s\timedsDrug: %s\trxcuiDrug: %s" % (elt["SET_ID"],imedsDrug,rxcuiDrug)
+    print "INFO: processing record with setid: %s\timedsDrug: %s\trxcuiDrug: %s" % (elt.SET_ID,imedsDrug,rxcuiDrug)
 
 
     ###################################################################
@@ -235,12 +212,15 @@ for elt in it:
     ###################################################################
     currentAnnotItem = None
 
-    if annotatedCache.has_key(elt['SET_ID']):
-        currentAnnotation = annotatedCache[elt['SET_ID']]
+    if annotatedCache.has_key(elt.SET_ID):
+        currentAnnotation = annotatedCache[elt.SET_ID]
         currentAnnotItem = "ohdsi-splicer-annotation-item-%s" % currentAnnotation
     else:
+        if args.sorted:
+            # the records of a set id are all together
+            annotatedCache.clear()
         currentAnnotation = annotationItemCntr
-        annotatedCache[elt['SET_ID']] = currentAnnotation
+        annotatedCache[elt.SET_ID] = currentAnnotation
         annotationItemCntr += 1
         
         currentAnnotItem = "ohdsi-splicer-annotation-item-%s" % currentAnnotation
@@ -257,27 +237,24 @@ for elt in it:
         currentAnnotTargetUuid = URIRef(u"urn:uuid:%s" % uuid.uuid4())
         tplL.append((poc[currentAnnotItem], oa["hasTarget"], currentAnnotTargetUuid))
         tplL.append((currentAnnotTargetUuid, RDF.type, oa["SpecificResource"]))
-        tplL.append((currentAnnotTargetUuid, oa["hasSource"], URIRef(u"http://dailymed.nlm.nih.gov/dailymed/lookup.cfm?setid=" + elt['SET_ID'])))
+        tplL.append((currentAnnotTargetUuid, oa["hasSource"], URIRef(u"http://dailymed.nlm.nih.gov/dailymed/lookup.cfm?setid=" + elt.SET_ID)))
 
         # TODO: make these custom Selectors for SPLs
         currentAnnotSelectorUuid = URIRef(u"urn:uuid:%s" % uuid.uuid4())
         tplL.append((currentAnnotTargetUuid, oa["hasSelector"], currentAnnotSelectorUuid))
         tplL.append((currentAnnotSelectorUuid, RDF.type, poc["SectionSelector"]))
 
-        if elt["SPL_SECTION"] == "Adverse Reactions" or elt["SPL_SECTION"] == "Post Marketing":
+        if elt.SPL_SECTION == "Adverse Reactions" or elt.SPL_SECTION == "Post Marketing":
             tplL.append((currentAnnotSelectorUuid, linkedspls_vocabulary["splSection"], loinc["34084-4"]))
-        elif elt["SPL_SECTION"] == "Precautions (beta)":
+        elif elt.SPL_SECTION == "Precautions (beta)":
             tplL.append((currentAnnotSelectorUuid, linkedspls_vocabulary["splSection"], loinc["34072-9"]))
-        elif elt["SPL_SECTION"] == "Black Box (beta)":
+        elif elt.SPL_SECTION == "Black Box (beta)":
             tplL.append((currentAnnotSelectorUuid, linkedspls_vocabulary["splSection"], loinc["34066-1"]))
 
         # TODO: the exact string used to tag the ADR should be retained by the selector
-        tplL.append((currentAnnotSelectorUuid, oa["exact"], Literal(elt["CONDITION_SOURCE_VALUE"])))
+        tplL.append((currentAnnotSelectorUuid, oa["exact"], Literal(elt.CONDITION_SOURCE_VALUE)))
 
-        s = ""
-        for t in tplL:
-            s += unicode.encode(" ".join((t[0].n3(), t[1].n3(), t[2].n3(), u".\n")), 'utf-8', 'replace')
-        f.write(s)
+        ntw.writeTriples(tplL)
 
     # The data had duplicates drug HOI evidence items associated with
     # specific Set IDs for a couple of reasons 1) because updated files are merged with previous
@@ -287,13 +264,10 @@ for elt in it:
     # than sentences, it makes sense to remove all duplications within
     # a section. If we move to more specific text selectors within a
     # document, this will no longer make sense
-    bodyLabel = "Drug-HOI tag for %s-%s (%s - %s)" % (imedsDrug, elt["CONDITION_CONCEPT_ID"], elt["TRADE_NAME"], elt["CONDITION_PT"])
-    blcKey = elt['SET_ID'] + elt["SPL_SECTION"] + bodyLabel
-    if bodyLabelCache.has_key(blcKey):
-        print "INFO: skipping this record because it duplicates a drug-HOI combination already created for this setid within this section: %s" % (blcKey)
+    bodyLabel = "Drug-HOI tag for %s-%s (%s - %s)" % (imedsDrug, elt.CONDITION_CONCEPT_ID, elt.TRADE_NAME, elt.CONDITION_PT)
+    if not seenDrugHois.add(currentAnnotation, elt, imedsDrug):
+        print "INFO: skipping this record because it duplicates a drug-HOI combination already created for this setid within this section: %s" % (elt.SET_ID + elt.SPL_SECTION + bodyLabel)
         continue
-    else:
-        bodyLabelCache[blcKey] = None
     
     # Specify the bodies of the annotation - for this type each
     # body contains the MedDRA drug and condition as a semantic tag
@@ -305,17 +279,14 @@ for elt in it:
     tplL.append((poc[currentAnnotationBody], RDFS.label, Literal(bodyLabel)))
     tplL.append((poc[currentAnnotationBody], RDF.type, ohdsi["adrAnnotationBody"])) # TODO: this is not yet formalized in a public ontology but should be
 
-    tplL.append((poc[currentAnnotationBody], dcterms["description"], Literal("Drug-HOI tag for %s(rxnorm) - %s(meddra PT) (Drug trade name:%s; HOI LLT:%s)" % (rxcuiDrug, elt["CONDITION_PT"], elt["TRADE_NAME"], elt["CONDITION_LLT"]))))
+    tplL.append((poc[currentAnnotationBody], dcterms["description"], Literal("Drug-HOI tag for %s(rxnorm) - %s(meddra PT) (Drug trade name:%s; HOI LLT:%s)" % (rxcuiDrug, elt.CONDITION_PT, elt.TRADE_NAME, elt.CONDITION_LLT))))
     tplL.append((poc[currentAnnotationBody], ohdsi['ImedsDrug'], ohdsi[imedsDrug]))
     tplL.append((poc[currentAnnotationBody], ohdsi['RxnormDrug'], rxnorm[rxcuiDrug]))
                         
-    tplL.append((poc[currentAnnotationBody], ohdsi['ImedsHoi'], ohdsi[elt["CONDITION_CONCEPT_ID"]])) # TODO: consider adding the values as a collection
-    s = ""
-    for t in tplL:
-        s += unicode.encode(" ".join((t[0].n3(), t[1].n3(), t[2].n3(), u".\n")), 'utf-8', 'replace')
-    f.write(s)
+    tplL.append((poc[currentAnnotationBody], ohdsi['ImedsHoi'], ohdsi[elt.CONDITION_CONCEPT_ID])) # TODO: consider adding the values as a collection
+    ntw.writeTriples(tplL)
 
 
-f.close
+f.close()
 
 graph.close()
@@ -0,0 +1,176 @@
+# splicerRecords.py
+#
+# Read the rows of a SPLICER drug-HOI evidence file and keep track of
+# the drug-HOI combinations that have already been annotated for a set
+# id and section (used by splicer2rdf.py).
+#
+# The merged SPLICER file has millions of rows that repeat the same
+# few thousand set ids, trade names, sections, and MedDRA terms, so
+#
+#  - each row is a SplicerRecord (a namedtuple, i.e., no per-row
+#    dictionary) whose fields are interned, and
+#  - SeenDrugHois keeps one tuple of small integers per drug-HOI
+#    combination instead of the concatenated strings describing it.
+#
+# See benchmarkSplicerMemory.py for the peak memory of both.
+#
+# For files whose drug-HOI combinations do not fit in memory,
+# sortSplicerRecords sorts the rows in chunks of a bounded number of
+# rows and merges the sorted chunks, so that the duplicates of a
+# combination come one after another and AdjacentDrugHois only has to
+# keep the last one.
+#
+
+import os, heapq, tempfile
+from collections import namedtuple
+
+SPLICER_FIELDS = ("DRUG_CONCEPT_ID", "SPL_ID", "SET_ID", "TRADE_NAME", "SPL_DATE", "SPL_SECTION", "CONDITION_CONCEPT_ID", "CONDITION_PT", "CONDITION_LLT", "CONDITION_SOURCE_VALUE", "parseMethod", "sentenceNum", "labdirection", "drugfreq", "exclude")
+
+SplicerRecord = namedtuple("SplicerRecord", SPLICER_FIELDS)
+
+newRecord = tuple.__new__
+
+# Convert one line of a SPLICER file to a SplicerRecord. The values
+# that repeat over many rows (ids, trade name, section, and terms) are
+# interned.
+def parseSplicerLine(l):
+    (drugConceptId, splId, setId, tradeName, splDate, splSection, conditionConceptId, conditionPt, conditionLlt, conditionSourceValue, parseMethod, sentenceNum, labdirection, drugfreq, exclude) = l.strip("\n").replace('"',"").split("\t")
+    return newRecord(SplicerRecord, (intern(drugConceptId), intern(splId), intern(setId), intern(tradeName), intern(splDate), intern(splSection), intern(conditionConceptId), intern(conditionPt), intern(conditionLlt), conditionSourceValue, parseMethod, sentenceNum, labdirection, drugfreq, exclude))
+
+# Yield the rows of the SPLICER file fname (after the header) as
+# SplicerRecords
+def readSplicerRecords(fname):
+    f = open(fname, 'r')
+    try:
+        f.readline() # skips header
+        for l in f:
+            yield parseSplicerLine(l)
+    finally:
+        f.close()
+
+# The drug-HOI combinations already annotated for each set id and
+# section. A combination is kept as the tuple
+#
+#   (set id index, section code, drug concept id, condition concept id)
+#
+# where the set id index is the number of the set id's annotation item,
+# the section code is the number of the section in the order they were
+# first seen, and the OMOP concept ids are ints. The same int object is
+# used for a value every time it occurs, so each combination costs one
+# small tuple.
+class SeenDrugHois(object):
+    def __init__(self):
+        self.sectionD = {}
+        self.conceptIdD = {}
+        self.seen = set()
+
+    def conceptId(self, value):
+        if value.isdigit():
+            conceptId = int(value)
+        else:
+            conceptId = value
+        self.conceptIdD[value] = conceptId
+        return conceptId
+
+    # Record the drug-HOI combination of the SPLICER record elt (whose
+    # drug has the OMOP id imedsDrug). Returns False if it was already
+    # recorded.
+    def add(self, setIdIndex, elt, imedsDrug):
+        section = self.sectionD.get(elt.SPL_SECTION)
+        if section is None:
+            section = self.sectionD[elt.SPL_SECTION] = len(self.sectionD)
+        drug = self.conceptIdD.get(imedsDrug)
+        if drug is None:
+            drug = self.conceptId(imedsDrug)
+        condition = self.conceptIdD.get(elt.CONDITION_CONCEPT_ID)
+        if condition is None:
+            condition = self.conceptId(elt.CONDITION_CONCEPT_ID)
+        key = (setIdIndex, section, drug, condition)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        return True
+
+    def __len__(self):
+        return len(self.seen)
+
+# The drug-HOI combination of the last record, for records in the order
+# of sortSplicerRecords (set id, section, drug, condition), where all
+# of the duplicates of a combination are adjacent. Used like
+# SeenDrugHois.
+class AdjacentDrugHois(object):
+    def __init__(self):
+        self.last = None
+        self.count = 0
+
+    def add(self, setIdIndex, elt, imedsDrug):
+        key = (setIdIndex, elt.SPL_SECTION, imedsDrug, elt.CONDITION_CONCEPT_ID)
+        if key == self.last:
+            return False
+        self.last = key
+        self.count += 1
+        return True
+
+    def __len__(self):
+        return self.count
+
+# number of rows sorted in memory at a time by sortSplicerRecords
+SORT_CHUNK_ROWS = 200000
+
+# Write the (key, line number, line) tuples of keyedL, sorted, to a
+# temporary file as "line number<TAB>line". Returns the file name.
+def writeSortedChunk(keyedL, tmpDir):
+    keyedL.sort()
+    (fd, fname) = tempfile.mkstemp(prefix="splicer-sort-", suffix=".tsv", dir=tmpDir)
+    f = os.fdopen(fd, 'w')
+    for (key, lineNo, l) in keyedL:
+        f.write("%d\t%s" % (lineNo, l))
+    f.close()
+    return fname
+
+def readSortedChunk(fname, keyFunc):
+    f = open(fname, 'r')
+    for l in f:
+        (lineNo, l) = l.split("\t", 1)
+        elt = parseSplicerLine(l)
+        yield (keyFunc(elt), int(lineNo), elt)
+    f.close()
+
+# Yield the SplicerRecords of the SPLICER file fname in the order of
+# keyFunc(record), and in file order for records with the same key.
+# At most chunkRows rows are held in memory: each chunk is sorted and
+# written to a temporary file (in tmpDir, by default the system's
+# temporary folder), and the files are merged as they are read.
+def sortSplicerRecords(fname, keyFunc, chunkRows=SORT_CHUNK_ROWS, tmpDir=None):
+    chunkL = []
+    try:
+        keyedL = []
+        lineNo = 0
+        f = open(fname, 'r')
+        f.readline() # skips header
+        for l in f:
+            lineNo += 1
+            if not l.endswith("\n"):
+                l += "\n"
+            keyedL.append((keyFunc(parseSplicerLine(l)), lineNo, l))
+            if len(keyedL) == chunkRows:
+                chunkL.append(writeSortedChunk(keyedL, tmpDir))
+                keyedL = []
+        f.close()
+
+        if not chunkL:
+            print "INFO: sorted %d SPLICER records in memory" % lineNo
+            keyedL.sort()
+            for (key, lineNo, l) in keyedL:
+                yield parseSplicerLine(l)
+            return
+
+        if keyedL:
+            chunkL.append(writeSortedChunk(keyedL, tmpDir))
+            keyedL = []
+        print "INFO: sorted %d SPLICER records in %d chunks, merging" % (lineNo, len(chunkL))
+        for (key, lineNo, elt) in heapq.merge(*[readSortedChunk(chunk, keyFunc) for chunk in chunkL]):
+            yield elt
+    finally:
+        for chunk in chunkL:
+            os.remove(chunk)
@@ -12,6 +12,7 @@
  /*ASSUMPTIONS*/
  /*
  1)  You have the right copy of the CDM Vocabulary available.
+ 2)  VOCABULARY_CLOSURE.sql has been run after the last evidence load.
  */
 
 \echo 'Starting Script'
@@ -25,33 +26,17 @@ ORDER BY HOI, SNOMED_HOI;
 
 CREATE INDEX IDX_CONDITIONS_CONDITION_CONCEPT_ID ON TEMP_CONDITIONS (CONDITION_CONCEPT_ID);
 
-SELECT DISTINCT *
-INTO LU_CONDITIONS_CHILDREN /*this is slow running*/
-FROM (
-	SELECT CONDITION_CONCEPT_ID, CONDITION_CONCEPT_NAME, c1.CONCEPT_ID, c1.CONCEPT_NAME
-	FROM TEMP_CONDITIONS c
-		JOIN CONCEPT_ANCESTOR ca
-			ON ca.ANCESTOR_CONCEPT_ID = c.CONDITION_CONCEPT_ID
-		JOIN CONCEPT c1
-			ON c1.CONCEPT_ID = ca.DESCENDANT_CONCEPT_ID
-			AND c1.VOCABULARY_ID = 'SNOMED'
-			AND c1.INVALID_REASON IS NULL
-	UNION 
-	/*This allows things go up in the Vocab*/
-	SELECT c1.CONCEPT_ID AS CONDITION_CONCEPT_ID, c1.CONCEPT_NAME AS CONDITION_CONCEPT_NAME, CONDITION_CONCEPT_ID AS CONCEPT_ID, CONDITION_CONCEPT_NAME AS CONCEPT_NAME
-	FROM TEMP_CONDITIONS c
-		JOIN CONCEPT_ANCESTOR ca
-			ON ca.DESCENDANT_CONCEPT_ID = c.CONDITION_CONCEPT_ID
-		JOIN CONCEPT c1
-			ON c1.CONCEPT_ID = ca.ANCESTOR_CONCEPT_ID
-			AND c1.VOCABULARY_ID = 'SNOMED'
-			AND c1.INVALID_REASON IS NULL
-) z;
-
-/*This has been added because it is known MeSH lands at 4340942 but that doesn't link in with other liver injury terms*/
-INSERT INTO LU_CONDITIONS_CHILDREN (CONDITION_CONCEPT_ID, CONDITION_CONCEPT_NAME, CONCEPT_ID, CONCEPT_NAME) VALUES (4026032,'Acute hepatic failure',4340942,'Drug-induced hepatitis');
-/*Adding this link because some of the evidence gets associated to the measurement which has no links anywhere*/
-INSERT INTO LU_CONDITIONS_CHILDREN (CONDITION_CONCEPT_ID, CONDITION_CONCEPT_NAME, CONCEPT_ID, CONCEPT_NAME) VALUES (314664,'Prolonged QT interval',4008859,'Prolonged QT interval');
+/*The expansion of every evidence condition in the Vocabulary is kept in LU_CONDITION_CLOSURE (see VOCABULARY_CLOSURE.sql), use the rows of the current conditions*/
+DROP TABLE IF EXISTS LU_CONDITIONS_CHILDREN;
+
+SELECT DISTINCT CONDITION_CONCEPT_ID, CONDITION_CONCEPT_NAME, CONCEPT_ID, CONCEPT_NAME
+INTO LU_CONDITIONS_CHILDREN
+FROM LU_CONDITION_CLOSURE
+WHERE SEED_CONCEPT_ID IN (
+	SELECT CONDITION_CONCEPT_ID
+	FROM TEMP_CONDITIONS
+)
+OR SEED_CONCEPT_ID IS NULL; /*links missing from the Vocabulary, see condition-closure-patches.csv*/
 
 CREATE INDEX IDX_CONDITIONS_CHILDREN_CONDITION_CONCEPT_ID ON LU_CONDITIONS_CHILDREN (CONCEPT_ID);
 
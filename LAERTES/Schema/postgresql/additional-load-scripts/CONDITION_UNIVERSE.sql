@@ -11,6 +11,7 @@
   /*ASSUMPTIONS*/
  /*
  1)  You have the right copy of the CDM Vocabulary available.
+ 2)  VOCABULARY_CLOSURE.sql has been run after the last evidence load.
  */
 
 -- NOTE: For now, CTD evidence is counted as MEDLINE when it also includes OMIM
@@ -45,33 +46,14 @@ CREATE INDEX IDX_CONDITIONS_CONDITION_CONCEPT_ID ON TEMP_CONDITIONS (CONDITION_C
 
 \echo 'Generate Children Lookup'
 
-SELECT DISTINCT *
-INTO TEMP TABLE TEMP_CONDITIONS_CHILDREN /*this is slow running*/
-FROM (
-	SELECT CONDITION_CONCEPT_ID, CONDITION_CONCEPT_NAME, c1.CONCEPT_ID, c1.CONCEPT_NAME
-	FROM TEMP_CONDITIONS c
-		JOIN CONCEPT_ANCESTOR ca
-			ON ca.ANCESTOR_CONCEPT_ID = c.CONDITION_CONCEPT_ID
-		JOIN CONCEPT c1
-			ON c1.CONCEPT_ID = ca.DESCENDANT_CONCEPT_ID
-			AND c1.VOCABULARY_ID = 'SNOMED'
-			AND c1.INVALID_REASON IS NULL
-	UNION 
-	/*This allows things go up in the Vocab*/
-	SELECT c1.CONCEPT_ID AS CONDITION_CONCEPT_ID, c1.CONCEPT_NAME AS CONDITION_CONCEPT_NAME, CONDITION_CONCEPT_ID AS CONCEPT_ID, CONDITION_CONCEPT_NAME AS CONCEPT_NAME
-	FROM TEMP_CONDITIONS c
-		JOIN CONCEPT_ANCESTOR ca
-			ON ca.DESCENDANT_CONCEPT_ID = c.CONDITION_CONCEPT_ID
-		JOIN CONCEPT c1
-			ON c1.CONCEPT_ID = ca.ANCESTOR_CONCEPT_ID
-			AND c1.VOCABULARY_ID = 'SNOMED'
-			AND c1.INVALID_REASON IS NULL
-) z;
-
-/*This has been added because it is known MeSH lands at 4340942 but that doesn't link in with other liver injury terms*/
-INSERT INTO TEMP_CONDITIONS_CHILDREN (CONDITION_CONCEPT_ID, CONDITION_CONCEPT_NAME, CONCEPT_ID, CONCEPT_NAME) VALUES (4026032,'Acute hepatic failure',4340942,'Drug-induced hepatitis');
-/*Adding this link because some of the evidence gets associated to the measurement which has no links to the QT prolongation condition*/
-INSERT INTO TEMP_CONDITIONS_CHILDREN (CONDITION_CONCEPT_ID, CONDITION_CONCEPT_NAME, CONCEPT_ID, CONCEPT_NAME) VALUES (314664,'Prolonged QT interval',4008859,'Prolonged QT interval');
+SELECT DISTINCT CONDITION_CONCEPT_ID, CONDITION_CONCEPT_NAME, CONCEPT_ID, CONCEPT_NAME
+INTO TEMP TABLE TEMP_CONDITIONS_CHILDREN /*expanded once by VOCABULARY_CLOSURE.sql*/
+FROM LU_CONDITION_CLOSURE
+WHERE SEED_CONCEPT_ID IN (
+	SELECT CONDITION_CONCEPT_ID
+	FROM TEMP_CONDITIONS
+)
+OR SEED_CONCEPT_ID IS NULL; /*links missing from the Vocabulary, see condition-closure-patches.csv*/
 
 CREATE INDEX IDX_CONDITIONS_CHILDREN_CONDITION_CONCEPT_ID ON TEMP_CONDITIONS_CHILDREN (CONCEPT_ID);
 ALTER TABLE TEMP_CONDITIONS_CHILDREN CLUSTER ON IDX_CONDITIONS_CHILDREN_CONDITION_CONCEPT_ID;
@@ -11,63 +11,24 @@
   /*ASSUMPTIONS*/
  /*
  1)  You have the right copy of the CDM Vocabulary available.
+ 2)  VOCABULARY_CLOSURE.sql has been run after the last evidence load.
  */
 
 -- NOTE: For now, CTD evidence is counted as MEDLINE when it also includes OMIM
 
 \echo 'Starting Script'
 
-/*Get drugs down to ingredients*/
+/*Get drugs down to ingredients (see LU_DRUG_INGREDIENT in VOCABULARY_CLOSURE.sql), cutting out records without an ingredient available*/
 /*-----------------------------*/
 \echo 'Mapping Ingredients'
 
-SELECT r.HOI AS CONDITION_CONCEPT_ID, r.SNOMED_HOI AS CONDITION_CONCEPT_NAME,
-	r.DRUG AS DRUG_CONCEPT_ID, r.RXNORM_DRUG AS DRUG_CONCEPT_NAME,  
-	c.CONCEPT_ID AS INGREDIENT_ID, c.CONCEPT_NAME AS INGREDIENT_NAME,
-	CASE WHEN c.CONCEPT_ID IS NULL THEN 0 ELSE 1 END INGREDIENT_EXISTS, 
-	c2.CONCEPT_ID AS CLINICAL_DRUG_ID,c2.CONCEPT_NAME AS CLINICAL_DRUG_NAME,
-	CASE WHEN c2.CONCEPT_ID IS NULL THEN 0 ELSE 1 END CLINICAL_DRUG_EXISTS, 
-	e.EVIDENCE_TYPE, e.SUPPORTS, e.EVIDENCE_SOURCE_CODE_ID, e.STATISTIC_VALUE, e.EVIDENCE_LINKOUT, e.STATISTIC_TYPE
-INTO TEMP TABLE TEMP_INGREDIENTS
+SELECT DISTINCT di.INGREDIENT_ID, di.INGREDIENT_NAME, e.EVIDENCE_TYPE
+INTO TEMP TABLE TEMP_DRUGS
 FROM DRUG_HOI_EVIDENCE e
 	JOIN DRUG_HOI_RELATIONSHIP r
 		ON r.ID = e.DRUG_HOI_RELATIONSHIP
-	/*ROLL DOWN TO INGREDIENTS*/
-	LEFT OUTER JOIN CONCEPT_ANCESTOR ca
-		ON ca.DESCENDANT_CONCEPT_ID = r.DRUG
-		AND ca.ANCESTOR_CONCEPT_ID IN (
-			SELECT DISTINCT CONCEPT_ID
-			FROM CONCEPT
-			WHERE VOCABULARY_ID = 'RxNorm'
-			AND CONCEPT_CLASS_ID = 'Ingredient'
-			AND INVALID_REASON IS NULL
-		)
-	LEFT OUTER JOIN CONCEPT c
-		ON c.CONCEPT_ID = ca.ANCESTOR_CONCEPT_ID
-	/*ROLL UP TO CLINICAL DRUG*/
-	LEFT OUTER JOIN CONCEPT_ANCESTOR ca2
-		ON ca2.DESCENDANT_CONCEPT_ID = r.DRUG
-		AND ca2.ANCESTOR_CONCEPT_ID IN (
-			SELECT DISTINCT CONCEPT_ID
-			FROM CONCEPT
-			WHERE VOCABULARY_ID = 'RxNorm'
-			AND CONCEPT_CLASS_ID = 'Clinical Drug'
-			AND INVALID_REASON IS NULL
-		)
-	LEFT OUTER JOIN CONCEPT c2
-		ON c2.CONCEPT_ID = ca2.ANCESTOR_CONCEPT_ID;
-
-CREATE INDEX IDX_INGREDIENTS_INGREDIENT_ID ON TEMP_INGREDIENTS (INGREDIENT_ID);
-CREATE INDEX IDX_INGREDIENTS_HOI ON TEMP_INGREDIENTS (CONDITION_CONCEPT_ID);
-
-/*For NULL safety, cut out records without an ingredient available*/
-/*-----------------------------*/
-\echo 'Trimming Records'
-
-SELECT DISTINCT INGREDIENT_ID, INGREDIENT_NAME, EVIDENCE_TYPE
-INTO TEMP TABLE TEMP_DRUGS
-FROM TEMP_INGREDIENTS
-WHERE INGREDIENT_EXISTS = 1
+	JOIN LU_DRUG_INGREDIENT di
+		ON di.DRUG_CONCEPT_ID = r.DRUG
 ORDER BY INGREDIENT_ID, INGREDIENT_NAME;
 
 /*Define drug universe has an ingredient that has records in spontaneous reprots, medline, and a product label*/
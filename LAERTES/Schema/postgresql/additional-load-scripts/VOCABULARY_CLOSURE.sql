@@ -0,0 +1,190 @@
+ /*-------------------------------------------------------------------------*
+ | Program:      VOCABULARY CLOSURE                                         |
+ | Purpose:      This program pre-processes the SNOMED ancestors and        |
+ |               descendants of every evidence condition and the RxNorm     |
+ |               ingredients of every evidence drug so that                 |
+ |               CONDITIONS_AND_CHILDREN_CONDITIONS.sql,                    |
+ |               CONDITION_UNIVERSE.sql, and DRUG_UNIVERSE.sql do not have  |
+ |               to expand CONCEPT_ANCESTOR each time they are run          |
+ |                                                                          |
+ | Version:      1.0                                                        |
+ *-------------------------------------------------------------------------*/
+
+ /*ASSUMPTIONS*/
+ /*
+ 1)  You have the right copy of the CDM Vocabulary available.
+ 2)  The tables are kept from one run to the next. Only conditions and
+     drugs that are not in LU_CLOSURE_SEEDS yet are expanded, so a run
+     after a new evidence load only does the work for new concepts.
+     Drop LU_CLOSURE_SEEDS, LU_CONDITION_CLOSURE, and
+     LU_DRUG_INGREDIENT after loading a new release of the vocabulary
+     (buildUniverse.py --rebuild).
+ 3)  The rows in condition-closure-patches.csv are added as they are
+     (SEED_CONCEPT_ID is NULL) on every run.
+ */
+
+\echo 'Starting Script'
+
+\echo 'Create tables'
+
+CREATE TABLE IF NOT EXISTS LU_CLOSURE_SEEDS (
+  SEED_CONCEPT_ID integer,
+  SEED_TYPE       character varying(20)
+);
+/*CREATE INDEX IF NOT EXISTS needs PostgreSQL 9.5*/
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+                 WHERE c.relname = lower('IDX_CLOSURE_SEEDS_SEED_CONCEPT_ID') AND n.nspname = current_schema()) THEN
+    CREATE INDEX IDX_CLOSURE_SEEDS_SEED_CONCEPT_ID ON LU_CLOSURE_SEEDS (SEED_TYPE, SEED_CONCEPT_ID);
+  END IF;
+END
+$$;
+
+/*SEED_CONCEPT_ID is the evidence condition whose expansion gave the row*/
+CREATE TABLE IF NOT EXISTS LU_CONDITION_CLOSURE (
+  SEED_CONCEPT_ID        integer,
+  CONDITION_CONCEPT_ID   integer,
+  CONDITION_CONCEPT_NAME character varying(255),
+  CONCEPT_ID             integer,
+  CONCEPT_NAME           character varying(255)
+);
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+                 WHERE c.relname = lower('IDX_CONDITION_CLOSURE_SEED_CONCEPT_ID') AND n.nspname = current_schema()) THEN
+    CREATE INDEX IDX_CONDITION_CLOSURE_SEED_CONCEPT_ID ON LU_CONDITION_CLOSURE (SEED_CONCEPT_ID);
+  END IF;
+END
+$$;
+
+CREATE TABLE IF NOT EXISTS LU_DRUG_INGREDIENT (
+  DRUG_CONCEPT_ID integer,
+  INGREDIENT_ID   integer,
+  INGREDIENT_NAME character varying(255)
+);
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+                 WHERE c.relname = lower('IDX_DRUG_INGREDIENT_DRUG_CONCEPT_ID') AND n.nspname = current_schema()) THEN
+    CREATE INDEX IDX_DRUG_INGREDIENT_DRUG_CONCEPT_ID ON LU_DRUG_INGREDIENT (DRUG_CONCEPT_ID);
+  END IF;
+END
+$$;
+
+START TRANSACTION;
+
+/*Get evidence conditions that have not been expanded yet*/
+/*-----------------------------*/
+\echo 'Find New Conditions'
+
+SELECT DISTINCT HOI AS CONDITION_CONCEPT_ID, SNOMED_HOI AS CONDITION_CONCEPT_NAME
+INTO TEMP TABLE TEMP_NEW_CONDITIONS
+FROM DRUG_HOI_RELATIONSHIP r
+WHERE NOT EXISTS (
+	SELECT 1
+	FROM LU_CLOSURE_SEEDS s
+	WHERE s.SEED_TYPE = 'condition'
+	AND s.SEED_CONCEPT_ID = r.HOI
+);
+
+/*for every new condition, get its children and parents in the Vocabulary*/
+/*-----------------------------*/
+\echo 'Expand New Conditions'
+
+INSERT INTO LU_CONDITION_CLOSURE (SEED_CONCEPT_ID, CONDITION_CONCEPT_ID, CONDITION_CONCEPT_NAME, CONCEPT_ID, CONCEPT_NAME)
+SELECT DISTINCT *
+FROM (
+	SELECT CONDITION_CONCEPT_ID AS SEED_CONCEPT_ID, CONDITION_CONCEPT_ID, CONDITION_CONCEPT_NAME, c1.CONCEPT_ID, c1.CONCEPT_NAME
+	FROM TEMP_NEW_CONDITIONS c
+		JOIN CONCEPT_ANCESTOR ca
+			ON ca.ANCESTOR_CONCEPT_ID = c.CONDITION_CONCEPT_ID
+		JOIN CONCEPT c1
+			ON c1.CONCEPT_ID = ca.DESCENDANT_CONCEPT_ID
+			AND c1.VOCABULARY_ID = 'SNOMED'
+			AND c1.INVALID_REASON IS NULL
+	UNION
+	/*This allows things go up in the Vocab*/
+	SELECT CONDITION_CONCEPT_ID AS SEED_CONCEPT_ID, c1.CONCEPT_ID AS CONDITION_CONCEPT_ID, c1.CONCEPT_NAME AS CONDITION_CONCEPT_NAME, CONDITION_CONCEPT_ID AS CONCEPT_ID, CONDITION_CONCEPT_NAME AS CONCEPT_NAME
+	FROM TEMP_NEW_CONDITIONS c
+		JOIN CONCEPT_ANCESTOR ca
+			ON ca.DESCENDANT_CONCEPT_ID = c.CONDITION_CONCEPT_ID
+		JOIN CONCEPT c1
+			ON c1.CONCEPT_ID = ca.ANCESTOR_CONCEPT_ID
+			AND c1.VOCABULARY_ID = 'SNOMED'
+			AND c1.INVALID_REASON IS NULL
+) z;
+
+INSERT INTO LU_CLOSURE_SEEDS (SEED_CONCEPT_ID, SEED_TYPE)
+SELECT DISTINCT CONDITION_CONCEPT_ID, 'condition'
+FROM TEMP_NEW_CONDITIONS;
+
+/*Get evidence drugs that have not been mapped to ingredients yet*/
+/*-----------------------------*/
+\echo 'Find New Drugs'
+
+SELECT DISTINCT DRUG AS DRUG_CONCEPT_ID
+INTO TEMP TABLE TEMP_NEW_DRUGS
+FROM DRUG_HOI_RELATIONSHIP r
+WHERE NOT EXISTS (
+	SELECT 1
+	FROM LU_CLOSURE_SEEDS s
+	WHERE s.SEED_TYPE = 'drug'
+	AND s.SEED_CONCEPT_ID = r.DRUG
+);
+
+/*ROLL DOWN TO INGREDIENTS*/
+/*-----------------------------*/
+\echo 'Map New Drugs to Ingredients'
+
+INSERT INTO LU_DRUG_INGREDIENT (DRUG_CONCEPT_ID, INGREDIENT_ID, INGREDIENT_NAME)
+SELECT DISTINCT d.DRUG_CONCEPT_ID, c.CONCEPT_ID, c.CONCEPT_NAME
+FROM TEMP_NEW_DRUGS d
+	JOIN CONCEPT_ANCESTOR ca
+		ON ca.DESCENDANT_CONCEPT_ID = d.DRUG_CONCEPT_ID
+	JOIN CONCEPT c
+		ON c.CONCEPT_ID = ca.ANCESTOR_CONCEPT_ID
+		AND c.VOCABULARY_ID = 'RxNorm'
+		AND c.CONCEPT_CLASS_ID = 'Ingredient'
+		AND c.INVALID_REASON IS NULL;
+
+INSERT INTO LU_CLOSURE_SEEDS (SEED_CONCEPT_ID, SEED_TYPE)
+SELECT DRUG_CONCEPT_ID, 'drug'
+FROM TEMP_NEW_DRUGS;
+
+/*Links that are missing from the Vocabulary (see condition-closure-patches.csv)*/
+/*-----------------------------*/
+\echo 'Load Patches'
+
+DELETE FROM LU_CONDITION_CLOSURE WHERE SEED_CONCEPT_ID IS NULL;
+
+CREATE TEMP TABLE TEMP_CLOSURE_PATCHES (
+  CONDITION_CONCEPT_ID   integer,
+  CONDITION_CONCEPT_NAME character varying(255),
+  CONCEPT_ID             integer,
+  CONCEPT_NAME           character varying(255),
+  NOTE                   text
+);
+\copy TEMP_CLOSURE_PATCHES FROM 'condition-closure-patches.csv' CSV HEADER
+
+INSERT INTO LU_CONDITION_CLOSURE (SEED_CONCEPT_ID, CONDITION_CONCEPT_ID, CONDITION_CONCEPT_NAME, CONCEPT_ID, CONCEPT_NAME)
+SELECT NULL, CONDITION_CONCEPT_ID, CONDITION_CONCEPT_NAME, CONCEPT_ID, CONCEPT_NAME
+FROM TEMP_CLOSURE_PATCHES;
+
+COMMIT;
+
+ANALYZE LU_CLOSURE_SEEDS;
+ANALYZE LU_CONDITION_CLOSURE;
+ANALYZE LU_DRUG_INGREDIENT;
+
+\echo 'Alter statements'
+
+---- !!!! UNCOMMENT THESE PERMISSIONS FOR RELEASE !!!!
+-- ALTER TABLE LU_CONDITION_CLOSURE  OWNER TO rich;
+-- ALTER TABLE LU_DRUG_INGREDIENT  OWNER TO rich;
+-- ALTER TABLE LU_CLOSURE_SEEDS  OWNER TO rich;
+
+---- !!!! UNCOMMENT THESE PERMISSIONS FOR DEVELOPMENT !!!!
+ALTER TABLE LU_CONDITION_CLOSURE  OWNER TO rdb20;
+ALTER TABLE LU_DRUG_INGREDIENT  OWNER TO rdb20;
+ALTER TABLE LU_CLOSURE_SEEDS  OWNER TO rdb20;
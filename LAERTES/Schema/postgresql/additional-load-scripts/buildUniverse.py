@@ -0,0 +1,90 @@
+# buildUniverse.py
+#
+# Run the scripts that build the LAERTES UNIVERSE tables (CATEGORY 2
+# in README.md) with psql, in order, and report how long each step
+# takes. A step is the part of a script after one of its \echo lines.
+#
+#   VOCABULARY_CLOSURE.sql - expands the conditions and drugs that are
+#                            new since the last run
+#   CONDITIONS_AND_CHILDREN_CONDITIONS.sql
+#   CONDITION_UNIVERSE.sql
+#   DRUG_UNIVERSE.sql
+#
+# USAGE (from this folder): python buildUniverse.py [--rebuild]
+#
+#   --rebuild drops the tables of VOCABULARY_CLOSURE.sql first so that
+#   every condition and drug is expanded again. Use it after loading a
+#   new release of the vocabulary.
+#
+# The database is read from DB_CONNECTION_INFO (the same format as for
+# mergeCountsFromIntegratedSources.py).
+
+import sys, os, time, argparse, subprocess
+
+## Development
+DB_CONNECTION_INFO="../db-connection-development.conf"
+
+## Release
+#DB_CONNECTION_INFO="../db-connection.conf"
+
+SCRIPTS = ["VOCABULARY_CLOSURE.sql",
+           "CONDITIONS_AND_CHILDREN_CONDITIONS.sql",
+           "CONDITION_UNIVERSE.sql",
+           "DRUG_UNIVERSE.sql"]
+CLOSURE_TABLES = ["LU_CLOSURE_SEEDS", "LU_CONDITION_CLOSURE", "LU_DRUG_INGREDIENT"]
+
+parser = argparse.ArgumentParser(description="Build the LAERTES UNIVERSE tables and time each step")
+parser.add_argument("--rebuild", action="store_true", help="drop %s first (after loading a new release of the vocabulary)" % ", ".join(CLOSURE_TABLES))
+args = parser.parse_args()
+
+f = open(DB_CONNECTION_INFO,'r')
+(db,user,pword,host,port) = f.readline().strip().split("\t")
+f.close()
+
+env = dict(os.environ)
+env["PGPASSWORD"] = pword
+PSQL = ["psql", "-X", "-q", "-v", "ON_ERROR_STOP=1", "-h", host, "-p", port, "-U", user, "-d", db]
+
+# Run psql with the given arguments. Returns [(step, seconds)]. With
+# -q, the only output on stdout is from \echo, so each line starts a
+# new step. Messages from the server (NOTICE, ERROR) are prefixed with
+# 'psql:' and are passed through.
+def runPsql(label, psqlArgs):
+    stepL = []
+    step = label
+    start = time.time()
+    p = subprocess.Popen(PSQL + psqlArgs, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    for line in iter(p.stdout.readline, ""):
+        line = line.rstrip("\n")
+        if line.startswith("psql:"):
+            print line
+            continue
+        now = time.time()
+        stepL.append((step, now - start))
+        print "INFO: %s: %-40s %8.1f s" % (label, step, now - start)
+        (step, start) = (line, now)
+    p.wait()
+    now = time.time()
+    stepL.append((step, now - start))
+    print "INFO: %s: %-40s %8.1f s" % (label, step, now - start)
+    if p.returncode != 0:
+        print "ERROR: psql failed on %s (exit code %d). See the messages above." % (label, p.returncode)
+        sys.exit(1)
+    return stepL
+
+timingL = []
+if args.rebuild:
+    timingL.append(("drop closure tables", runPsql("drop closure tables", ["-c", "DROP TABLE IF EXISTS %s" % ", ".join(CLOSURE_TABLES)])))
+for script in SCRIPTS:
+    print "INFO: running %s" % script
+    timingL.append((script, runPsql(script, ["-f", script])))
+
+print "INFO: time per step"
+total = 0.0
+for (label, stepL) in timingL:
+    scriptTotal = sum([seconds for (step, seconds) in stepL])
+    print "%-40s %8.1f s" % (label, scriptTotal)
+    for (step, seconds) in stepL:
+        print "    %-36s %8.1f s" % (step, seconds)
+    total += scriptTotal
+print "%-40s %8.1f s" % ("TOTAL", total)
@@ -0,0 +1,252 @@
+## evidenceLoader.py
+##
+## Load the merged evidence straight into the drug_HOI_evidence,
+## drug_HOI_relationship, and drug_HOI_evidence_view tables (used by
+## 'mergeCountsFromIntegratedSources.py --load').
+##
+## The rows are streamed with COPY FROM STDIN into staging tables that
+## are created next to the current tables. The keys and foreign keys
+## are added to the staging tables once they are loaded and the
+## staging tables are then swapped in for the current tables in one
+## short transaction, so the current tables stay usable until the new
+## data is complete and a failed load leaves them untouched. Run
+## REBUILD_SCRIPT afterwards to rebuild LAERTES_SUMMARY.
+##
+## The schema (in particular evidence_sources) has to have been created
+## with ohdsiTest3.psql before the first load.
+##
+## For 'mergeCountsFromIntegratedSources.py --incremental', the rows of
+## the sources that changed are copied into temporary tables instead
+## and applyDelta replaces the rows of those sources (by
+## evidence_source_code_id) in the current tables in one transaction.
+
+import sys
+
+import evidenceView
+
+EVIDENCE_TABLE = "drug_HOI_evidence"
+RELATIONSHIP_TABLE = "drug_HOI_relationship"
+VIEW_TABLE = evidenceView.VIEW_TABLE
+STAGING_SUFFIX = "_staging"
+DELTA_PREFIX = "laertes_new_" # temporary tables for --incremental
+REBUILD_SCRIPT = "buildViewsAndSummary.psql"
+
+# same definitions and COPY options as in ohdsiTest3.psql. The keys
+# are added after loading (see swapInStagingTables).
+STAGING_TABLE_DEFINITIONS = [
+    (RELATIONSHIP_TABLE, """(
+    id varchar(50),
+    drug integer,
+    RxNorm_drug text,
+    HOI integer,
+    SNOMED_HOI text
+)"""),
+    (EVIDENCE_TABLE, """(
+    id integer,
+    drug_HOI_relationship text,
+    evidence_type text,
+    supports boolean,
+    evidence_source_code_id integer ,
+    statistic_value numeric,
+    evidence_linkout text,
+    statistic_type text
+)"""),
+    (VIEW_TABLE, evidenceView.VIEW_TABLE_DEFINITION)]
+DELTA_TABLES = [RELATIONSHIP_TABLE, EVIDENCE_TABLE] # the tables that --incremental copies rows into
+
+COPY_OPTIONS = {RELATIONSHIP_TABLE:"DELIMITER '|' CSV",
+                EVIDENCE_TABLE:"DELIMITER E'\\t' NULL E'\\\\N' CSV",
+                VIEW_TABLE:"DELIMITER E'\\t' NULL E'\\\\N' CSV"}
+
+# constraints as (table, name in the staging table, name after the
+# swap, definition). Index names have to be unique in the schema so
+# primary keys are renamed during the swap.
+CONSTRAINTS = [
+    (RELATIONSHIP_TABLE, "drug_hoi_relationship_staging_pkey", "drug_hoi_relationship_pkey", "PRIMARY KEY (id)"),
+    (EVIDENCE_TABLE, "drug_hoi_evidence_staging_pkey", "drug_hoi_evidence_pkey", "PRIMARY KEY (id)"),
+    (EVIDENCE_TABLE, "drug_hoi_evidence_drug_hoi_relationship_fkey", "drug_hoi_evidence_drug_hoi_relationship_fkey", "FOREIGN KEY (drug_HOI_relationship) REFERENCES %s%s (id)" % (RELATIONSHIP_TABLE, STAGING_SUFFIX)),
+    (EVIDENCE_TABLE, "drug_hoi_evidence_evidence_source_code_id_fkey", "drug_hoi_evidence_evidence_source_code_id_fkey", "FOREIGN KEY (evidence_source_code_id) REFERENCES evidence_sources (id)"),
+    (VIEW_TABLE, "drug_hoi_evidence_view_staging_pkey", "drug_hoi_evidence_view_pkey", "PRIMARY KEY (id)")]
+
+# A read-only file object over an iterator of strings so that rows can
+# be passed to cursor.copy_expert as they are produced
+class IteratorFile(object):
+    def __init__(self, strIter):
+        self.strIter = iter(strIter)
+        self.buf = ""
+
+    def read(self, size=-1):
+        partL = [self.buf]
+        n = len(self.buf)
+        while size < 0 or n < size:
+            try:
+                s = self.strIter.next()
+            except StopIteration:
+                break
+            partL.append(s)
+            n += len(s)
+        buf = "".join(partL)
+        if size < 0:
+            size = len(buf)
+        self.buf = buf[size:]
+        return buf[:size]
+
+    def readline(self, size=-1):
+        return self.read(size)
+
+def execute(conn, statementL, errorMsg):
+    cur = conn.cursor()
+    try:
+        for statement in statementL:
+            cur.execute(statement)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print "ERROR: %s. The current %s and %s tables were not changed. Error string: %s" % (errorMsg, EVIDENCE_TABLE, RELATIONSHIP_TABLE, e)
+        sys.exit(1)
+
+def createStagingTables(conn):
+    statementL = []
+    for (table, definition) in reversed(STAGING_TABLE_DEFINITIONS):
+        statementL.append("DROP TABLE IF EXISTS %s%s" % (table, STAGING_SUFFIX))
+    for (table, definition) in STAGING_TABLE_DEFINITIONS:
+        statementL.append("CREATE TABLE %s%s %s" % (table, STAGING_SUFFIX, definition))
+    execute(conn, statementL, "unable to create the staging tables")
+
+def stagingTable(table):
+    return table + STAGING_SUFFIX
+
+def deltaTable(table):
+    return DELTA_PREFIX + table
+
+# Copy the rows (strings in the format of the data files written by
+# mergeCountsFromIntegratedSources.py) for table into targetTable
+# (stagingTable(table) or deltaTable(table)). The delta tables are
+# temporary so their rows are not committed until applyDelta.
+def copyRows(conn, table, rowIter, targetTable=None):
+    if targetTable == None:
+        targetTable = stagingTable(table)
+    cur = conn.cursor()
+    print "INFO: copying rows into %s" % targetTable
+    try:
+        cur.copy_expert("COPY %s FROM STDIN WITH %s" % (targetTable, COPY_OPTIONS[table]), IteratorFile(rowIter))
+        if targetTable == stagingTable(table):
+            conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print "ERROR: unable to copy rows into %s. The current %s and %s tables were not changed. Error string: %s" % (targetTable, EVIDENCE_TABLE, RELATIONSHIP_TABLE, e)
+        sys.exit(1)
+
+# Statements that give toTable the column comments and privileges of
+# fromTable (if it exists) since these are set in ohdsiTest3.psql
+def copyCommentsAndPrivileges(conn, fromTable, toTable):
+    cur = conn.cursor()
+    statementL = []
+    cur.execute("""
+SELECT a.attname, d.description
+FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+  JOIN pg_attribute a ON a.attrelid = c.oid
+  JOIN pg_description d ON d.objoid = c.oid AND d.objsubid = a.attnum
+WHERE c.relname = %s AND n.nspname = current_schema()
+""", (fromTable.lower(),))
+    for (column, description) in cur.fetchall():
+        statementL.append(cur.mogrify("COMMENT ON COLUMN " + toTable + "." + column + " IS %s", (description,)))
+
+    cur.execute("""
+SELECT grantee, privilege_type
+FROM information_schema.role_table_grants
+WHERE table_name = %s AND table_schema = current_schema()
+""", (fromTable.lower(),))
+    for (grantee, privilege) in cur.fetchall():
+        if grantee != "PUBLIC":
+            grantee = '"%s"' % grantee
+        statementL.append("GRANT %s ON %s TO %s" % (privilege, toTable, grantee))
+    return statementL
+
+# Add the keys to the staging tables and swap them in for the current
+# tables
+def swapInStagingTables(conn):
+    print "INFO: adding keys to the staging tables"
+    statementL = []
+    for (table, stagingName, name, definition) in CONSTRAINTS:
+        statementL.append("ALTER TABLE %s%s ADD CONSTRAINT %s %s" % (table, STAGING_SUFFIX, stagingName, definition))
+    for (name, column) in evidenceView.VIEW_INDEXES:
+        statementL.append("CREATE INDEX %s_staging ON %s (%s)" % (name, stagingTable(VIEW_TABLE), column))
+    for (table, definition) in STAGING_TABLE_DEFINITIONS:
+        statementL.append("ANALYZE %s" % stagingTable(table))
+    execute(conn, statementL, "unable to add keys to the staging tables (see the rows loaded into the %s tables)" % STAGING_SUFFIX)
+
+    print "INFO: swapping in the staging tables"
+    statementL = []
+    for (table, definition) in STAGING_TABLE_DEFINITIONS:
+        statementL += copyCommentsAndPrivileges(conn, table, table + STAGING_SUFFIX)
+    if isMaterializedView(conn):
+        statementL.append("DROP MATERIALIZED VIEW %s" % VIEW_TABLE) # built by earlier versions of REBUILD_SCRIPT
+    for (table, definition) in reversed(STAGING_TABLE_DEFINITIONS):
+        statementL.append("DROP TABLE IF EXISTS %s" % table)
+    for (table, definition) in STAGING_TABLE_DEFINITIONS:
+        statementL.append("ALTER TABLE %s%s RENAME TO %s" % (table, STAGING_SUFFIX, table))
+    for (table, stagingName, name, definition) in CONSTRAINTS:
+        if name != stagingName:
+            statementL.append("ALTER TABLE %s RENAME CONSTRAINT %s TO %s" % (table, stagingName, name))
+    for (name, column) in evidenceView.VIEW_INDEXES:
+        statementL.append("ALTER INDEX %s_staging RENAME TO %s" % (name, name))
+    execute(conn, statementL, "unable to swap in the staging tables")
+
+# True if drug_HOI_evidence_view is still the materialized view built
+# by earlier versions of REBUILD_SCRIPT
+def isMaterializedView(conn):
+    cur = conn.cursor()
+    cur.execute("SELECT 1 FROM pg_matviews WHERE matviewname = %s AND schemaname = current_schema()", (VIEW_TABLE.lower(),))
+    return len(cur.fetchall()) > 0
+
+######################################################################
+## --incremental
+######################################################################
+
+# The 'id' to give the first new evidence row
+def nextEvidenceId(conn):
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT COALESCE(MAX(id) + 1, 0) FROM %s" % EVIDENCE_TABLE)
+    except Exception as e:
+        print "ERROR: unable to query %s. Run a full --load first. Error string: %s" % (EVIDENCE_TABLE, e)
+        sys.exit(1)
+    return cur.fetchall()[0][0]
+
+def createDeltaTables(conn):
+    statementL = []
+    for table in DELTA_TABLES:
+        statementL.append("CREATE TEMP TABLE %s (LIKE %s)" % (deltaTable(table), table))
+    cur = conn.cursor()
+    try:
+        for statement in statementL:
+            cur.execute(statement)
+    except Exception as e:
+        conn.rollback()
+        print "ERROR: unable to create the temporary tables for the new rows. Error string: %s" % e
+        sys.exit(1)
+
+# Replace the evidence rows with the given evidence_source_code_ids by
+# the rows in the delta tables, adding the drug-HOI relationships that
+# are new, removing those that no longer have any evidence, and
+# rebuilding the drug_HOI_evidence_view rows of the relationships
+# whose evidence changed
+def applyDelta(conn, codeIdL):
+    print "INFO: replacing the rows of %s with evidence_source_code_id in %s" % (EVIDENCE_TABLE, codeIdL)
+    cur = conn.cursor()
+    statementL = ["CREATE TEMP TABLE laertes_changed_keys (id varchar(50))",
+                  cur.mogrify("WITH d AS (DELETE FROM " + EVIDENCE_TABLE + " WHERE evidence_source_code_id = ANY(%s) RETURNING drug_HOI_relationship) INSERT INTO laertes_changed_keys SELECT DISTINCT drug_HOI_relationship FROM d", (codeIdL,)),
+                  "INSERT INTO laertes_changed_keys SELECT DISTINCT drug_HOI_relationship FROM %s" % deltaTable(EVIDENCE_TABLE),
+                  "INSERT INTO %s SELECT n.* FROM %s n WHERE NOT EXISTS (SELECT 1 FROM %s r WHERE r.id = n.id)" % (RELATIONSHIP_TABLE, deltaTable(RELATIONSHIP_TABLE), RELATIONSHIP_TABLE),
+                  "INSERT INTO %s SELECT * FROM %s" % (EVIDENCE_TABLE, deltaTable(EVIDENCE_TABLE)),
+                  "DELETE FROM %s r USING laertes_changed_keys k WHERE r.id = k.id AND NOT EXISTS (SELECT 1 FROM %s e WHERE e.drug_HOI_relationship = r.id)" % (RELATIONSHIP_TABLE, EVIDENCE_TABLE)]
+    if isMaterializedView(conn):
+        print "WARNING: %s is still a materialized view. Run this script with --load to replace it with the %s table." % (VIEW_TABLE, VIEW_TABLE)
+        statementL.append("REFRESH MATERIALIZED VIEW %s" % VIEW_TABLE)
+    else:
+        statementL += evidenceView.refreshStatements("laertes_changed_keys", RELATIONSHIP_TABLE, EVIDENCE_TABLE)
+    for table in DELTA_TABLES:
+        statementL.append("DROP TABLE %s" % deltaTable(table))
+    statementL.append("DROP TABLE laertes_changed_keys")
+    execute(conn, statementL, "unable to apply the new rows")
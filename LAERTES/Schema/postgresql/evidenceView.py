@@ -0,0 +1,115 @@
+## evidenceView.py
+##
+## drug_HOI_evidence_view has one row per drug-HOI relationship with
+## the statistic and the linkout of each type of evidence in columns of
+## their own. It used to be a materialized view that pivoted
+## drug_HOI_evidence with several crosstab() queries. It is now a table
+## built from the evidence rows as mergeCountsFromIntegratedSources.py
+## merges them (see EvidencePivot) and loaded with COPY like the other
+## tables.
+##
+## A column gets the value of the evidence row of the relationship
+## with its evidence_type, supports value, and one of its
+## evidence_source_code_ids (the same filters as the crosstab
+## queries). If a relationship has more than one such row (e.g., two
+## HOIs of a source that map to the same SNOMED HOI), the one merged
+## last is used.
+
+VIEW_TABLE = "drug_HOI_evidence_view"
+VIEW_DATA_FILE = "drug-hoi-evidence-view.tsv"
+
+# Enum for the fields of the merged evidence rows (without 'id')
+(KEY,EVIDENCE_TYPE,SUPPORTS,EV_SOURCE_ID,STATISTIC,LINKOUT,STATISTIC_TYPE) = range(0,7)
+
+# 'supports' as written in the merged evidence rows
+(SUPPORTS_TRUE,SUPPORTS_NULL,SUPPORTS_FALSE) = ("true","\\N","false")
+SUPPORTS_SQL = {SUPPORTS_TRUE:"IS TRUE", SUPPORTS_NULL:"IS NULL", SUPPORTS_FALSE:"IS FALSE"}
+FIELD_COLUMNS = {STATISTIC:"statistic_value", LINKOUT:"evidence_linkout"}
+
+POSITIVE_SOURCE_IDS = ("1","5","9","10","11","12","14")
+NULL_SOURCE_IDS = ("6","7","8")
+NEGATIVE_SOURCE_IDS = ("9","10","11")
+
+# (column, type, evidence_type, supports, evidence_source_code_ids,
+# field) in the column order of the crosstab view
+PIVOT_COLUMNS = [
+    ("aers_report_count", "integer", "aers_report_count", SUPPORTS_TRUE, POSITIVE_SOURCE_IDS, STATISTIC),
+    ("aers_report_PRR", "numeric", "aers_report_prr", SUPPORTS_TRUE, POSITIVE_SOURCE_IDS, STATISTIC),
+    ("ctd_chemical_disease_count", "integer", "CTD_ChemicalDisease", SUPPORTS_TRUE, POSITIVE_SOURCE_IDS, STATISTIC),
+    ("medline_semmed_clin_trial_count", "integer", "MEDLINE_SemMedDB_ClinTrial", SUPPORTS_TRUE, POSITIVE_SOURCE_IDS, STATISTIC),
+    ("medline_semmed_case_report_count", "integer", "MEDLINE_SemMedDB_CR", SUPPORTS_TRUE, POSITIVE_SOURCE_IDS, STATISTIC),
+    ("medline_semmed_other_count", "integer", "MEDLINE_SemMedDB_Other", SUPPORTS_TRUE, POSITIVE_SOURCE_IDS, STATISTIC),
+    ("spl_eu_spc_count", "integer", "SPL_EU_SPC", SUPPORTS_TRUE, POSITIVE_SOURCE_IDS, STATISTIC),
+    ("spl_splicer_count", "integer", "SPL_SPLICER_ADR", SUPPORTS_TRUE, POSITIVE_SOURCE_IDS, STATISTIC),
+    ("medline_mesh_clin_trial_count", "integer", "MEDLINE_MeSH_ClinTrial", SUPPORTS_NULL, NULL_SOURCE_IDS, STATISTIC),
+    ("medline_mesh_case_report_count", "integer", "MEDLINE_MeSH_CR", SUPPORTS_NULL, NULL_SOURCE_IDS, STATISTIC),
+    ("medline_mesh_other_count", "integer", "MEDLINE_MeSH_Other", SUPPORTS_NULL, NULL_SOURCE_IDS, STATISTIC),
+    ("neg_medline_semmed_clin_trial_count", "integer", "MEDLINE_SemMedDB_ClinTrial", SUPPORTS_FALSE, NEGATIVE_SOURCE_IDS, STATISTIC),
+    ("neg_medline_semmed_case_report_count", "integer", "MEDLINE_SemMedDB_CR", SUPPORTS_FALSE, NEGATIVE_SOURCE_IDS, STATISTIC),
+    ("neg_medline_semmed_other_count", "integer", "MEDLINE_SemMedDB_Other", SUPPORTS_FALSE, NEGATIVE_SOURCE_IDS, STATISTIC),
+    ("aers_report_count_link", "text", "aers_report_count", SUPPORTS_TRUE, POSITIVE_SOURCE_IDS, LINKOUT),
+    ("aers_report_PRR_link", "text", "aers_report_prr", SUPPORTS_TRUE, POSITIVE_SOURCE_IDS, LINKOUT),
+    ("ctd_chemical_disease_link", "text", "CTD_ChemicalDisease", SUPPORTS_TRUE, POSITIVE_SOURCE_IDS, LINKOUT),
+    ("medline_semmed_clin_trial_link", "text", "MEDLINE_SemMedDB_ClinTrial", SUPPORTS_TRUE, POSITIVE_SOURCE_IDS, LINKOUT),
+    ("medline_semmed_case_report_link", "text", "MEDLINE_SemMedDB_CR", SUPPORTS_TRUE, POSITIVE_SOURCE_IDS, LINKOUT),
+    ("medline_semmed_other_link", "text", "MEDLINE_SemMedDB_Other", SUPPORTS_TRUE, POSITIVE_SOURCE_IDS, LINKOUT),
+    ("spl_eu_spc_link", "text", "SPL_EU_SPC", SUPPORTS_TRUE, POSITIVE_SOURCE_IDS, LINKOUT),
+    ("spl_splicer_link", "text", "SPL_SPLICER_ADR", SUPPORTS_TRUE, POSITIVE_SOURCE_IDS, LINKOUT),
+    ("medline_mesh_clin_trial_link", "text", "MEDLINE_MeSH_ClinTrial", SUPPORTS_NULL, NULL_SOURCE_IDS, LINKOUT),
+    ("medline_mesh_case_report_link", "text", "MEDLINE_MeSH_CR", SUPPORTS_NULL, NULL_SOURCE_IDS, LINKOUT),
+    ("medline_mesh_other_link", "text", "MEDLINE_MeSH_Other", SUPPORTS_NULL, NULL_SOURCE_IDS, LINKOUT),
+    ("neg_medline_semmed_clin_trial_link", "text", "MEDLINE_SemMedDB_ClinTrial", SUPPORTS_FALSE, NEGATIVE_SOURCE_IDS, LINKOUT),
+    ("neg_medline_semmed_case_report_link", "text", "MEDLINE_SemMedDB_CR", SUPPORTS_FALSE, NEGATIVE_SOURCE_IDS, LINKOUT),
+    ("neg_medline_semmed_other_report_link", "text", "MEDLINE_SemMedDB_Other", SUPPORTS_FALSE, NEGATIVE_SOURCE_IDS, LINKOUT)]
+
+RELATIONSHIP_COLUMNS = [("id", "varchar(50)"), ("drug", "integer"), ("RxNorm_drug", "text"), ("HOI", "integer"), ("SNOMED_HOI", "text")]
+
+# same definition as in ohdsiTest3.psql
+VIEW_TABLE_DEFINITION = "(\n%s\n)" % ",\n".join(["    %s %s" % (column, columnType) for (column, columnType) in RELATIONSHIP_COLUMNS] +
+                                                  ["    %s %s" % (column, columnType) for (column, columnType, evType, supports, sourceIdL, field) in PIVOT_COLUMNS])
+
+# indexes as (name, column). The WebAPI looks up rows by drug and HOI.
+VIEW_INDEXES = [("drug_hoi_evidence_view_drug_idx", "drug"),
+                ("drug_hoi_evidence_view_hoi_idx", "HOI")]
+
+class EvidencePivot(object):
+    def __init__(self):
+        # (evidence_type, supports, evidence_source_code_id) -> [(column index, field)]
+        self.targetD = {}
+        for (i, (column, columnType, evType, supports, sourceIdL, field)) in enumerate(PIVOT_COLUMNS):
+            for sourceId in sourceIdL:
+                self.targetD.setdefault((evType, supports, sourceId), []).append((i, field))
+        self.valuesD = {} # drug-HOI key -> {column index: value}
+
+    # Pass the merged evidence rows (without 'id') through, recording
+    # the values that go into the view
+    def collect(self, rowIter):
+        for row in rowIter:
+            tpl = row.rstrip("\n").split("\t")
+            targetL = self.targetD.get((tpl[EVIDENCE_TYPE], tpl[SUPPORTS], tpl[EV_SOURCE_ID]))
+            if targetL != None:
+                valueD = self.valuesD.setdefault(tpl[KEY], {})
+                for (i, field) in targetL:
+                    valueD[i] = tpl[field]
+            yield row
+
+    # A row of VIEW_DATA_FILE (in the format of the evidence data file)
+    # from the fields of a drug_HOI_relationship row
+    def viewRow(self, relationshipFieldL):
+        valueD = self.valuesD.get(relationshipFieldL[0], {})
+        return "\t".join(relationshipFieldL + [valueD.get(i, "\\N") for i in range(len(PIVOT_COLUMNS))]) + "\n"
+
+# Statements that rebuild the rows of the drug-HOI relationships with
+# an 'id' in keyTable from drug_HOI_evidence (used by --incremental).
+# The row with the highest 'id' is the one merged last. Each column
+# takes the value of the newest evidence row matching its condition:
+# the rows that match sort first (without FILTER, which needs
+# PostgreSQL 9.4).
+def refreshStatements(keyTable, relationshipTable, evidenceTable):
+    selectL = ["r.%s" % column for (column, columnType) in RELATIONSHIP_COLUMNS]
+    for (column, columnType, evType, supports, sourceIdL, field) in PIVOT_COLUMNS:
+        condition = "e.evidence_type = '%s' AND e.supports %s AND e.evidence_source_code_id IN (%s)" % (evType, SUPPORTS_SQL[supports], ",".join(sourceIdL))
+        selectL.append("CAST((array_agg(CASE WHEN %s THEN e.%s END ORDER BY (%s) IS TRUE DESC, e.id DESC))[1] AS %s)" % (condition, FIELD_COLUMNS[field], condition, columnType))
+    return ["DELETE FROM %s v USING %s k WHERE v.id = k.id" % (VIEW_TABLE, keyTable),
+            "INSERT INTO %s SELECT %s FROM %s r JOIN (SELECT DISTINCT id FROM %s) k ON k.id = r.id LEFT JOIN %s e ON e.drug_HOI_relationship = r.id GROUP BY %s" % (VIEW_TABLE, ", ".join(selectL), relationshipTable, keyTable, evidenceTable, ", ".join(["r.%s" % column for (column, columnType) in RELATIONSHIP_COLUMNS])),
+            "ANALYZE %s" % VIEW_TABLE]
@@ -7,9 +7,12 @@
 ## Author: Richard D Boyce, PhD
 ## 2014 - 2016
 
-import sys
+import sys, os, argparse, itertools, hashlib
+import cStringIO, multiprocessing
 import psycopg2 # for postgres 
 
+import evidenceLoader, evidenceView
+
 ## Development
 DB_CONNECTION_INFO="db-connection-development.conf"
 
@@ -18,10 +21,18 @@ DB_CONNECTION_INFO="db-connection-development.conf"
 
 SOURCE_LISTING_FILE="integratedSources.conf"
 DRUG_HOI_DATA_FILE="drug-hoi-evidence-data.tsv"
-CACHED_DRUG_HOI_RELATIONSHIP_FILE="cached_uniq_drug_hoi_relationships.csv"
+CACHED_DRUG_HOI_RELATIONSHIP_FILE="cached_uniq_drug_hoi_relationships.csv" # concept labels from runs of earlier versions of this script (read if present)
+CONCEPT_LABEL_CACHE_FILE="cached_concept_labels.tsv" # concept id -> label, maintained by this script
 DRUG_HOI_RELATIONSHIP_FILE="uniq_drug_hoi_relationships.csv"
 MEDDRA_TO_SNOMED_MAPPING_FILE="../../terminology-mappings/MedDRA-to-SNOMED/LU_MEDDRAPT_TO_SNOMED.txt"
 MESH_TO_SNOMED_MAPPING_FILE="../../terminology-mappings/StandardVocabToMeSH/mesh-to-standard-vocab-v5.txt"
+SOURCE_STATE_FILE="integratedSources.state" # content hash and evidence_source_code_ids of each source as of the last --load or --incremental run
+
+parser = argparse.ArgumentParser(description="Merge the drug-HOI evidence of the sources listed in %s into data files for the drug_HOI_evidence, drug_HOI_relationship, and drug_HOI_evidence_view tables" % SOURCE_LISTING_FILE)
+parser.add_argument("--workers", type=int, default=1, help="number of worker processes. Each source is read by one worker (default: 1)")
+parser.add_argument("--load", action="store_true", help="instead of writing %s, %s, and %s, copy the data straight into new drug_HOI_evidence, drug_HOI_relationship, and drug_HOI_evidence_view tables and swap them in for the current ones when complete" % (DRUG_HOI_DATA_FILE, DRUG_HOI_RELATIONSHIP_FILE, evidenceView.VIEW_DATA_FILE))
+parser.add_argument("--incremental", action="store_true", help="only merge the sources whose content changed since the last --load or --incremental run (see %s) and replace their rows in the current drug_HOI_evidence and drug_HOI_relationship tables" % SOURCE_STATE_FILE)
+args = parser.parse_args()
 
 # load the meddra to snomed mapping
 meddra_to_snomed_mapping_d = {}
@@ -82,34 +93,21 @@ f.close()
 srcL = [x.strip().split("\t") for x in buf.split("\n")]
 print "INFO: Source data locations:\n\t%s" % srcL
 
-## iterate through each source and write the data to go into
-## drug_hoi_evidence Map the HOI concepts to SNOMED if not already
-## done by the source. Use the local mapping file first, then try to
-## query for the mapping.
-##
-cntr = 0 # serves as an unique key for the output table ('id')
-drugHoiDataOutF = open(DRUG_HOI_DATA_FILE,'w')
-dhKeyD = {} # used to accumulate all drug-HOI keys so that the drug-hoi relationship table can be created
-idToSnomedD = {} # cache for mesh or meddra to snomed mapping. The
-                 # coding systems use distinct patterns for CUIs so it
-                 # should be safe to combine them into one dictionary
-noMappingFoundD = {} # stores concept ids that cannot be mapped by any
-                     # method to prevent repetitive querying
-(B_CONCEPT_ID, B_CONCEPT_NAME, B_CONCEPT_CODE, A_CONCEPT_NAME, A_CONCEPT_CODE) = range(0,5) # enum for vocab query results
-for src in srcL[1:]: # skip header
-    print "INFO: loading source: %s" % src[0]
-    try:
-        f = open(src[PATH_TO_DATA], 'r')
-        buf = f.read().strip()
-        dhL = [x.strip() for x in buf.split("\n")]
-        f.close()
-    except Exception as e:
-        print "ERROR: unable to open data file for source %s located at %s. Error string: %s" % (src[SOURCE],src[PATH_TO_DATA],e)
-        sys.exit(1)
-        
+## Stream the records of a source's data file. Mirrors the original
+## parsing: 'positive'/'negative' become the bool values expected for
+## 'modality', records with NULLs are skipped, and reading stops at
+## the first line that is not a record. Raises IOError if the file
+## cannot be read (see runPerSource).
+def sourceRecords(src):
+    f = open(src[PATH_TO_DATA], 'r')
     # TODO: write validation checks for the data files to be loaded (e.g., col number, types, etc)
-    #for elt in dhL[0:10]:
-    for elt in dhL:    
+    started = False
+    for elt in f:
+        elt = elt.strip()
+        if not started and elt == "":
+            continue # skip leading blank lines
+        started = True
+
         # the schema calls for a bool type for 'modality'
         s = elt.replace("positive","true").replace("negative","false") 
 
@@ -121,240 +119,557 @@ for src in srcL[1:]: # skip header
         tpl = s.split("\t")            
         if len(tpl) == 1:
             break
+        yield tpl
+    f.close()
 
-        if src[HOI_VOCAB_ID] == "Standard_Vocab":
-            drugHoiDataOutF.write("\t".join([str(cntr)] + tpl) + "\n")
-            cntr += 1
-            if not dhKeyD.has_key(tpl[KEY]):
-                (drug,hoi) = tpl[KEY].split("-")
-                dhKeyD[tpl[KEY]] = {'drug_id':drug, 'drug_label':None, 'hoi_id':hoi, 'hoi_label':None}
-                print "DRUG_RELATIONSHIP: %s|%s||%s|" % (tpl[KEY],drug,hoi) # something we can grep that we can load the partial drug relationship and evidence data if the script crashes         
-        elif src[HOI_VOCAB_ID] == "SNOMED":
-            drugHoiDataOutF.write("\t".join([str(cntr)] + tpl) + "\n")
-            cntr += 1
-            if not dhKeyD.has_key(tpl[KEY]):
-                (drug,hoi) = tpl[KEY].split("-")
-                dhKeyD[tpl[KEY]] = {'drug_id':drug, 'drug_label':None, 'hoi_id':hoi, 'hoi_label':None}
-                print "DRUG_RELATIONSHIP: %s|%s||%s|" % (tpl[KEY],drug,hoi) # something we can grep that we can load the partial drug relationship and evidence data if the script crashes 
-        else:
-            mixedMapped = False # used only if the mapping type is 'Mixed'
-            try:
-                (drug,hoi) = tpl[KEY].split("-")
-            except ValueError:
-                print "WARNING: could not split out drug and hoi from tpl[KEY]: %s" % tpl[KEY]
-                continue
-
-            if noMappingFoundD.has_key(hoi):
-                print "INFO: HOI concept id has already been found to be un-mappable at the present time %s" % hoi
-                continue
-            
-            mappingFound = False
-            
-            rows = []
-            if (mappingFound == False) and meddra_to_snomed_mapping_d.has_key(hoi):
-                mappingFound = True
-                rows = [[meddra_to_snomed_mapping_d[hoi][1],meddra_to_snomed_mapping_d[hoi][2],"","",meddra_to_snomed_mapping_d[hoi][0]]]
-                print "INFO: MedDRA concept id %s mapped to SNOMED HOI %s using local mapping" % (hoi,meddra_to_snomed_mapping_d[hoi][1])
-            
-            if (mappingFound == False) and idToSnomedD.has_key(hoi):
-                mappingFound = True
-                rows = idToSnomedD[hoi]
-                print "INFO: MedDRA concept id %s mapped to SNOMED HOI from cache"
-
-            if (mappingFound == False) and (src[HOI_VOCAB_ID] == "Mesh" or (src[HOI_VOCAB_ID] == "Mixed" and mixedMapped == False)):
-                try:
-                    print "INFO: Attempting to map concept id for Mesh coded HOI %s to SNOMED" % hoi
-                    cur.execute("""
-SELECT DISTINCT c2.CONCEPT_ID AS SNOMED_CONCEPT_ID, c2.concept_name AS SNOMED_CONCEPT_NAME, c2.concept_code AS SNOMED_CONCEPT_CODE, c1.concept_id AS MESH_CONCEPT_ID, c1.concept_name AS MESH_CONCEPT_NAME, c1.CONCEPT_CODE AS MESH_CONCEPT_CODE
-FROM concept c1 JOIN concept_relationship cr ON cr.concept_id_1 = c1.CONCEPT_ID
+######################################################################
+## Map the HOI concepts to SNOMED if not already done by the
+## source. Every distinct HOI of the sources that need mapping is
+## collected first and all of them are mapped with one query per
+## vocabulary so that the merge itself only needs dictionary lookups.
+######################################################################
+(B_CONCEPT_ID, B_CONCEPT_NAME, B_CONCEPT_CODE, A_CONCEPT_NAME, A_CONCEPT_CODE) = range(0,5) # enum for the mapping rows
+UNMAPPED_HOI_VOCABS = ["Standard_Vocab","SNOMED"] # HOI_VOCAB_IDs of sources that do not need mapping
+
+# Return a set of the (hoi, HOI_VOCAB_ID) pairs in a source that
+# needs mapping
+def collectSourceHois(src):
+    hoiVocabS = set()
+    if src[HOI_VOCAB_ID] in UNMAPPED_HOI_VOCABS:
+        return hoiVocabS
+    print "INFO: collecting the HOIs of source: %s" % src[SOURCE]
+    for tpl in sourceRecords(src):
+        try:
+            (drug,hoi) = tpl[KEY].split("-")
+        except ValueError:
+            continue # reported when the source is merged
+        hoiVocabS.add((hoi, src[HOI_VOCAB_ID]))
+    return hoiVocabS
+
+# The mapping queries. Each returns rows in the B_CONCEPT_ID ...
+# A_CONCEPT_CODE layout followed by the concept id of the HOI that
+# was mapped
+MESH_TO_SNOMED_QUERY = """
+SELECT DISTINCT c2.CONCEPT_ID AS SNOMED_CONCEPT_ID, c2.concept_name AS SNOMED_CONCEPT_NAME, c2.concept_code AS SNOMED_CONCEPT_CODE, c1.concept_name AS MESH_CONCEPT_NAME, c1.CONCEPT_CODE AS MESH_CONCEPT_CODE, c1.concept_id AS MESH_CONCEPT_ID
+FROM laertes_hoi_to_map h JOIN concept c1 ON c1.concept_id = h.concept_id
+  JOIN concept_relationship cr ON cr.concept_id_1 = c1.CONCEPT_ID
   JOIN CONCEPT c2 ON c2.CONCEPT_ID = cr.CONCEPT_ID_2
    AND c2.invalid_reason IS NULL
    AND c2.vocabulary_id = 'SNOMED'
    AND c2.concept_class_id = 'Clinical Finding'
-WHERE c1.concept_id = '%s'
+WHERE h.hoi_vocab_id IN ('Mesh','Mixed')
    AND c1.vocabulary_id = 'MeSH'
    AND c1.invalid_reason IS NULL
    AND cr.INVALID_REASON IS NULL
    AND c1.CONCEPT_CLASS_ID = 'Main Heading'
-""" % hoi)
-                except Exception as e:
-                    print "ERROR: Attempt to map concept id for Mesh HOI to SNOMED failed. Error string: %s" % e
-
-                rows = cur.fetchall()
-                if len(rows) == 0:
-                    print "WARNING: Attempt to map concept id for Mesh HOI %s to SNOMED failed because no mapping could be found in the standard vocabulary." % hoi
-                    if src[HOI_VOCAB_ID] == "Mixed":
-                        print "WARNING: this case will be tested for other vocabs"
-                    else:
-                        print "WARNING: this case will NOT be tested for other vocabs"
-                        noMappingFoundD[hoi] = None
-                        continue 
-                else:
-                    mappingFound == True
-                    if src[HOI_VOCAB_ID] == "Mixed":
-                        mixedMapped = True
-                        
-                    # cache hoi mapping 
-                    if not idToSnomedD.has_key(hoi):
-                        idToSnomedD[hoi] = rows
-
-            if (mappingFound == False) and (src[HOI_VOCAB_ID] == "MedDRA" or (src[HOI_VOCAB_ID] == "Mixed" and mixedMapped == False)):
-                try:
-                    print "INFO: Attempting to map concept id for MedDRA coded HOI '%s' to SNOMED" % hoi
-                    # The way this works is it tries to find the
-                    # SNOMED codes that have the closest relationship
-                    # to the MedDRA PT code.  We could expand this to
-                    # other MedDRA levels but it gets fuzzier.
-                    cur.execute("""
-SELECT z.SNOMED_CONCEPT_ID, z.SNOMED_CONCEPT_NAME, z.SNOMED_CONCEPT_CODE, z.MEDDRA_CONCEPT_NAME, z.MEDDRA_CONCEPT_CODE 
+ORDER BY MESH_CONCEPT_ID, SNOMED_CONCEPT_ID
+"""
+
+# The way this works is it tries to find the SNOMED codes that have
+# the closest relationship to the MedDRA PT code.  We could expand
+# this to other MedDRA levels but it gets fuzzier.
+MEDDRA_TO_SNOMED_QUERY = """
+SELECT z.SNOMED_CONCEPT_ID, z.SNOMED_CONCEPT_NAME, z.SNOMED_CONCEPT_CODE, z.MEDDRA_CONCEPT_NAME, z.MEDDRA_CONCEPT_CODE, z.MEDDRA_CONCEPT_ID
 FROM ( SELECT ca.max_levels_of_separation, ca.min_levels_of_separation, c.concept_id AS MEDDRA_CONCEPT_ID, c.concept_code AS MEDDRA_CONCEPT_CODE, c.concept_name AS MEDDRA_CONCEPT_NAME, c2.concept_id AS SNOMED_CONCEPT_ID, c2.concept_name AS SNOMED_CONCEPT_NAME, c2.concept_code AS SNOMED_CONCEPT_CODE, ROW_NUMBER() OVER(PARTITION BY c.CONCEPT_ID ORDER BY c.CONCEPT_ID, ca.min_levels_of_separation, ca.max_levels_of_separation, c.CONCEPT_ID, c2.CONCEPT_ID) AS ROW_NUM
-FROM CONCEPT c JOIN concept_ancestor ca ON ca.ancestor_concept_id = c.concept_id
+FROM (SELECT DISTINCT concept_id FROM laertes_hoi_to_map WHERE hoi_vocab_id IN ('MedDRA','Mixed')) h JOIN CONCEPT c ON c.concept_id = h.concept_id
+  JOIN concept_ancestor ca ON ca.ancestor_concept_id = c.concept_id
   JOIN CONCEPT c2 ON c2.concept_id = ca.descendant_concept_id
     AND c2.vocabulary_id = 'SNOMED'
     AND c2.CONCEPT_CLASS_ID = 'Clinical Finding'
     AND c2.INVALID_REASON IS NULL
-WHERE c.concept_id = '%s'
-AND c.vocabulary_id = 'MedDRA'
+WHERE c.vocabulary_id = 'MedDRA'
 -- AND c.concept_class_id = 'PT'
 AND c.INVALID_REASON IS NULL
 ) z
 WHERE z.ROW_NUM = 1
-""" % hoi)
-                except Exception as e:
-                    print "ERROR: Attempt to map concept id for MedDRA HOI to SNOMED failed. Error string: %s" % e
-                rows = cur.fetchall()
-                if len(rows) == 0:
-                    print "WARNING: Attempt to map concept id for MedDRA HOI %s to SNOMED failed because no mapping could be found in the standard vocabulary." % hoi
-                    if src[HOI_VOCAB_ID] == "Mixed":
-                        print "WARNING: this case will be tested for other vocabs"
-                    else:
-                        print "WARNING: this case will NOT be tested for other vocabs"
-                        noMappingFoundD[hoi] = None
-                        continue 
-                else:
-                    mappingFound == True
-                    
-                    if src[HOI_VOCAB_ID] == "Mixed":
-                        mixedMapped = True
-                        
-                    # cache hoi mapping 
-                    if not idToSnomedD.has_key(hoi):
-                        idToSnomedD[hoi] = rows
-
-            if (mappingFound == False) and ((src[HOI_VOCAB_ID] == "Mixed" and mixedMapped == False)):
-                try:
-                    print "INFO: Testing if coded HOI %s is already a SNOMED" % hoi
-                    cur.execute("""
-SELECT c1.CONCEPT_ID AS SNOMED_CONCEPT_ID, c1.concept_name AS SNOMED_CONCEPT_NAME, c1.concept_code AS SNOMED_CONCEPT_CODE
-FROM CONCEPT AS c1
-WHERE c1.invalid_reason IS NULL
+"""
+
+SNOMED_TEST_QUERY = """
+SELECT DISTINCT c1.CONCEPT_ID AS SNOMED_CONCEPT_ID, c1.concept_name AS SNOMED_CONCEPT_NAME, c1.concept_code AS SNOMED_CONCEPT_CODE, c1.concept_name, c1.concept_code, c1.concept_id
+FROM laertes_hoi_to_map h JOIN CONCEPT AS c1 ON c1.concept_id = h.concept_id
+WHERE h.hoi_vocab_id = 'Mixed'
+AND c1.invalid_reason IS NULL
 AND c1.vocabulary_id = 'SNOMED'
 AND c1.concept_class_id = 'Clinical Finding'
-AND c1.concept_id = %s
-""" % hoi)
-                except Exception as e:
-                    print "ERROR: Test if concept id is SNOMED failed. Error string: %s" % e                
-                rows = cur.fetchall()
-                if len(rows) == 0:
-                    print "WARNING: Test if concept id HOI %s is SNOMED failed. It's possible that the concept is not in SNOMED or that it's not a Clinical Finding or the concept is invalid according to the standard vocabulary." % hoi
-                    print "WARNING: There are no other tests for this concept: %s" % hoi
-                    noMappingFoundD[hoi] = None
-                    continue
-                
-                cntr += 1
-                if not dhKeyD.has_key(tpl[KEY]):
-                    dhKeyD[tpl[KEY]] = {'drug_id':drug, 'drug_label':None, 'hoi_id':hoi, 'hoi_label':None}
-                print "INFO: This concept from a Mixed source is SNOMED: %s" % hoi
-                continue
+"""
 
-            
-            for row in rows:
-                # write out results
-                snomedHoi = row[B_CONCEPT_ID]
-                print "INFO: mapped HOI concept id from %s (%s - %s : %s) to %s (SNOMED - %s : %s)" % (hoi, src[HOI_VOCAB_ID], row[A_CONCEPT_CODE], row[A_CONCEPT_NAME], snomedHoi, row[B_CONCEPT_CODE], row[B_CONCEPT_NAME])
-                tpl[KEY] = "%s-%s" % (drug, snomedHoi)
-                drugHoiDataOutF.write("\t".join([str(cntr)] + tpl) + "\n")
-                cntr += 1
-                if not dhKeyD.has_key(tpl[KEY]):
-                    dhKeyD[tpl[KEY]] = {'drug_id':drug, 'drug_label':None, 'hoi_id':snomedHoi, 'hoi_label':None}
-                    print "DRUG_RELATIONSHIP: %s|%s||%s|" % (tpl[KEY],drug,hoi) # something we can grep that we can load the partial drug relationship and evidence data if the script crashes 
-
-drugHoiDataOutF.close()
-
-## Now, create the data file for the drug-hoi relationship table
-capturedKeysD = {}
-capturedDrugsD = {}
-capturedHoisD = {}
-try:
-    f = open(CACHED_DRUG_HOI_RELATIONSHIP_FILE,'r') # use cached data from previous runs to save queries
-    buf = f.read().strip()
-    f.close()
-    cachedDhrL = [x.strip() for x in buf.split("\n")]
-    for elt in cachedDhrL:
-        if not elt:
-            break
+# Run one of the mapping queries and return a dictionary of the HOI
+# concept ids that it mapped -> [mapping rows]
+def runMappingQuery(cur, label, query):
+    print "INFO: Attempting to map concept ids for %s coded HOIs to SNOMED" % label
+    try:
+        cur.execute(query)
+    except Exception as e:
+        print "ERROR: Attempt to map concept ids for %s HOIs to SNOMED failed. Error string: %s" % (label,e)
+        sys.exit(1)
 
-        (k,dId,dLab,hqId,hLab) = elt.strip().split("|")
-        if dhKeyD.has_key(k):
-            capturedKeysD[k] = k
-            dhKeyD[k]['drug_label'] = dLab
-            dhKeyD[k]['hoi_label'] = hLab
-        
-            capturedDrugsD[dhKeyD[k]['drug_id']] = dhKeyD[k]['drug_label']
-            capturedHoisD[dhKeyD[k]['hoi_id']] = dhKeyD[k]['hoi_label']
-except IOError:
-    print "WARNING: Caught IOError exception indicating that the file %s does not exist. Proceeding without using cached concepts." % CACHED_DRUG_HOI_RELATIONSHIP_FILE
-
-print "INFO: number of cached keys: %d; number of keys needed: %d" % (len(capturedKeysD.keys()), len(dhKeyD.keys()))
-
-for key in dhKeyD.keys():
-    if capturedKeysD.has_key(key):
-        continue
-    
-    dLab = hLab = None
-    if capturedDrugsD.has_key(dhKeyD[key]['drug_id']):
-       dLab  = capturedDrugsD[dhKeyD[key]['drug_id']]
+    mappedD = {}
+    for row in cur.fetchall():
+        hoi = str(row[-1])
+        if not mappedD.has_key(hoi):
+            mappedD[hoi] = []
+        mappedD[hoi].append(row[:-1])
+    print "INFO: %d %s coded HOIs mapped to SNOMED" % (len(mappedD.keys()), label)
+    return mappedD
+
+# Return a dictionary (hoi, HOI_VOCAB_ID) -> [mapping rows] for the
+# pairs in hoiVocabS that can be mapped to SNOMED. The local MedDRA
+# mapping file is used first, then the standard vocabulary according
+# to the vocabulary of the source (Mixed sources try MeSH, MedDRA,
+# and then test if the concept is already SNOMED).
+def mapHoisToSnomed(cur, hoiVocabS):
+    print "INFO: loading %d distinct (HOI, vocabulary) pairs to be mapped to SNOMED" % len(hoiVocabS)
+    buf = cStringIO.StringIO()
+    for (hoi, vocab) in hoiVocabS:
+        if hoi.isdigit():
+            buf.write("%s\t%s\n" % (hoi, vocab))
+    buf.seek(0)
+    try:
+        cur.execute("CREATE TEMP TABLE laertes_hoi_to_map (concept_id INTEGER NOT NULL, hoi_vocab_id VARCHAR(20) NOT NULL)")
+        cur.copy_from(buf, "laertes_hoi_to_map", columns=("concept_id", "hoi_vocab_id"))
+        cur.execute("ANALYZE laertes_hoi_to_map")
+    except Exception as e:
+        print "ERROR: unable to load the HOIs to be mapped into a temporary table. Error string: %s" % e
+        sys.exit(1)
+
+    meshD = runMappingQuery(cur, "Mesh", MESH_TO_SNOMED_QUERY)
+    meddraD = runMappingQuery(cur, "MedDRA", MEDDRA_TO_SNOMED_QUERY)
+    snomedD = runMappingQuery(cur, "already SNOMED", SNOMED_TEST_QUERY)
+    cur.execute("DROP TABLE laertes_hoi_to_map")
+
+    searchOrderD = {"Mesh":[meshD], "MedDRA":[meddraD], "Mixed":[meshD, meddraD, snomedD]}
+    hoiToSnomedD = {}
+    for (hoi, vocab) in sorted(hoiVocabS):
+        rows = None
+        if meddra_to_snomed_mapping_d.has_key(hoi):
+            rows = [[meddra_to_snomed_mapping_d[hoi][1],meddra_to_snomed_mapping_d[hoi][2],"","",meddra_to_snomed_mapping_d[hoi][0]]]
+            print "INFO: MedDRA concept id %s mapped to SNOMED HOI %s using local mapping" % (hoi,meddra_to_snomed_mapping_d[hoi][1])
+        else:
+            for mappedD in searchOrderD.get(vocab, []):
+                if mappedD.has_key(hoi):
+                    rows = mappedD[hoi]
+                    break
+
+        if rows == None:
+            print "WARNING: Attempt to map concept id for %s HOI %s to SNOMED failed because no mapping could be found in the standard vocabulary." % (vocab,hoi)
+            continue
+
+        for row in rows:
+            print "INFO: mapped HOI concept id from %s (%s - %s : %s) to %s (SNOMED - %s : %s)" % (hoi, vocab, row[A_CONCEPT_CODE], row[A_CONCEPT_NAME], row[B_CONCEPT_ID], row[B_CONCEPT_CODE], row[B_CONCEPT_NAME])
+        hoiToSnomedD[(hoi, vocab)] = rows
+    return hoiToSnomedD
+
+######################################################################
+## With --workers, each source is read by its own worker process,
+## first to collect the HOIs to be mapped and then to write its
+## evidence rows to a shard. The shards are concatenated in the order
+## of SOURCE_LISTING_FILE and given their 'id's at the end so the
+## output does not depend on the number of workers or on the order in
+## which the sources finish. Otherwise the evidence rows go straight
+## from the source files to the output.
+######################################################################
+def shardFile(srcIndex):
+    return "%s.shard-%d" % (DRUG_HOI_DATA_FILE, srcIndex)
+
+# Yield the evidence rows of a source (without 'id') with HOIs mapped
+# to SNOMED as (row, drug-HOI key, drug, hoi, evidence_source_code_id)
+# tuples
+def sourceEvidence(src):
+    for tpl in sourceRecords(src):
+        if src[HOI_VOCAB_ID] in UNMAPPED_HOI_VOCABS:
+            (drug,hoi) = tpl[KEY].split("-")
+            yield ("\t".join(tpl) + "\n", tpl[KEY], drug, hoi, tpl[EV_SOURCE_ID])
+            continue
+
+        try:
+            (drug,hoi) = tpl[KEY].split("-")
+        except ValueError:
+            print "WARNING: could not split out drug and hoi from tpl[KEY]: %s" % tpl[KEY]
+            continue
+
+        rows = hoiToSnomedD.get((hoi, src[HOI_VOCAB_ID]))
+        if rows == None:
+            continue # the HOI could not be mapped (reported above)
+
+        for row in rows:
+            snomedHoi = row[B_CONCEPT_ID]
+            tpl[KEY] = "%s-%s" % (drug, snomedHoi)
+            yield ("\t".join(tpl) + "\n", tpl[KEY], drug, snomedHoi, tpl[EV_SOURCE_ID])
+
+# Run by the workers: write the evidence rows of a source to its shard
+# and return the drug-HOI keys of the source in the order that they
+# first appear as (key, drug, hoi) tuples together with the set of
+# evidence_source_code_ids of its rows
+def mergeSource(indexedSrc):
+    (srcIndex, src) = indexedSrc
+    print "INFO: loading source: %s" % src[SOURCE]
+    shardF = open(shardFile(srcIndex),'w')
+    keyS = set()
+    keyL = []
+    codeIdS = set()
+    for (row,key,drug,hoi,codeId) in sourceEvidence(src):
+        shardF.write(row)
+        codeIdS.add(codeId)
+        if not key in keyS:
+            keyS.add(key)
+            keyL.append((key, drug, hoi))
+    shardF.close()
+    return (keyL, codeIdS)
+
+# Apply func to every source, using a pool of worker processes if
+# more than one worker was requested, and yield the results in the
+# order of the sources. Workers are forked so they see the globals
+# (e.g., hoiToSnomedD) as they were when runPerSource was called.
+def runPerSource(func, srcL):
+    if args.workers > 1:
+        pool = multiprocessing.Pool(min(args.workers, len(srcL)))
+        resultIter = pool.imap(func, srcL)
     else:
+        resultIter = itertools.imap(func, srcL)
+
+    for src in srcL:
         try:
-            print "INFO: Attempting to SELECT from concept table where concept id - %d" % int(dhKeyD[key]['drug_id'])
-            cur.execute("""SELECT concept_name from concept where concept_id = %d;""" % int(dhKeyD[key]['drug_id']))
-        except Exception as e:
-            print "ERROR: Attempt to SELECT from concept table failed. Error string: %s" % e
+            yield resultIter.next()
+        except IOError as e:
+            print "ERROR: unable to read the data file for a source listed in %s. Error string: %s" % (SOURCE_LISTING_FILE,e)
+            sys.exit(1)
+
+    if args.workers > 1:
+        pool.close()
+        pool.join()
+
+def addDrugHoiKey(key, drug, hoi):
+    if not dhKeyD.has_key(key):
+        dhKeyD[key] = {'drug_id':drug, 'drug_label':None, 'hoi_id':hoi, 'hoi_label':None}
+        print "DRUG_RELATIONSHIP: %s|%s||%s|" % (key,drug,hoi) # something we can grep that we can load the partial drug relationship and evidence data if the script crashes 
+
+# Yield the evidence rows of all sources (without 'id') in the order
+# of the sources, reading the sources as the rows are consumed
+def sourceEvidenceRows(indexedSrcL):
+    for (srcIndex, src) in indexedSrcL:
+        print "INFO: loading source: %s" % src[SOURCE]
+        codeIdsD[srcIndex] = set()
+        try:
+            for (row,key,drug,hoi,codeId) in sourceEvidence(src):
+                addDrugHoiKey(key, drug, hoi)
+                codeIdsD[srcIndex].add(codeId)
+                yield row
+        except IOError as e:
+            print "ERROR: unable to read the data file for source %s located at %s. Error string: %s" % (src[SOURCE],src[PATH_TO_DATA],e)
+            sys.exit(1)
+
+# Yield the rows of the shards written by mergeSource in the order of
+# the sources, removing each shard once it has been read
+def shardEvidenceRows(indexedSrcL):
+    for (srcIndex, src) in indexedSrcL:
+        shardF = open(shardFile(srcIndex),'r')
+        for l in shardF:
+            yield l
+        shardF.close()
+        os.remove(shardFile(srcIndex))
+
+class NumberedRows(object):
+    # prefixes each row with its 'id' (start, start + 1, ...)
+    def __init__(self, rowIter, start=0):
+        self.rowIter = rowIter
+        self.start = start
+        self.count = 0
+
+    def __iter__(self):
+        for row in self.rowIter:
+            yield "%d\t%s" % (self.start + self.count, row)
+            self.count += 1
+
+######################################################################
+## --incremental: SOURCE_STATE_FILE records, for each source, a hash
+## of its line in SOURCE_LISTING_FILE, its data file, and the local
+## mapping file together with the evidence_source_code_ids of its rows
+## as of the last --load or --incremental run. Only the sources whose
+## hash changed are merged again. Their new rows replace the rows with
+## their previous evidence_source_code_ids, so unchanged sources that
+## share an evidence_source_code_id with a changed (or removed) source
+## are merged again too.
+######################################################################
+HASH_BLOCK_SIZE = 1024 * 1024
+(STATE_HASH, STATE_CODE_IDS) = range(0,2)
+
+def sourceHash(src):
+    h = hashlib.sha1()
+    h.update("\t".join(src) + "\n")
+    for fname in [src[PATH_TO_DATA], MEDDRA_TO_SNOMED_MAPPING_FILE]:
+        f = open(fname,'rb')
+        block = f.read(HASH_BLOCK_SIZE)
+        while block:
+            h.update(block)
+            block = f.read(HASH_BLOCK_SIZE)
+        f.close()
+    return h.hexdigest()
 
-        rows = cur.fetchall()
-        if len(rows) > 0:
-            print "   ", rows[0][0]
-            dLab = rows[0][0]
-    dhKeyD[key]['drug_label'] = dLab
-    capturedDrugsD[dhKeyD[key]['drug_id']] = dhKeyD[key]['drug_label']
+# Return a dictionary source name -> (hash, set of evidence_source_code_ids)
+def readSourceState():
+    stateD = {}
+    try:
+        f = open(SOURCE_STATE_FILE,'r')
+    except IOError:
+        print "ERROR: %s does not exist. Run this script with --load to load all sources before using --incremental." % SOURCE_STATE_FILE
+        sys.exit(1)
+    f.readline() # skip header
+    for elt in f:
+        elt = elt.rstrip("\r\n")
+        if not elt:
+            continue
+        (name,h,codeIds) = elt.split("\t")
+        stateD[name] = (h, set([x for x in codeIds.split(",") if x]))
+    f.close()
+    return stateD
+
+def writeSourceState(stateD):
+    f = open(SOURCE_STATE_FILE + ".tmp",'w')
+    f.write("SOURCE\tHASH\tEVIDENCE_SOURCE_CODE_IDS\n")
+    for src in srcL[1:]:
+        if stateD.has_key(src[SOURCE]):
+            (h, codeIdS) = stateD[src[SOURCE]]
+            f.write("%s\t%s\t%s\n" % (src[SOURCE], h, ",".join(sorted(codeIdS, key=int))))
+    f.close()
+    os.rename(SOURCE_STATE_FILE + ".tmp", SOURCE_STATE_FILE)
+
+# Return the set of indexes of the sources that have to be merged
+# again and the set of evidence_source_code_ids whose rows they replace
+def selectChangedSources(indexedSrcL, hashL, stateD):
+    changedS = set()
+    for ((srcIndex, src), h) in zip(indexedSrcL, hashL):
+        if not stateD.has_key(src[SOURCE]):
+            print "INFO: source %s is new" % src[SOURCE]
+            changedS.add(srcIndex)
+        elif stateD[src[SOURCE]][STATE_HASH] != h:
+            print "INFO: source %s has changed" % src[SOURCE]
+            changedS.add(srcIndex)
+
+    replacedS = set()
+    listedS = set([src[SOURCE] for (srcIndex, src) in indexedSrcL])
+    for name in stateD.keys():
+        if not name in listedS:
+            print "INFO: source %s is no longer listed in %s. Its rows will be removed." % (name, SOURCE_LISTING_FILE)
+            replacedS.update(stateD[name][STATE_CODE_IDS])
+
+    while True:
+        for (srcIndex, src) in indexedSrcL:
+            if srcIndex in changedS and stateD.has_key(src[SOURCE]):
+                replacedS.update(stateD[src[SOURCE]][STATE_CODE_IDS])
+        sharingL = [(srcIndex, src) for (srcIndex, src) in indexedSrcL if not srcIndex in changedS and stateD[src[SOURCE]][STATE_CODE_IDS] & replacedS]
+        if len(sharingL) == 0:
+            break
+        for (srcIndex, src) in sharingL:
+            print "INFO: source %s shares evidence_source_code_ids with a changed source and will be merged again" % src[SOURCE]
+            changedS.add(srcIndex)
+    return (changedS, replacedS)
+
+indexedSrcL = list(enumerate(srcL[1:])) # skip header
+mergeSrcL = indexedSrcL # the sources to merge
+if args.load or args.incremental:
+    hashL = list(runPerSource(sourceHash, [src for (srcIndex, src) in indexedSrcL]))
+if args.incremental:
+    stateD = readSourceState()
+    (changedS, replacedS) = selectChangedSources(indexedSrcL, hashL, stateD)
+    mergeSrcL = [(srcIndex, src) for (srcIndex, src) in indexedSrcL if srcIndex in changedS]
+    if len(mergeSrcL) == 0 and len(replacedS) == 0:
+        print "INFO: no source has changed since the last load. Nothing to do."
+        sys.exit(0)
+
+hoiVocabS = set()
+for sourceHoiVocabS in runPerSource(collectSourceHois, [src for (srcIndex, src) in mergeSrcL]):
+    hoiVocabS.update(sourceHoiVocabS)
+hoiToSnomedD = mapHoisToSnomed(cur, hoiVocabS)
 
-    if capturedHoisD.has_key(dhKeyD[key]['hoi_id']):
-       hLab  = capturedHoisD[dhKeyD[key]['hoi_id']]
-    else:
+## iterate through each source and write the data to go into
+## drug_hoi_evidence mapping the HOI concepts to SNOMED if not already
+## done by the source.
+##
+dhKeyD = {} # used to accumulate all drug-HOI keys so that the drug-hoi relationship table can be created
+pivot = evidenceView.EvidencePivot() # the drug_HOI_evidence_view columns of each drug-HOI key
+codeIdsD = {} # source index -> evidence_source_code_ids of its rows
+firstId = 0
+if args.incremental:
+    firstId = evidenceLoader.nextEvidenceId(conn) # new rows are added after the current ones
+if args.workers > 1:
+    for ((srcIndex, src), (keyL, codeIdS)) in zip(mergeSrcL, runPerSource(mergeSource, mergeSrcL)):
+        for (key,drug,hoi) in keyL:
+            addDrugHoiKey(key, drug, hoi)
+        codeIdsD[srcIndex] = codeIdS
+    mergedRows = shardEvidenceRows(mergeSrcL)
+else:
+    mergedRows = sourceEvidenceRows(mergeSrcL)
+if not args.incremental:
+    mergedRows = pivot.collect(mergedRows) # --incremental rebuilds the changed rows of the view in the database
+evidenceRows = NumberedRows(mergedRows, firstId)
+
+if args.incremental:
+    conn.commit() # end the transaction of the mapping queries
+    evidenceLoader.createDeltaTables(conn)
+    evidenceLoader.copyRows(conn, evidenceLoader.EVIDENCE_TABLE, evidenceRows, evidenceLoader.deltaTable(evidenceLoader.EVIDENCE_TABLE))
+    print "INFO: copied %d new evidence rows" % evidenceRows.count
+
+    # the rows of the unchanged sources are kept so the changed
+    # sources cannot have moved to their evidence_source_code_ids
+    for (srcIndex, src) in indexedSrcL:
+        if srcIndex in changedS:
+            continue
+        sharedS = stateD[src[SOURCE]][STATE_CODE_IDS] & set().union(*codeIdsD.values())
+        if len(sharedS) > 0:
+            conn.rollback()
+            print "ERROR: changed sources now use evidence_source_code_ids %s of the unchanged source %s. Run this script with --load instead. The current drug_HOI_evidence and drug_HOI_relationship tables were not changed." % (",".join(sorted(sharedS)), src[SOURCE])
+            sys.exit(1)
+elif args.load:
+    conn.commit() # end the transaction of the mapping queries
+    evidenceLoader.createStagingTables(conn)
+    evidenceLoader.copyRows(conn, evidenceLoader.EVIDENCE_TABLE, evidenceRows)
+    print "INFO: copied %d evidence rows to the staging table for %s" % (evidenceRows.count, evidenceLoader.EVIDENCE_TABLE)
+else:
+    drugHoiDataOutF = open(DRUG_HOI_DATA_FILE,'w')
+    drugHoiDataOutF.writelines(evidenceRows)
+    drugHoiDataOutF.close()
+    print "INFO: wrote %d evidence rows to %s" % (evidenceRows.count, DRUG_HOI_DATA_FILE)
+
+## Now, create the data file for the drug-hoi relationship table. The
+## concept labels are looked up in bulk and kept in
+## CONCEPT_LABEL_CACHE_FILE so that later runs only query the concepts
+## that are new
+LABEL_QUERY_BATCH_SIZE = 10000 # concept ids per label query
+
+# Return a dictionary concept id -> concept name from the label cache
+# (and the relationship file cache used by earlier versions of this
+# script, if present)
+def readLabelCache():
+    labelD = {}
+    try:
+        f = open(CACHED_DRUG_HOI_RELATIONSHIP_FILE,'r')
+        for elt in f:
+            elt = elt.strip()
+            if not elt:
+                break
+            try:
+                (k,dId,dLab,hId,hLab) = elt.split("|")
+            except ValueError:
+                continue # a label with a '|'
+            labelD[dId] = dLab
+            labelD[hId] = hLab
+        f.close()
+        print "INFO: read concept labels from %s" % CACHED_DRUG_HOI_RELATIONSHIP_FILE
+    except IOError:
+        pass
+
+    try:
+        f = open(CONCEPT_LABEL_CACHE_FILE,'r')
+        for elt in f:
+            elt = elt.rstrip("\r\n")
+            if not elt:
+                continue
+            (conceptId,label) = elt.split("\t",1)
+            labelD[conceptId] = label
+        f.close()
+    except IOError:
+        print "WARNING: Caught IOError exception indicating that the file %s does not exist. Proceeding without using cached concepts." % CONCEPT_LABEL_CACHE_FILE
+
+    # only labels found in the concept table are cached
+    for conceptId in labelD.keys():
+        if labelD[conceptId] == "None":
+            del labelD[conceptId]
+    return labelD
+
+def writeLabelCache(labelD):
+    f = open(CONCEPT_LABEL_CACHE_FILE + ".tmp",'w')
+    for conceptId in sorted(labelD.keys()):
+        f.write("%s\t%s\n" % (conceptId, labelD[conceptId]))
+    f.close()
+    os.rename(CONCEPT_LABEL_CACHE_FILE + ".tmp", CONCEPT_LABEL_CACHE_FILE) # replace the cache only once it is complete
+
+# Add the labels of the concept ids in conceptIdL to labelD using one
+# query per LABEL_QUERY_BATCH_SIZE concepts. Returns the number of
+# labels found.
+def queryLabels(cur, conceptIdL, labelD):
+    nFound = 0
+    for i in range(0, len(conceptIdL), LABEL_QUERY_BATCH_SIZE):
+        batch = [int(x) for x in conceptIdL[i:i + LABEL_QUERY_BATCH_SIZE]]
         try:
-            print "INFO: Attempting to SELECT from concept table where concept id - %d" % int(dhKeyD[key]['hoi_id'])
-            cur.execute("""SELECT concept_name from concept where concept_id = %d;""" % int(dhKeyD[key]['hoi_id']))
+            print "INFO: Attempting to SELECT the labels of %d concepts from the concept table" % len(batch)
+            cur.execute("""SELECT concept_id, concept_name FROM concept WHERE concept_id = ANY(%s)""", (batch,))
         except Exception as e:
             print "ERROR: Attempt to SELECT from concept table failed. Error string: %s" % e
-        rows = cur.fetchall()
-        if len(rows) > 0:
-            print "   ", rows[0][0]
-            hLab = rows[0][0]
-    dhKeyD[key]['hoi_label'] = hLab
-    capturedHoisD[dhKeyD[key]['hoi_id']] = dhKeyD[key]['hoi_label']
-
-## write out the DRUG_HOI_RELATIONSHIP_FILE from dhKeyD
-dHROutf = open(DRUG_HOI_RELATIONSHIP_FILE,'w')
-srtdKeys = dhKeyD.keys()
-srtdKeys.sort()
-for k in srtdKeys:
-    v = dhKeyD[k]
-    s = "|".join([str(k),str(v['drug_id']),str(v['drug_label']),str(v['hoi_id']),str(v['hoi_label'])]) + "\n"
-    if s.find("NULL") != -1:
-        print "WARNING: skipping creation of DRUG_HOI_RELATIONSHIP_FILE entry with NULL. TODO: edit this the script to avoid capturing NULLS to begin with."
-        continue
-
-    dHROutf.write(s)
-dHROutf.close()
-
-print "INFO: To make future use of this script more efficient, be sure to APPEND (i.e., copy without overwriting) the data in the file %s to %s" % (DRUG_HOI_RELATIONSHIP_FILE,CACHED_DRUG_HOI_RELATIONSHIP_FILE)
+            sys.exit(1)
+
+        for (conceptId,label) in cur.fetchall():
+            labelD[str(conceptId)] = label
+            nFound += 1
+    return nFound
+
+labelD = readLabelCache()
+neededS = set()
+for v in dhKeyD.values():
+    neededS.add(str(v['drug_id']))
+    neededS.add(str(v['hoi_id']))
+uncachedL = sorted([x for x in neededS if not labelD.has_key(x) and x.isdigit()])
+print "INFO: number of cached concept labels: %d; number of concepts needed: %d; number to query: %d" % (len(labelD.keys()), len(neededS), len(uncachedL))
+
+if len(uncachedL) > 0:
+    nFound = queryLabels(cur, uncachedL, labelD)
+    if nFound > 0:
+        writeLabelCache(labelD)
+        print "INFO: added %d concept labels to %s" % (nFound, CONCEPT_LABEL_CACHE_FILE)
+    if nFound < len(uncachedL):
+        print "WARNING: %d concept ids were not found in the concept table" % (len(uncachedL) - nFound)
+
+for v in dhKeyD.values():
+    v['drug_label'] = labelD.get(str(v['drug_id']))
+    v['hoi_label'] = labelD.get(str(v['hoi_id']))
+
+## write out the DRUG_HOI_RELATIONSHIP_FILE and the
+## drug_HOI_evidence_view data from dhKeyD
+def relationshipFields(warn=True):
+    srtdKeys = dhKeyD.keys()
+    srtdKeys.sort()
+    for k in srtdKeys:
+        v = dhKeyD[k]
+        fieldL = [str(k),str(v['drug_id']),str(v['drug_label']),str(v['hoi_id']),str(v['hoi_label'])]
+        if "|".join(fieldL).find("NULL") != -1:
+            if warn:
+                print "WARNING: skipping creation of DRUG_HOI_RELATIONSHIP_FILE entry with NULL. TODO: edit this the script to avoid capturing NULLS to begin with."
+            continue
+
+        yield fieldL
+
+def relationshipRows():
+    for fieldL in relationshipFields():
+        yield "|".join(fieldL) + "\n"
+
+def viewRows():
+    for fieldL in relationshipFields(warn=False):
+        yield pivot.viewRow(fieldL)
+
+if args.incremental:
+    evidenceLoader.copyRows(conn, evidenceLoader.RELATIONSHIP_TABLE, relationshipRows(), evidenceLoader.deltaTable(evidenceLoader.RELATIONSHIP_TABLE))
+    evidenceLoader.applyDelta(conn, sorted([int(x) for x in replacedS]))
+    newStateD = {} # sources no longer listed are dropped
+    for ((srcIndex, src), h) in zip(indexedSrcL, hashL):
+        if srcIndex in changedS:
+            newStateD[src[SOURCE]] = (h, codeIdsD[srcIndex])
+        else:
+            newStateD[src[SOURCE]] = stateD[src[SOURCE]]
+    writeSourceState(newStateD)
+    print "INFO: replaced the rows of %d sources in drug_HOI_evidence, drug_HOI_relationship, and drug_HOI_evidence_view. Run %s to rebuild LAERTES_SUMMARY." % (len(mergeSrcL), evidenceLoader.REBUILD_SCRIPT)
+elif args.load:
+    evidenceLoader.copyRows(conn, evidenceLoader.RELATIONSHIP_TABLE, relationshipRows())
+    evidenceLoader.copyRows(conn, evidenceLoader.VIEW_TABLE, viewRows())
+    evidenceLoader.swapInStagingTables(conn)
+    stateD = {}
+    for ((srcIndex, src), h) in zip(indexedSrcL, hashL):
+        stateD[src[SOURCE]] = (h, codeIdsD[srcIndex])
+    writeSourceState(stateD)
+    print "INFO: the new drug_HOI_evidence, drug_HOI_relationship, and drug_HOI_evidence_view tables are in place. Run %s to rebuild LAERTES_SUMMARY." % evidenceLoader.REBUILD_SCRIPT
+else:
+    dHROutf = open(DRUG_HOI_RELATIONSHIP_FILE,'w')
+    dHROutf.writelines(relationshipRows())
+    dHROutf.close()
+
+    viewOutf = open(evidenceView.VIEW_DATA_FILE,'w')
+    viewOutf.writelines(viewRows())
+    viewOutf.close()
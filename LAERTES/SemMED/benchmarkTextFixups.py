@@ -0,0 +1,71 @@
+# benchmarkTextFixups.py
+#
+# Compare applying the rules in semmed-text-fixups.tsv one at a time
+# with str.replace (what semMed2rdf.py used to do) with the compiled
+# TextNormalizer on synthetic abstracts and sentences, checking that
+# both give the same text
+#
+# USAGE: python benchmarkTextFixups.py [number of abstracts (default: 20000)]
+#
+
+import sys, time, random
+sys.path = sys.path + ['.', '../common']
+
+from textNormalizer import TextNormalizer, loadRules
+
+TEXT_FIXUPS = "semmed-text-fixups.tsv"
+
+WORDS = ("the patients treated with warfarin had a higher risk of bleeding than those on placebo "
+         "serum levels were measured at baseline and after weeks of therapy in both groups").split(" ")
+
+# Build a text of about nChars characters from ordinary words with,
+# on average, one pattern of the rules (or a run of spaces or a quote)
+# every patternEvery words
+def makeText(rng, rules, nChars, patternEvery):
+    partL = []
+    size = 0
+    while size < nChars:
+        x = rng.random() * patternEvery
+        if x < 0.6:
+            part = rng.choice(rules)[0]
+        elif x < 0.9:
+            part = " " * rng.randint(2, 20)
+        elif x < 1.0:
+            part = '"'
+        else:
+            part = rng.choice(WORDS)
+        partL.append(part)
+        size += len(part) + 1
+    return " ".join(partL)
+
+def applySequentially(rules, text):
+    for (pattern, replacement) in rules:
+        text = text.replace(pattern, replacement)
+    return text
+
+if __name__ == "__main__":
+    n = 20000
+    if len(sys.argv) > 1:
+        n = int(sys.argv[1])
+
+    rng = random.Random(1)
+    for (section, nChars, patternEvery) in [("abstract", 1500, 100), ("abstract", 1500, 20), ("sentence", 200, 200), ("sentence", 200, 20)]:
+        rules = loadRules(TEXT_FIXUPS, section)
+        normalizer = TextNormalizer(rules)
+        textL = [makeText(rng, rules, nChars, patternEvery) for i in xrange(n)]
+
+        start = time.time()
+        expectedL = [applySequentially(rules, x) for x in textL]
+        sequentialTime = time.time() - start
+
+        start = time.time()
+        resultL = [normalizer.normalize(x) for x in textL]
+        normalizerTime = time.time() - start
+
+        if resultL != expectedL:
+            print "ERROR: TextNormalizer and str.replace gave different results for the %s rules" % section
+            sys.exit(1)
+
+        print "%s: %d rules in %d passes, %d texts of ~%d characters, one fixup every ~%d words" % (section, len(rules), len(normalizer.passL), n, nChars, patternEvery)
+        print "   str.replace chain    %8.1f microseconds per %s" % (sequentialTime / n * 1e6, section)
+        print "   TextNormalizer       %8.1f microseconds per %s" % (normalizerTime / n * 1e6, section)
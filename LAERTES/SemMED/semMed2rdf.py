@@ -8,15 +8,17 @@
 #
 
 import sys
-sys.path = sys.path + ['.']
+sys.path = sys.path + ['.', '../common', '../terminology-mappings']
 
-import re, codecs, uuid, datetime
-import json
+import re, codecs, uuid, datetime, os, difflib
+import json, argparse
+import cPickle as pickle # for checkpoints
 from rdflib import Graph, Literal, Namespace, URIRef, RDF, RDFS
 
-# use lxml to parse the MeSH pharmacologic action mappings
-from lxml import etree
-from lxml.etree import XMLParser, parse
+from ntriplesWriter import NTriplesWriter, openOutputFile
+from textNormalizer import TextNormalizer, loadRules
+from terminologyMappings import meshToRxNorm, meshToOmop, snomedToOmop, meddraToOmop
+from terminologyMappings.pharmacologicActions import pharmacologicActions
 
 import psycopg2 # for postgres connection to Medline
 
@@ -27,6 +29,16 @@ SEARCH_RESULTS = "semmedTriplesPlusSentence.tsv"
 # OUTPUT DATA FILE
 OUTPUT_FILE = "drug-hoi-pubmed-semmeddb.nt"
 
+# Checkpoints of the conversion state are written here every
+# CHECKPOINT_INTERVAL search result rows so that an interrupted run
+# can be continued with --resume
+CHECKPOINT_FILE = OUTPUT_FILE + ".checkpoint"
+CHECKPOINT_INTERVAL = 10000
+
+parser = argparse.ArgumentParser(description="Convert the result of a SemMedDB drug-HOI evidence search to Open Data Annotation")
+parser.add_argument("--resume", action="store_true", help="resume from the last checkpoint of an interrupted run and append to its output")
+args = parser.parse_args()
+
 # Connection info to the MEDLINE database
 DB_CONNECTION_INFO="db-connection.conf"
 
@@ -41,13 +53,17 @@ MESH_PHARMACOLOGIC_ACTION_MAPPINGS = "../terminology-mappings/MeSHPharmocologicA
 SNOMED_TO_STANDARD_VOCAB = "../terminology-mappings/StandardVocabToSnomed/standard_vocab_conceptids_to_snomed.csv"
 MEDDRA_TO_STANDARD_VOCAB = "../terminology-mappings/StandardVocabToMeddra/standard_vocab_to_meddra.csv"
 
+# replacements applied to the sentence and abstract text (see the file
+# for details)
+TEXT_FIXUPS = "semmed-text-fixups.tsv"
+
 ## Set up the db connection to the MEDLINE DB. This is used to collect
 ## a bit more information on the MEDLINE entries than is provided by
 ## SemMedDB
 DB_CONNECTION_INFO="db-connection.conf"
 f = open(DB_CONNECTION_INFO,'r')
 (db,user,pword,host,port) = f.readline().strip().split("\t")
-f..close()
+f.close()
 try:
     conn=psycopg2.connect(database=db, user=user, password=pword, host=host, port=port)
 except Exception as e:
@@ -56,84 +72,23 @@ cur = conn.cursor()
 
 
 ############################################################
-#  Load the MeSH Pharmacologic Action mappings from an XML file
+#  Load the MeSH Pharmacologic Action mappings (indexed from an XML file)
 ############################################################
-pharmActionMaptD = {}
-p = XMLParser(huge_tree=True)
-tree = parse(MESH_PHARMACOLOGIC_ACTION_MAPPINGS, parser=p)
-l = tree.xpath('PharmacologicalAction')
-for elt in l:
-    descriptorUI = elt.xpath('DescriptorReferredTo/DescriptorUI')[0].text
-    descriptorName = elt.xpath('DescriptorReferredTo/DescriptorName/String')[0].text
-    pharmacologicalActionSubstanceL = elt.xpath('PharmacologicalActionSubstanceList/Substance')
-    substancesL = []
-    for substanceElt in pharmacologicalActionSubstanceL:
-        recordUI = substanceElt.xpath('RecordUI')[0].text
-        recordName = substanceElt.xpath('RecordName/String')[0].text
-        substancesL.append({'recordUI':recordUI,'recordName':recordName})
-
-    pharmActionMaptD[descriptorUI] = {'descriptorName':descriptorName, 'substancesL':substancesL}
+pharmActionMaptD = pharmacologicActions(MESH_PHARMACOLOGIC_ACTION_MAPPINGS).byDescriptor
 
 ############################################################
 #  Load the Drug and HOI mappings that include OHDSI Standard Vocab codes
 ############################################################
-DRUGS_D_MESH_KEYED = {}
-DRUGS_D_RXNORM_KEYED = {}
-f = open(RXNORM_TO_MESH,"r")
-buf = f.read()
-f.close()
-l = buf.split("\n")
-for elt in l[1:]:
-    if elt.strip() == "":
-        break
-
-    (mesh,pt,rxcui,concept_name,ohdsiID,conceptClassId) = [x.strip() for x in elt.split("|")]
-    if DRUGS_D_MESH_KEYED.get(mesh): # add a synonymn
-        DRUGS_D_MESH_KEYED[mesh][1].append(pt)
-    else: # create a new record
-        DRUGS_D_MESH_KEYED[mesh] = (rxcui, [pt], ohdsiID)
-
-    if DRUGS_D_RXNORM_KEYED.get(rxcui): # add a synonymn
-        DRUGS_D_RXNORM_KEYED[rxcui][1].append(pt)
-    else: # create a new record
-        DRUGS_D_RXNORM_KEYED[rxcui] = (mesh, [pt], ohdsiID)
-
-MESH_D_SV = {}
-f = open(MESH_TO_STANDARD_VOCAB, "r")
-buf = f.read()
-f.close()
-l = buf.split("\n")
-for elt in l[1:]: # skip header
-    if elt.strip() == "":
-        break
+drugMappings = meshToRxNorm(RXNORM_TO_MESH)
+DRUGS_D_MESH_KEYED = drugMappings.byMesh
+DRUGS_D_RXNORM_KEYED = drugMappings.byRxcui
 
-    (imeds,label,mesh) = [x.strip() for x in elt.split("|")]
-    MESH_D_SV[mesh] = imeds
+MESH_D_SV = meshToOmop(MESH_TO_STANDARD_VOCAB).toOmop
+SNOMED_D_SV = snomedToOmop(SNOMED_TO_STANDARD_VOCAB).toOmop
+MEDDRA_D_SV = meddraToOmop(MEDDRA_TO_STANDARD_VOCAB).toOmop
 
-SNOMED_D_SV = {}
-f = open(SNOMED_TO_STANDARD_VOCAB, "r")
-buf = f.read()
-f.close()
-l = buf.split("\n")
-for elt in l[1:]: # skip header
-    if elt.strip() == "":
-        break
-
-    (imeds,snomed) = [x.strip() for x in elt.split("|")]
-    SNOMED_D_SV[snomed] = imeds
-
-
-MEDDRA_D_SV = {}
-f = open(MEDDRA_TO_STANDARD_VOCAB, "r")
-buf = f.read()
-f.close()
-l = buf.split("\n")
-for elt in l[1:]: # skip header
-    if elt.strip() == "":
-        break
-
-    (imeds,meddra) = [x.strip() for x in elt.split("|")]
-    MEDDRA_D_SV[meddra] = imeds
+sentenceFixups = TextNormalizer(loadRules(TEXT_FIXUPS, "sentence"))
+abstractFixups = TextNormalizer(loadRules(TEXT_FIXUPS, "abstract"))
 
 ############################################################
 ## set up an RDF Open Annotation Data  graph
@@ -290,6 +245,17 @@ f.close()
 recL = [x.strip().split("\t") for x in buf.strip().split("\n")]
 recL.pop(0)
 
+# the abstract sentences of each PMID keyed by SemMedDB sentence
+# NUMBER (the SENTENCE_LOCATION column) so that all of the sentences
+# from an abstract can be located in one pass over it (see
+# getSentenceIndex)
+abstractSentencesD = {}
+for elt in recL:
+    if elt[SENTENCE_TYPE] == 'ab':
+        if not abstractSentencesD.has_key(elt[PMID]):
+            abstractSentencesD[elt[PMID]] = {}
+        abstractSentencesD[elt[PMID]][elt[SENTENCE_LOCATION]] = elt[SENTENCE]
+
 # Start building the open annotation data graph
 annotationSetCntr = 1
 annotationItemCntr = 1
@@ -301,6 +267,104 @@ abstractCache = {} # cache for abstract text
 pubTypeCache = {} # used because some PMIDs have multiple publication type assignments TODO: determine pub types should be assigned to a Collection under the target's graph 
 drugHoiPMIDCache = {} # used to avoid duplicating PMID - drug  - HOI combos for PMIDs that have multiple publication type assignments TODO: determine if a more robust source query is needed
 currentAnnotation = annotationItemCntr
+sentenceIndexCache = {} # PMID -> {sentence NUMBER:(prefix, postfix) or None if the sentence could not be found in the abstract}
+
+############################################################
+#  Locate abstract sentences for the TextQuoteSelector prefix and postfix
+############################################################
+# a fuzzy match is only used if at least this fraction of the sentence
+# matches the abstract exactly
+FUZZY_MIN_MATCH = 0.5
+NON_WHITESPACE_RE = re.compile(r"\S+")
+
+def normalizeSentence(sentence):
+    return sentenceFixups.normalize(sentence).strip('"') # TODO: this was a temporary bug fix because for some unknown reason extra whitespace and extra quotes was inserted into the exact sentence text in SemMedDB
+
+# Fallbacks for sentences that do not occur exactly in the abstract:
+# first ignore differences in whitespace, then anchor on the longest
+# block that the sentence and the abstract have in common. Returns the
+# (start, end) span in upperTxt or None.
+def fuzzyFindSentence(upperTxt, upperSentence):
+    # collapse whitespace, keeping the offset in upperTxt of each character
+    offsetL = []
+    wordL = []
+    for m in NON_WHITESPACE_RE.finditer(upperTxt):
+        if len(wordL) > 0:
+            offsetL.append(m.start() - 1)
+        offsetL.extend(range(m.start(), m.end()))
+        wordL.append(m.group(0))
+    collapsedSentence = " ".join(upperSentence.split())
+    if collapsedSentence == "":
+        return None
+    i = " ".join(wordL).find(collapsedSentence)
+    if i != -1:
+        return (offsetL[i], offsetL[i + len(collapsedSentence) - 1] + 1)
+
+    (i, j, size) = difflib.SequenceMatcher(None, upperTxt, upperSentence, autojunk=False).find_longest_match(0, len(upperTxt), 0, len(upperSentence))
+    if size < FUZZY_MIN_MATCH * len(upperSentence):
+        return None
+    start = max(0, i - j)
+    return (start, min(len(upperTxt), start + len(upperSentence)))
+
+# Return the (start, end) span of the sentence in upperTxt or None if
+# it cannot be found. The search starts at the end of the previous
+# sentence of the abstract and falls back to the whole abstract.
+def locateSentence(upperTxt, sentence, startAt):
+    upperSentence = sentence.upper()
+    exactSpanFrom = upperTxt.find(upperSentence, startAt)
+    if exactSpanFrom == -1:
+        exactSpanFrom = upperTxt.find(upperSentence)
+    if exactSpanFrom != -1:
+        return (exactSpanFrom, exactSpanFrom + len(sentence))
+
+    # try to remove some text that might be added as metadata and see if the match hits
+    nsentence = upperSentence.replace("ABSTRACT ","")
+    exactSpanFrom = upperTxt.find(nsentence)
+    if exactSpanFrom != -1:
+        return (exactSpanFrom, exactSpanFrom + len(nsentence))
+
+    span = fuzzyFindSentence(upperTxt, nsentence)
+    if span != None:
+        print "WARNING: the annotated sentence does not occur exactly in the abstract. Using the closest match.\n\tsentence:\n\t\t%s\n\tmatch:\n\t\t%s" % (sentence, upperTxt[span[0]:span[1]])
+    return span
+
+def sentenceNumberKey(number):
+    if number.isdigit():
+        return (0, int(number))
+    return (1, number)
+
+# Build the prefix and postfix of every sentence of the PMID's abstract
+# that is in the search results, in sentence NUMBER order, the first
+# time one of them is needed
+def getSentenceIndex(pmid):
+    if sentenceIndexCache.has_key(pmid):
+        return sentenceIndexCache[pmid]
+
+    idx = {}
+    sentenceIndexCache[pmid] = idx
+    abstractTxt = abstractFixups.normalize(abstractCache[pmid]) # TODO: temporary fix because load of SemMed or method of querying it is messing up non-ascii characters
+    if abstractTxt == "":
+        print "WARNING: SemMed indicates that there is an abstract for PMID %s but one not present in the abstract cache! No prefix or postfix will be added." % pmid
+        for number in abstractSentencesD[pmid].keys():
+            idx[number] = None
+        return idx
+
+    upperTxt = abstractTxt.upper()
+    startAt = 0
+    for number in sorted(abstractSentencesD[pmid].keys(), key=sentenceNumberKey):
+        sentence = normalizeSentence(abstractSentencesD[pmid][number])
+        span = locateSentence(upperTxt, sentence, startAt)
+        if span == None:
+            print "WARNING: Could not find annotated sentence sequence in abstractTxt! No prefix or postfix will be added.\n\tsentence:\n\t\t%s\n\tabstractTxt:\n\t\t%s" % (sentence, abstractTxt)
+            idx[number] = None
+            continue
+
+        (exactSpanFrom, exactSpanTo) = span
+        startAt = exactSpanTo
+        pre = abstractTxt[max(0, exactSpanFrom - NUMB_CHARACTERS_PRE_AND_POST):exactSpanFrom]
+        post = abstractTxt[exactSpanTo:exactSpanTo + NUMB_CHARACTERS_PRE_AND_POST]
+        idx[number] = (pre, post)
+    return idx
 
 currentAnnotSet = 'ohdsi-pubmed-semmed-annotation-set-%s' % annotationSetCntr 
 annotationSetCntr += 1
@@ -308,12 +372,59 @@ graph.add((poc[currentAnnotSet], RDF.type, oa["DataAnnotation"])) # TODO: find o
 graph.add((poc[currentAnnotSet], oa["annotatedAt"], Literal(datetime.date.today())))
 graph.add((poc[currentAnnotSet], oa["annotatedBy"], URIRef(u"http://www.pitt.edu/~rdb20/triads-lab.xml#TRIADS")))
 
-f = codecs.open(OUTPUT_FILE,"w","utf8")
-s = graph.serialize(format="n3",encoding="utf8", errors="replace")
-f.write(s)
+# NOTE: call only after every row before nextRow has been converted
+def saveCheckpoint(nextRow):
+    f.flush()
+    os.fsync(f.fileno())
+    state = {'nextRow':nextRow,
+             'outputSize':f.tell(),
+             'annotationItemCntr':annotationItemCntr,
+             'annotationBodyCntr':annotationBodyCntr,
+             'annotatedCache':annotatedCache,
+             'drugHoiPMIDCache':drugHoiPMIDCache,
+             'pubTypeCache':pubTypeCache}
+    # write then rename so that a crash while saving keeps the previous checkpoint
+    cf = open(CHECKPOINT_FILE + ".tmp","wb")
+    pickle.dump(state, cf, pickle.HIGHEST_PROTOCOL)
+    cf.close()
+    os.rename(CHECKPOINT_FILE + ".tmp", CHECKPOINT_FILE)
+    print "INFO: checkpoint saved at search result row %s" % nextRow
+
+startRow = 0
+if args.resume and not os.path.exists(CHECKPOINT_FILE):
+    print "WARNING: no checkpoint found in %s. Starting from the beginning." % CHECKPOINT_FILE
+elif args.resume:
+    cf = open(CHECKPOINT_FILE,"rb")
+    state = pickle.load(cf)
+    cf.close()
+
+    # drop anything written after the checkpoint
+    f = open(OUTPUT_FILE,"r+b")
+    f.truncate(state['outputSize'])
+    f.close()
+
+    startRow = state['nextRow']
+    annotationItemCntr = state['annotationItemCntr']
+    annotationBodyCntr = state['annotationBodyCntr']
+    annotatedCache = state['annotatedCache']
+    drugHoiPMIDCache = state['drugHoiPMIDCache']
+    pubTypeCache = state['pubTypeCache']
+    print "INFO: resuming from search result row %s" % startRow
+
+if startRow == 0:
+    f = openOutputFile(OUTPUT_FILE,"w")
+    s = graph.serialize(format="n3",encoding="utf8", errors="replace")
+    f.write(s)
+else:
+    f = openOutputFile(OUTPUT_FILE,"a")
+ntw = NTriplesWriter(f)
+
+#for rowNumber in range(startRow, 50):
+for rowNumber in range(startRow, len(recL)):
+    if rowNumber > startRow and (rowNumber - startRow) % CHECKPOINT_INTERVAL == 0:
+        saveCheckpoint(rowNumber)
 
-#for elt in recL[0:50]:  
-for elt in recL:
+    elt = recL[rowNumber]
     ## For now, only process papers tagged as for humans
     ## TODO: expand the evidence types to include non-human studies 
     try:
@@ -427,7 +538,7 @@ for elt in recL:
         # add the text quote selector. Sentences from titles will only
         # have an "exact". 
         # TODO: test that this approach is sufficient (i.e., no titles have more than one sentence.
-        elt[SENTENCE] = elt[SENTENCE].replace("UNLABELLED: ","").replace("CONLCUSION:","CONCLUSION:").replace("        "," ").replace("       "," ").replace("hyperkalemia >/= 9.0","hyperkalemia >= 9.0").replace("alternative therapies  for RLS","alternative therapies for RLS").replace("hepatic  failure","hepatic failure").replace("are not yet  accessible","are not yet accessible").replace("pyren es","pyrenes").replace("pyrid inedicarboxylate","pyridinedicarboxylate").replace("[1,4]diaze pine","[1,4]diazepine").replace("oxo-2H-benz imidazol","oxo-2h-benzimidazol").replace("pyrida zinone","pyridazinone").replace("piperidin-1 -yl)piperidin","piperidin-1-yl)piperidin").replace("dioxophenanthre ne","dioxophenanthrene").replace("pi peridin-4-yl]amino","piperidin-4-yl]amino").replace("de]-1,4-benzoxaz in","de]-1,4-benzoxazin").replace("naphthyridine-6-car boxamides","naphthyridine-6-carboxamides").replace("by ?50% in CH preparations","by ~50% in CH preparations").replace("while tamoxifen      induces growth","while tamoxifen             induces growth").replace("yl)ac rylamide","yl)acrylamide").replace("?(9)-Tetrahydrocannabinol (THC)","∆(9)-Tetrahydrocannabinol (THC)").replace("methoxycarbonyl-pent -1-enyl","methoxycarbonyl-pent-1-enyl").replace("lpha-dimethyl-1h-indol e-3-ethanamine","lpha-dimethyl-1h-indole-3-ethanamine").replace('""','"').strip('"') # TODO: this was a temporary bug fix because for some unknown reason extra whitespace and extra quotes was inserted into the exact sentence text in SemMedDB
+        elt[SENTENCE] = normalizeSentence(elt[SENTENCE])
         textConstraintUuid = URIRef("urn:uuid:%s" % uuid.uuid4())
         tplL.append((currentAnnotTargetUuid, oa["hasSelector"], textConstraintUuid))         
         tplL.append((textConstraintUuid, RDF.type, oa["TextQuoteSelector"]))
@@ -436,41 +547,13 @@ for elt in recL:
         # if the sentence if from an abstract, retrieve the pre and
         # post text string from the abstract
         if elt[SENTENCE_TYPE] == 'ab':
-            abstractTxt = abstractCache[elt[PMID]]
-            abstractTxt = abstractTxt.replace("¿","?").replace("á","a").replace("û","u").replace("₃","3").replace("ψ","psi").replace("Ψ","psi").replace("¼","(1/4)").replace("⁺","+").replace("·",".").replace("∼","~").replace("ω","omega").replace("σ","sigma").replace("κ","kappa").replace("²","2").replace("μ","mu").replace("α","alpha").replace("β","beta").replace("à","a").replace("→","->").replace("…","...").replace("≥",">=").replace("≤","</=").replace("τ","tau").replace(" = "," = ").replace(" "," ").replace(" >= "," >= ").replace(" "," ").replace(" "," ").replace("ï","i").replace("×","x").replace('®',"(r)").replace("ô","o").replace("ö","o").replace("ä","a").replace("ó","o").replace("ü","u").replace("é","e").replace("æ","ae").replace("±","+/-").replace("ι","iota").replace("Δ","delta").replace("δ","delta").replace("ë","e").replace("ĕ","e").replace("γ","gamma").replace("₂","2").replace("₁","1").replace("₅","5").replace("ß","beta").replace("λ","lamda").replace("™","TM").replace("⁻¹","-1").replace("ĭ","i").replace("µ","U").replace("ε","epsilon").replace("ç","c").replace("°"," degrees ") # TODO: temporary fix because load of SemMed or method of querying it is messing up non-ascii characters
-            if abstractTxt == "":
-                print "ERROR: SemMed indicates that there is an abstract but one not present in the abstract cache!"
-                sys.exit(1)
-            
-            exactSpanFrom = abstractTxt.upper().find(elt[SENTENCE].upper())
-            if exactSpanFrom == -1:
-                # try to remove some text that might be added as metadata and see if the match hits
-                nsentence = elt[SENTENCE].upper().replace("ABSTRACT ","")
-                exactSpanFrom = abstractTxt.upper().find(nsentence)
-                if exactSpanFrom == -1:
-                    print "ERROR:Could not find annotated sentence sequence in abstractTxt!\n\tsentence:\n\t\t%s\n\tabstractTxt:\n\t\t%s" % (nsentence, abstractTxt)
-                    sys.exit(1)
-     
-            exactSpanTo = exactSpanFrom + len(elt[SENTENCE])
-            pre = post = ""
-            if exactSpanFrom - NUMB_CHARACTERS_PRE_AND_POST < 0:
-                pre = abstractTxt[:exactSpanFrom]
-            else:
-                pre = abstractTxt[exactSpanFrom - NUMB_CHARACTERS_PRE_AND_POST:exactSpanFrom]
-     
-            if exactSpanTo + NUMB_CHARACTERS_PRE_AND_POST > len(abstractTxt):
-                post = abstractTxt[exactSpanTo:]
-            else:
-                post = abstractTxt[exactSpanTo:exactSpanTo + NUMB_CHARACTERS_PRE_AND_POST]
-
-            tplL.append((textConstraintUuid, oa["prefix"], Literal(unicode(pre,'utf-8', 'replace'))))
-            tplL.append((textConstraintUuid, oa["postfix"], Literal(unicode(post,'utf-8', 'replace'))))
-
-    s = u""
-    for t in tplL:
-        #s += unicode.encode(" ".join((t[0].n3(), t[1].n3(), t[2].n3(), u".\n")), 'utf-8', 'replace')
-        s += u" ".join((t[0].n3(), t[1].n3(), t[2].n3(), u".\n"))
-    f.write(s)
+            prePost = getSentenceIndex(elt[PMID])[elt[SENTENCE_LOCATION]]
+            if prePost != None:
+                (pre, post) = prePost
+                tplL.append((textConstraintUuid, oa["prefix"], Literal(unicode(pre,'utf-8', 'replace'))))
+                tplL.append((textConstraintUuid, oa["postfix"], Literal(unicode(post,'utf-8', 'replace'))))
+
+    ntw.writeTriples(tplL)
     
 
     # Specify the bodies of the annotation - for this type each
@@ -540,21 +623,22 @@ for elt in recL:
             tplL.append((poc[currentAnnotationBody], ohdsi['MeshDrug'], mesh[elt[DRUG_MESH]])) 
 
         # check if the MeSH UI is a grouping
-        if elt[DRUG_MESH] in pharmActionMaptD.keys():
+        if pharmActionMaptD.has_key(elt[DRUG_MESH]):
+            descriptorName = pharmActionMaptD[elt[DRUG_MESH]][0]
             print "INFO: The MeSH drug %s might be a grouping (%s). At this time, we are not expanding the groupings to individual drugs since those should be tagged either in this sentence or elsewhere in the title/abstract" % (elt[DRUG_MESH], descriptorName)
-            # (descriptorName, substancesL) =  (pharmActionMaptD[elt[DRUG_MESH]]['descriptorName'], pharmActionMaptD[elt[DRUG_MESH]]['substancesL'])
+            # (descriptorName, substancesL) = pharmActionMaptD[elt[DRUG_MESH]]
             # print "INFO: The MeSH drug %s might be a grouping (%s). Attempting to expand to the %d individual drugs mapped in the MeSH pharmacologic action mapping" % (elt[DRUG_MESH], descriptorName, len(substancesL))
         
             # collectionHead = URIRef(u"urn:uuid:%s" % uuid.uuid4()) # TODO: give this URI a type
             # tplL.append((poc[currentAnnotationBody], ohdsi['adeAgents'], collectionHead))
             # # add each substance to a collection in the body
-            # for substance in substancesL:
-            #     tplL.append((collectionHead, ohdsi['MeshDrug'], mesh[substance['recordUI']]))
-            #     if DRUGS_D_MESH_KEYED.has_key(substance['recordUI']):
-            #         tplL.append((collectionHead, ohdsi['RxnormDrug'], rxnorm[DRUGS_D_MESH_KEYED[substance['recordUI']][0]]))
-            #         tplL.append((collectionHead, ohdsi['ImedsDrug'], ohdsi[DRUGS_D_MESH_KEYED[substance['recordUI']][2]]))
+            # for (recordUI, recordName) in substancesL:
+            #     tplL.append((collectionHead, ohdsi['MeshDrug'], mesh[recordUI]))
+            #     if DRUGS_D_MESH_KEYED.has_key(recordUI):
+            #         tplL.append((collectionHead, ohdsi['RxnormDrug'], rxnorm[DRUGS_D_MESH_KEYED[recordUI][0]]))
+            #         tplL.append((collectionHead, ohdsi['ImedsDrug'], ohdsi[DRUGS_D_MESH_KEYED[recordUI][2]]))
             #     else:
-            #         print "WARNING: no RxNorm or IMEDS equivalent to the MeSH drug %s (%s) belonging to the pharmacologic action mapping %s" % (substance['recordUI'], substance['recordName'], elt[DRUG_MESH])
+            #         print "WARNING: no RxNorm or IMEDS equivalent to the MeSH drug %s (%s) belonging to the pharmacologic action mapping %s" % (recordUI, recordName, elt[DRUG_MESH])
         else:
             print "INFO:  MeSH drug %s (%s) does not appear in the pharmacologic action mapping (not a grouping?)" % (elt[DRUG_MESH], elt[DRUG_PREFERRED_TERM])
     else:
@@ -605,11 +689,10 @@ for elt in recL:
     else:
         print "WARNING: No MeSH, MedDRA, or SNOMED mapping for the HOI concept so the UMLS UI will be the only one provided in this body. TODO: determine if it would be better to use SNOMED or MedDRA as the required concept (or if some other approach is needed)"
         
-    s = ""
-    for t in tplL:
-        s += unicode.encode(" ".join((t[0].n3(), t[1].n3(), t[2].n3(), u".\n")), 'utf-8', 'replace')
-    f.write(s)
+    ntw.writeTriples(tplL)
 
 
-f.close
+f.close()
+if os.path.exists(CHECKPOINT_FILE):
+    os.remove(CHECKPOINT_FILE)
 graph.close()
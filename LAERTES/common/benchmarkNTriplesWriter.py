@@ -0,0 +1,84 @@
+# benchmarkNTriplesWriter.py
+#
+# Compare the n3()-and-concatenate serialization used by the
+# converters with NTriplesWriter on synthetic SPLICER-shaped
+# annotations (one target with 12 triples and one body with 7 triples
+# per record)
+#
+# USAGE: python benchmarkNTriplesWriter.py [number of records (default: 200000)]
+#
+
+import sys, os, time, codecs, uuid, datetime, tempfile
+from rdflib import Literal, Namespace, URIRef, RDF, RDFS
+
+from ntriplesWriter import NTriplesWriter, openOutputFile
+
+oa = Namespace('http://www.w3.org/ns/oa#')
+ohdsi = Namespace('http://purl.org/net/ohdsi#')
+rxnorm = Namespace('http://purl.bioontology.org/ontology/RXNORM/')
+loinc = Namespace('http://purl.bioontology.org/ontology/LNC/')
+dcterms = Namespace("http://purl.org/dc/terms/")
+linkedspls_vocabulary = Namespace('http://bio2rdf.org/linkedspls_vocabulary:')
+poc = Namespace('http://purl.org/net/nlprepository/ohdsi-adr-splicer-poc#')
+
+def makeRecord(i):
+    item = poc["ohdsi-splicer-annotation-item-%s" % i]
+    body = poc["ohdsi-splicer-annotation-body-%s" % i]
+    target = URIRef(u"urn:uuid:%s" % uuid.uuid4())
+    selector = URIRef(u"urn:uuid:%s" % uuid.uuid4())
+    targetL = [(item, RDF.type, oa["DataAnnotation"]),
+               (item, RDF.type, ohdsi["ADRAnnotation"]),
+               (item, oa["annotatedAt"], Literal(datetime.date.today())),
+               (item, oa["annotatedBy"], URIRef(u"http://www.pitt.edu/~rdb20/triads-lab.xml#TRIADS")),
+               (item, oa["motivatedBy"], oa["tagging"]),
+               (item, oa["hasTarget"], target),
+               (target, RDF.type, oa["SpecificResource"]),
+               (target, oa["hasSource"], URIRef(u"http://dailymed.nlm.nih.gov/dailymed/lookup.cfm?setid=%s" % uuid.uuid4())),
+               (target, oa["hasSelector"], selector),
+               (selector, RDF.type, poc["SectionSelector"]),
+               (selector, linkedspls_vocabulary["splSection"], loinc["34084-4"]),
+               (selector, oa["exact"], Literal(u"hepatic failure"))]
+    bodyL = [(item, oa["hasBody"], body),
+             (body, RDFS.label, Literal(u"Drug-HOI tag for 1308257-%s (LIPITOR - Hepatic failure)" % i)),
+             (body, RDF.type, ohdsi["adrAnnotationBody"]),
+             (body, dcterms["description"], Literal(u"Drug-HOI tag for 83367(rxnorm) - Hepatic failure(meddra PT) (Drug trade name:LIPITOR; HOI LLT:Hepatic failure)")),
+             (body, ohdsi['ImedsDrug'], ohdsi["1308257"]),
+             (body, ohdsi['RxnormDrug'], rxnorm["83367"]),
+             (body, ohdsi['ImedsHoi'], ohdsi["%s" % (35909000 + i % 1000)])]
+    return (targetL, bodyL)
+
+def writeWithN3(recordL, fname):
+    f = codecs.open(fname,"w","utf8")
+    for (targetL, bodyL) in recordL:
+        for tplL in (targetL, bodyL):
+            s = ""
+            for t in tplL:
+                s += unicode.encode(" ".join((t[0].n3(), t[1].n3(), t[2].n3(), u".\n")), 'utf-8', 'replace')
+            f.write(s)
+    f.close()
+
+def writeWithNTriplesWriter(recordL, fname):
+    f = openOutputFile(fname, "w")
+    ntw = NTriplesWriter(f)
+    for (targetL, bodyL) in recordL:
+        ntw.writeTriples(targetL)
+        ntw.writeTriples(bodyL)
+    f.close()
+
+if __name__ == "__main__":
+    n = 200000
+    if len(sys.argv) > 1:
+        n = int(sys.argv[1])
+
+    print "INFO: building %s synthetic SPLICER records" % n
+    recordL = [makeRecord(i) for i in xrange(n)]
+    (fd, fname) = tempfile.mkstemp(suffix=".nt")
+    os.close(fd)
+
+    for (label, func) in [("n3() + string concatenation", writeWithN3), ("NTriplesWriter", writeWithNTriplesWriter)]:
+        start = time.time()
+        func(recordL, fname)
+        elapsed = time.time() - start
+        print "%-30s %8.2f seconds  %10.0f triples/second  %s bytes" % (label, elapsed, n * 19 / elapsed, os.path.getsize(fname))
+
+    os.remove(fname)
@@ -0,0 +1,106 @@
+# ntriplesWriter.py
+#
+# A streaming N-Triples writer shared by the LAERTES RDF converters
+# (pmSearch2rdf.py, semMed2rdf.py, CTD2rdf.py, splicer2rdf.py, and
+# euSPC2rdf.py). It replaces the pattern
+#
+#    s = ""
+#    for t in tplL:
+#        s += unicode.encode(" ".join((t[0].n3(), t[1].n3(), t[2].n3(), u".\n")), 'utf-8', 'replace')
+#    f.write(s)
+#
+# with
+#
+#    ntw.writeTriples(tplL)
+#
+# Terms are rendered directly to UTF-8 bytes without going through
+# rdflib's n3() (which goes through several layers of Python-level
+# checks per term), literals are only escaped when they contain a
+# character that needs it, and each batch of triples is joined once
+# and written to a buffered binary stream.
+#
+# Unlike n3(), multi-line literals are written with escaped newlines
+# rather than triple quotes so that the output is valid N-Triples.
+#
+# USAGE (from a converter folder):
+#
+#    sys.path = sys.path + ['../common']
+#    from ntriplesWriter import NTriplesWriter, openOutputFile
+#
+#    f = openOutputFile(OUTPUT_FILE, "w")
+#    f.write(graph.serialize(format="n3",encoding="utf8", errors="replace"))
+#    ntw = NTriplesWriter(f)
+#    ...
+#    ntw.writeTriples(tplL)
+#    ...
+#    f.close()
+#
+
+import re
+from rdflib import URIRef, Literal, BNode
+
+OUTPUT_BUFFER_SIZE = 4 * 1024 * 1024 # bytes buffered before each write to disk
+
+# characters that must be escaped in an N-Triples literal
+LITERAL_ESCAPE_RE = re.compile(u'[\\\\"\n\r]')
+LITERAL_ESCAPES = {u'\\':u'\\\\', u'"':u'\\"', u'\n':u'\\n', u'\r':u'\\r'}
+
+# Open an output file for an NTriplesWriter. mode is "w" (new file) or
+# "a" (append, e.g., when resuming from a checkpoint)
+def openOutputFile(fname, mode="w"):
+    return open(fname, mode + "b", OUTPUT_BUFFER_SIZE)
+
+def escapeLiteral(value):
+    if LITERAL_ESCAPE_RE.search(value) == None:
+        return value
+    return LITERAL_ESCAPE_RE.sub(lambda m: LITERAL_ESCAPES[m.group(0)], value)
+
+class NTriplesWriter(object):
+    # out: a file-like object opened in binary mode (see openOutputFile)
+    def __init__(self, out):
+        self.out = out
+
+    def iri(self, node):
+        return b"<%s>" % unicode.encode(node, 'utf-8', 'replace')
+
+    def literal(self, node):
+        rendered = u'"%s"' % escapeLiteral(node)
+        if node.language:
+            rendered = u"%s@%s" % (rendered, node.language)
+        elif node.datatype:
+            rendered = u"%s^^<%s>" % (rendered, node.datatype)
+        return rendered.encode('utf-8', 'replace')
+
+    def term(self, node):
+        t = type(node)
+        if t is URIRef:
+            return self.iri(node)
+        if t is Literal:
+            return self.literal(node)
+        if t is BNode:
+            return b"_:%s" % unicode.encode(node, 'utf-8', 'replace')
+        raise TypeError("NTriplesWriter cannot serialize %r" % (node,))
+
+    # Render a single (subject, predicate, object) tuple as an N-Triples line
+    def triple(self, t):
+        return b"%s %s %s .\n" % (self.term(t[0]), self.iri(t[1]), self.term(t[2]))
+
+    def writeTriples(self, tplL):
+        # NOTE: the common case (IRI subject and object) is handled inline
+        # since the per-term method calls dominate the cost otherwise
+        term = self.term
+        lines = []
+        for (s, p, o) in tplL:
+            if type(s) is URIRef:
+                s = b"<%s>" % unicode.encode(s, 'utf-8', 'replace')
+            else:
+                s = term(s)
+            if type(o) is URIRef:
+                o = b"<%s>" % unicode.encode(o, 'utf-8', 'replace')
+            else:
+                o = term(o)
+            lines.append(b"%s <%s> %s .\n" % (s, unicode.encode(p, 'utf-8', 'replace'), o))
+        self.out.write(b"".join(lines))
+
+    def flush(self):
+        self.out.flush()
@@ -0,0 +1,156 @@
+# textNormalizer.py
+#
+# Table-driven string replacement. Replaces chains such as
+#
+#    s = s.replace("\xce\xb1","alpha").replace("\xce\xb2","beta").replace(...) ...
+#
+# with a list of (pattern, replacement) rules, normally loaded from a
+# tab-delimited data file (see loadRules), that is compiled once:
+#
+#    normalizer = TextNormalizer(loadRules(FIXUPS_FILE, "abstract"))
+#    s = normalizer.normalize(s)
+#
+# The result is always the same as applying the rules one after
+# another with str.replace. Consecutive rules are merged into a single
+# pass (one regular expression that matches any of their patterns,
+# see usesRegex) whenever the order in which they are applied
+# cannot matter, i.e.,
+#
+#  - no two patterns in the pass can overlap in any text, and
+#  - no pattern in the pass can match text that includes part of the
+#    replacement of an earlier rule in the pass (rules that delete
+#    their pattern always end a pass since the text on either side of
+#    the deletion could form a new match)
+#
+# A new pass is started whenever a rule breaks one of these
+# conditions. When the same conditions allow it, texts that contain
+# none of the patterns (most of them) are returned after a single scan
+# since no rule can apply to them.
+#
+
+import sys, re
+
+# Return True if a and b can overlap when both occur in some text
+# (one contains the other or a suffix of one is a prefix of the other)
+def canOverlap(a, b):
+    if a in b or b in a:
+        return True
+    for i in range(1, min(len(a), len(b))):
+        if a.endswith(b[:i]) or b.endswith(a[:i]):
+            return True
+    return False
+
+# Split the rules into groups that can each be applied in one pass
+def splitPasses(rules):
+    passL = []
+    current = []
+    for (pattern, replacement) in rules:
+        if pattern == "" or pattern == replacement:
+            continue # nothing to do
+
+        conflict = False
+        for (p, r) in current:
+            if canOverlap(p, pattern) or r == "" or canOverlap(r, pattern):
+                conflict = True
+                break
+        if conflict:
+            passL.append(current)
+            current = []
+        current.append((pattern, replacement))
+    if len(current) > 0:
+        passL.append(current)
+    return passL
+
+# A regular expression that matches any of the patterns. Longest
+# first so that the alternation never stops at a shorter pattern.
+def compileAlternation(patternL):
+    return re.compile("|".join([re.escape(p) for p in sorted(set(patternL), key=len, reverse=True)]))
+
+# A regular expression only beats a series of str.replace calls when
+# the patterns start with characters that are rare in the text (e.g.,
+# non-ASCII characters in mostly ASCII abstracts), which the regular
+# expression engine can skip over quickly
+def startsRare(patternL):
+    for p in patternL:
+        if p[0] < "\x80":
+            return False
+    return True
+
+# Passes with more than one rule are applied with a single regular
+# expression when their patterns start with rare characters
+def usesRegex(rules):
+    return len(rules) > 1 and startsRare([p for (p, r) in rules])
+
+def compileRegexPass(rules):
+    table = dict(rules)
+    sub = compileAlternation(table.keys()).sub
+    repl = lambda m: table[m.group(0)]
+    return lambda text: sub(repl, text)
+
+def compileSequential(rules):
+    def applyRules(text):
+        for (pattern, replacement) in rules:
+            text = text.replace(pattern, replacement)
+        return text
+    return applyRules
+
+class TextNormalizer(object):
+    # rules: a list of (pattern, replacement) tuples in the order in
+    # which they would be applied with str.replace
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.passL = splitPasses(self.rules)
+
+        # consecutive passes that are not applied with a regular
+        # expression are applied as one series of str.replace calls
+        self.stepL = []
+        pending = []
+        for x in self.passL:
+            if usesRegex(x):
+                if len(pending) > 0:
+                    self.stepL.append(compileSequential(pending))
+                    pending = []
+                self.stepL.append(compileRegexPass(x))
+            else:
+                pending.extend(x)
+        if len(pending) > 0:
+            self.stepL.append(compileSequential(pending))
+
+        patternL = [p for (p, r) in self.rules if p != "" and p != r]
+        self.anyPattern = None
+        if len(patternL) > 0 and startsRare(patternL):
+            self.anyPattern = compileAlternation(patternL).search
+
+    def normalize(self, text):
+        if self.anyPattern != None and self.anyPattern(text) == None:
+            return text
+        for applyStep in self.stepL:
+            text = applyStep(text)
+        return text
+
+# Read the rules of one section from a rules file. The file has one
+# rule per line in the form
+#
+#    <section><TAB><pattern><TAB><replacement>
+#
+# Lines that are empty or start with '#' are ignored. Patterns and
+# replacements are used exactly as written (including leading and
+# trailing spaces) after Python string escapes (e.g., \xc2\xa0 for a
+# non-breaking space) are decoded, so a literal backslash has to be
+# written as \\.
+def loadRules(fname, section):
+    rules = []
+    f = open(fname,"r")
+    for line in f:
+        line = line.rstrip("\r\n")
+        if line.strip() == "" or line.startswith("#"):
+            continue
+
+        fields = line.split("\t")
+        if len(fields) != 3:
+            print "ERROR: the rule '%s' in %s does not have exactly three tab-delimited fields (section, pattern, replacement)" % (line, fname)
+            sys.exit(1)
+        if fields[0] == section:
+            rules.append((fields[1].decode("string_escape"), fields[2].decode("string_escape")))
+    f.close()
+    return rules
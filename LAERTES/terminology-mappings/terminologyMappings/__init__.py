@@ -0,0 +1,20 @@
+# terminologyMappings
+#
+# Cached loaders for the terminology mapping files shared by the
+# LAERTES converters. From a converter folder:
+#
+#    sys.path = sys.path + ['../terminology-mappings']
+#    from terminologyMappings import meshToRxNorm, meshToOmop
+#
+#    DRUGS_D = meshToRxNorm(RXNORM_TO_MESH).byMesh
+#    MESH_D_SV = meshToOmop(MESH_TO_STANDARD_VOCAB).toOmop
+#
+# The MeSH Pharmacologic Action index needs lxml so it is imported
+# from its module rather than from the package:
+#
+#    from terminologyMappings.pharmacologicActions import pharmacologicActions
+#
+
+from mappings import MeshToRxNorm, OmopMapping, SplSetIdToRxNorm
+from mappings import meshToRxNorm, meshToOmop, meddraToOmop, snomedToOmop, rxnormToOmop, splSetIdToRxNorm
+from mappingCache import cachedLoad
@@ -0,0 +1,65 @@
+# mappingCache.py
+#
+# A binary cache for parsed terminology mapping files. The first time
+# a mapping file is loaded, the parsed dictionaries are written next to
+# it (e.g., mesh-to-standard-vocab-v5.txt.meshToOmop.cache) using
+# marshal. Later loads read the cache back in a single call so long as
+# the size and modification time of the mapping file have not changed.
+#
+# NOTE: bump CACHE_FORMAT_VERSION whenever a parser changes what it
+# returns so that existing caches are rebuilt
+#
+
+import os, marshal
+
+CACHE_FORMAT_VERSION = 1
+CACHE_SUFFIX = ".cache"
+
+def cacheFile(fname, kind):
+    return "%s.%s%s" % (fname, kind, CACHE_SUFFIX)
+
+# The key stored with a cache. A cache is only used if its key is
+# equal to the key computed for the mapping file as it is now.
+def cacheKey(fname, kind):
+    st = os.stat(fname)
+    return (CACHE_FORMAT_VERSION, kind, st.st_size, st.st_mtime)
+
+def readCache(cf, key):
+    if not os.path.exists(cf):
+        return None
+    f = open(cf,"rb")
+    try:
+        (cachedKey, data) = marshal.load(f)
+    except (EOFError, ValueError, TypeError):
+        print "WARNING: ignoring unreadable terminology mapping cache %s" % cf
+        return None
+    finally:
+        f.close()
+    if cachedKey != key:
+        return None
+    return data
+
+def writeCache(cf, key, data):
+    # write then rename so that a reader never sees a partial cache
+    tmp = "%s.%d.tmp" % (cf, os.getpid())
+    try:
+        f = open(tmp,"wb")
+        marshal.dump((key, data), f)
+        f.close()
+        os.rename(tmp, cf)
+    except (IOError, OSError) as e:
+        print "WARNING: unable to write the terminology mapping cache %s. The mapping file will be parsed again on the next run. Error: %s" % (cf, e)
+
+# Return parseFunc(fname), reading it from the cache for kind when
+# the cache is current and rebuilding the cache otherwise.
+#
+# parseFunc must return only data that marshal can serialize (dicts,
+# lists, tuples, and strings)
+def cachedLoad(fname, kind, parseFunc):
+    key = cacheKey(fname, kind)
+    cf = cacheFile(fname, kind)
+    data = readCache(cf, key)
+    if data == None:
+        data = parseFunc(fname)
+        writeCache(cf, key, data)
+    return data
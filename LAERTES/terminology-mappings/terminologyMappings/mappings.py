@@ -0,0 +1,132 @@
+# mappings.py
+#
+# Lookup objects for the pipe-delimited terminology mapping files in
+# LAERTES/terminology-mappings. Each loader parses its file once and
+# caches the result (see mappingCache.py) so that every converter uses
+# the same parsing rules.
+#
+# All of the files have a header line and are read up to the first
+# blank line. Records that do not have the expected number of fields
+# are reported and skipped. When a code is listed more than once, the
+# last record wins except in MeshToRxNorm, where the first record
+# gives the mapping and later records only add synonyms.
+#
+
+import os
+
+from mappingCache import cachedLoad
+
+MAPPINGS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RXNORM_TO_MESH = os.path.join(MAPPINGS_DIR, "RxNorm-to-MeSH", "mesh-to-rxnorm-standard-vocab-v5.csv")
+MESH_TO_STANDARD_VOCAB = os.path.join(MAPPINGS_DIR, "StandardVocabToMeSH", "mesh-to-standard-vocab-v5.txt")
+MEDDRA_TO_STANDARD_VOCAB = os.path.join(MAPPINGS_DIR, "StandardVocabToMeddra", "standard_vocab_to_meddra.csv")
+SNOMED_TO_STANDARD_VOCAB = os.path.join(MAPPINGS_DIR, "StandardVocabToSnomed", "standard_vocab_conceptids_to_snomed.csv")
+RXNORM_TO_STANDARD_VOCAB = os.path.join(MAPPINGS_DIR, "StandardVocabToRxNorm", "imeds_drugids_to_rxcuis.csv")
+SPL_SET_ID_TO_RXNORM = os.path.join(MAPPINGS_DIR, "SPLSetIdToRxNorm", "rxnorm_mappings-03112016.txt")
+
+# Yield the stripped fields of each record in a mapping file
+def readRecords(fname, nFields):
+    f = open(fname,"r")
+    buf = f.read()
+    f.close()
+    l = buf.split("\n")
+    for elt in l[1:]: # skip header
+        if elt.strip() == "":
+            break
+
+        fields = [x.strip() for x in elt.split("|")]
+        if len(fields) != nFields:
+            print "ERROR: terminology mapping record in %s appears incomplete. Skipping: %s" % (fname, elt)
+            continue
+        yield fields
+
+############################################################
+#  MeSH <-> RxNorm (with OMOP concept ids)
+############################################################
+class MeshToRxNorm(object):
+    # byMesh : MeSH UI -> (RxCUI, [MeSH preferred terms], OMOP concept id)
+    # byRxcui : RxCUI -> (MeSH UI, [MeSH preferred terms], OMOP concept id)
+    def __init__(self, byMesh, byRxcui):
+        self.byMesh = byMesh
+        self.byRxcui = byRxcui
+
+def parseMeshToRxNorm(fname):
+    byMesh = {}
+    byRxcui = {}
+    for (mesh,pt,rxcui,concept_name,ohdsiID,conceptClassId) in readRecords(fname, 6):
+        if byMesh.get(mesh): # add a synonymn
+            byMesh[mesh][1].append(pt)
+        else: # create a new record
+            byMesh[mesh] = (rxcui, [pt], ohdsiID)
+
+        if byRxcui.get(rxcui): # add a synonymn
+            byRxcui[rxcui][1].append(pt)
+        else: # create a new record
+            byRxcui[rxcui] = (mesh, [pt], ohdsiID)
+    return (byMesh, byRxcui)
+
+def meshToRxNorm(fname=RXNORM_TO_MESH):
+    (byMesh, byRxcui) = cachedLoad(fname, "meshToRxNorm", parseMeshToRxNorm)
+    return MeshToRxNorm(byMesh, byRxcui)
+
+############################################################
+#  Source vocabulary code <-> OMOP (Standard Vocab) concept id
+############################################################
+class OmopMapping(object):
+    # toOmop : source vocabulary code -> OMOP concept id
+    # fromOmop : OMOP concept id -> source vocabulary code
+    def __init__(self, vocabulary, toOmop, fromOmop):
+        self.vocabulary = vocabulary
+        self.toOmop = toOmop
+        self.fromOmop = fromOmop
+
+def buildOmopMapping(pairs):
+    toOmop = {}
+    fromOmop = {}
+    for (omop, code) in pairs:
+        toOmop[code] = omop
+        fromOmop[omop] = code
+    return (toOmop, fromOmop)
+
+# concept_id|concept_name|concept_code
+def parseMeshToOmop(fname):
+    return buildOmopMapping([(omop, mesh) for (omop,concept_name,mesh) in readRecords(fname, 3)])
+
+# concept_id|concept_code
+def parseCodeToOmop(fname):
+    return buildOmopMapping(readRecords(fname, 2))
+
+def meshToOmop(fname=MESH_TO_STANDARD_VOCAB):
+    (toOmop, fromOmop) = cachedLoad(fname, "meshToOmop", parseMeshToOmop)
+    return OmopMapping("MeSH", toOmop, fromOmop)
+
+def meddraToOmop(fname=MEDDRA_TO_STANDARD_VOCAB):
+    (toOmop, fromOmop) = cachedLoad(fname, "meddraToOmop", parseCodeToOmop)
+    return OmopMapping("MedDRA", toOmop, fromOmop)
+
+def snomedToOmop(fname=SNOMED_TO_STANDARD_VOCAB):
+    (toOmop, fromOmop) = cachedLoad(fname, "snomedToOmop", parseCodeToOmop)
+    return OmopMapping("SNOMED", toOmop, fromOmop)
+
+def rxnormToOmop(fname=RXNORM_TO_STANDARD_VOCAB):
+    (toOmop, fromOmop) = cachedLoad(fname, "rxnormToOmop", parseCodeToOmop)
+    return OmopMapping("RxNorm", toOmop, fromOmop)
+
+############################################################
+#  SPL Set ID -> RxNorm (DailyMed rxnorm_mappings.txt)
+############################################################
+class SplSetIdToRxNorm(object):
+    # toRxcui : SPL Set ID -> RxCUI
+    def __init__(self, toRxcui):
+        self.toRxcui = toRxcui
+
+# SETID|SPL_VERSION|RXCUI|RXSTRING|RXTTY
+def parseSplSetIdToRxNorm(fname):
+    toRxcui = {}
+    for (setid,spl_version,rxcui,rxstring,rxtty) in readRecords(fname, 5):
+        toRxcui[setid] = rxcui
+    return toRxcui
+
+def splSetIdToRxNorm(fname=SPL_SET_ID_TO_RXNORM):
+    return SplSetIdToRxNorm(cachedLoad(fname, "splSetIdToRxNorm", parseSplSetIdToRxNorm))
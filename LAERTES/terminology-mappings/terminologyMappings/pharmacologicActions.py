@@ -0,0 +1,66 @@
+# pharmacologicActions.py
+#
+# An index of the MeSH Pharmacologic Action mappings
+# (MeSHPharmocologicActionToSubstances/pa2016.xml) in both directions:
+#
+#   byDescriptor : pharmacologic action descriptor UI ->
+#                  (descriptor name, [(substance record UI, substance name), ...])
+#   bySubstance : substance record UI -> [descriptor UI, ...]
+#
+# Lists are in the order of the XML file. The XML is read with
+# iterparse and each PharmacologicalAction element is discarded once
+# it has been indexed, so memory use does not grow with the size of
+# the file. The index is cached like the other mappings (see
+# mappingCache.py) so the XML is only parsed again when it changes.
+#
+# USAGE (to build the cache ahead of time):
+#
+#    python pharmacologicActions.py [path to pa<year>.xml]
+#
+
+import os, sys
+
+from lxml import etree
+
+from mappingCache import cachedLoad
+from mappings import MAPPINGS_DIR
+
+MESH_PHARMACOLOGIC_ACTION_MAPPINGS = os.path.join(MAPPINGS_DIR, "MeSHPharmocologicActionToSubstances", "pa2016.xml")
+
+class PharmacologicActions(object):
+    def __init__(self, byDescriptor, bySubstance):
+        self.byDescriptor = byDescriptor
+        self.bySubstance = bySubstance
+
+def parsePharmacologicActions(fname):
+    byDescriptor = {}
+    bySubstance = {}
+    for (event, elt) in etree.iterparse(fname, events=("end",), tag="PharmacologicalAction", huge_tree=True):
+        descriptorUI = elt.findtext("DescriptorReferredTo/DescriptorUI")
+        descriptorName = elt.findtext("DescriptorReferredTo/DescriptorName/String")
+        substancesL = []
+        for substanceElt in elt.iterfind("PharmacologicalActionSubstanceList/Substance"):
+            recordUI = substanceElt.findtext("RecordUI")
+            substancesL.append((recordUI, substanceElt.findtext("RecordName/String")))
+            if bySubstance.has_key(recordUI):
+                bySubstance[recordUI].append(descriptorUI)
+            else:
+                bySubstance[recordUI] = [descriptorUI]
+        byDescriptor[descriptorUI] = (descriptorName, substancesL)
+
+        # free the element and any already processed siblings
+        elt.clear()
+        while elt.getprevious() is not None:
+            del elt.getparent()[0]
+    return (byDescriptor, bySubstance)
+
+def pharmacologicActions(fname=MESH_PHARMACOLOGIC_ACTION_MAPPINGS):
+    (byDescriptor, bySubstance) = cachedLoad(fname, "pharmacologicActions", parsePharmacologicActions)
+    return PharmacologicActions(byDescriptor, bySubstance)
+
+if __name__ == "__main__":
+    fname = MESH_PHARMACOLOGIC_ACTION_MAPPINGS
+    if len(sys.argv) > 1:
+        fname = sys.argv[1]
+    pa = pharmacologicActions(fname)
+    print "INFO: indexed %s pharmacologic action descriptors and %s substances from %s" % (len(pa.byDescriptor), len(pa.bySubstance), fname)